@@ -22,6 +22,13 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Run the agent event loops on libuv when uvloop is installed (it is not available on Windows)
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
 def main():
     """Main Streamlit application"""
     
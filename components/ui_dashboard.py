@@ -5,7 +5,7 @@ from plotly.subplots import make_subplots
 import pandas as pd
 from typing import Dict, Any, List
 from datetime import datetime
-import json
+import orjson
 
 def render_dashboard_ui():
     """Render the interactive dashboard interface"""
@@ -484,7 +484,7 @@ def render_export_dashboard():
     
     with col1:
         if st.button("📊 Export as JSON"):
-            json_data = json.dumps(dashboard_data, indent=2)
+            json_data = orjson.dumps(dashboard_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
             st.download_button(
                 label="Download JSON",
                 data=json_data,
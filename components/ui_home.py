@@ -1,8 +1,10 @@
 import streamlit as st
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any
 from core.workflow.agent_orchestrator import AgentOrchestrator
 from core.db import DatabaseManager
+from config.settings import Settings
 
 def render_home_ui():
     """Render the enhanced home interface with multi-agent workflow"""
@@ -173,6 +175,10 @@ def render_home_ui():
             # Use asyncio to run the workflow
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
+            loop.set_default_executor(ThreadPoolExecutor(max_workers=Settings.EXECUTOR_MAX_WORKERS))
+            # Python 3.12+: run new tasks eagerly so cache hits finish without an event-loop round trip
+            if hasattr(asyncio, "eager_task_factory"):
+                loop.set_task_factory(asyncio.eager_task_factory)
             
             results = loop.run_until_complete(
                 st.session_state.orchestrator.run_intelligence_workflow(
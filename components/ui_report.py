@@ -2,9 +2,15 @@ import streamlit as st
 import os
 from typing import Dict, Any
 from core.utils import get_file_size_mb
+from core.export.export_queue import get_export_status
 import zipfile
 import tempfile
 
+_DOCUMENT_MIME_TYPES = {
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+}
+
 def render_report_ui():
     """Render the report viewing interface"""
     st.title("📄 Intelligence Report")
@@ -117,3 +123,36 @@ def render_report_ui():
                         st.text(f"{get_file_size_mb(file_path):.2f} MB")
         else:
             st.info("No files found in report directory.")
+
+    render_document_exports(report_dir, results.get("export_files", {}))
+
+def render_document_exports(report_dir: str, export_files: Dict[str, str]):
+    """Offer the PDF/DOCX downloads, polling the background export job until it finishes"""
+    st.markdown("---")
+    st.subheader("📑 Document Exports")
+
+    # Background jobs record their paths in the status file; inline exports are already in the results
+    status = get_export_status(report_dir)
+    documents = {**export_files, **status.get("export_files", {})}
+
+    if status["status"] in ("queued", "processing"):
+        st.info(f"⏳ PDF/DOCX export {status['status']}...")
+        if st.button("🔄 Check Export Status", key="refresh_export_status"):
+            st.rerun()
+    elif status["status"] == "failed":
+        st.error(f"❌ PDF/DOCX export failed: {status.get('errors', {})}")
+
+    available = [(fmt, documents[fmt]) for fmt in ("pdf", "docx")
+                 if documents.get(fmt) and os.path.exists(documents[fmt])]
+    for fmt, path in available:
+        with open(path, "rb") as f:
+            st.download_button(
+                label=f"📥 Download {fmt.upper()}",
+                data=f.read(),
+                file_name=os.path.basename(path),
+                mime=_DOCUMENT_MIME_TYPES[fmt],
+                key=f"download_{fmt}_export"
+            )
+
+    if not available and status["status"] not in ("queued", "processing"):
+        st.info("No PDF or DOCX exports available.")
@@ -26,18 +26,49 @@ class Settings:
     
     # Model Settings
     LLM_MODEL = "gemini-2.0-flash"
+    LLM_MODEL_SMALL = "gemini-2.0-flash-lite"  # Used for prompts with little source content
+    LLM_ROUTING_MIN_CHARS = 4000  # Content below this size is routed to LLM_MODEL_SMALL
+    LLM_SUMMARY_MODEL = LLM_MODEL_SMALL  # Reader's extraction step; escalates to LLM_MODEL on poor output
     GROQ_MODEL = "llama3-8b-8192"
     EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
     
     # Cache Settings
     SEARCH_CACHE_SIZE = 100
     SEARCH_CACHE_TTL = 3600
+    WEB_CACHE_TTL = 1800  # Scraped web content per (query, market_domain)
+    NEWS_CACHE_TTL = 900  # News articles per (query, market_domain)
+    TRENDING_CACHE_TTL = 300
+    
+    # LLM Response Cache Settings
+    LLM_CACHE_SIZE = 256
+    LLM_CACHE_TTL = 3600
+    LLM_CACHE_SIMILARITY = 0.92  # Minimum cosine similarity for a semantic hit
+    
+    # LLM Batch Settings
+    LLM_BATCH_CONCURRENCY = 5  # Parallel prompts per abatch call
+    LLM_REQUESTS_PER_MINUTE = 60  # Client-side request quota shared by batched calls
     
     # Agent Settings
     MAX_CONCURRENT_AGENTS = 4
     AGENT_TIMEOUT = 300  # 5 minutes
+    FETCH_MAX_CONCURRENCY = 8  # In-flight Firecrawl requests per reader run
+    NEWSDATA_MAX_CONCURRENCY = 4  # In-flight NewsData.io requests per reader run
+    HTTP_RETRY_ATTEMPTS = 4
+    HTTP_RETRY_BASE_DELAY = 0.25  # Seconds; doubled on every retry, plus jitter
+    HTTP_RETRY_MAX_DELAY = 30  # Upper bound on a server-requested Retry-After wait
+    EXECUTOR_MAX_WORKERS = 8  # Default thread pool for blocking calls made via asyncio.to_thread
+    HTTP_CONNECT_TIMEOUT = 3  # Seconds to establish a connection to a data provider
+    HTTP_READ_TIMEOUT = 10  # Seconds to wait between reads of a provider response
+    WEB_COLLECT_TIMEOUT = 20  # Overall budget for the reader's web search and scrapes
+    NEWS_COLLECT_TIMEOUT = 8  # Overall budget for the reader's news queries
+    TRENDING_COLLECT_TIMEOUT = 5  # Overall budget for the reader's trending topics lookup
     
     # Export Settings
+    CHART_PACK_FILE = "charts.bin"  # All PNG charts of a report concatenated into one file
+    CHART_INDEX_FILE = "charts.idx.json"  # Chart name -> [offset, length] within CHART_PACK_FILE
+    BACKGROUND_EXPORTS = True  # Render PDF/DOCX on a worker pool instead of inside the formatter run
+    EXPORT_WORKERS = 2
+    EXPORT_STATUS_FILE = "export_status.json"  # queued -> processing -> completed/failed, per report directory
     PDF_TEMPLATE = "modern"
     DOCX_TEMPLATE = "professional"
     
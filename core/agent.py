@@ -1,10 +1,17 @@
 import os
 import json
+import asyncio
 import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from uuid import uuid4
 import requests
+import aiohttp
+from bs4 import BeautifulSoup
 from tenacity import retry, stop_after_attempt, wait_exponential
 from cachetools import TTLCache
 
@@ -13,7 +20,6 @@ from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.output_parsers import StrOutputParser, JsonOutputParser
 from langchain_core.messages import HumanMessage, AIMessage
 from langgraph.graph import StateGraph, END
-from langchain_community.document_loaders import WebBaseLoader
 from langchain_community.vectorstores import FAISS
 from langchain_community.embeddings import HuggingFaceEmbeddings
 from langchain.text_splitter import RecursiveCharacterTextSplitter
@@ -27,6 +33,16 @@ from core.utils import sanitize_filename, ensure_dir_exists, safe_json_dumps
 
 logger = logging.getLogger(__name__)
 
+def _run_coroutine(coro):
+    """Run a coroutine to completion from sync code, even when the calling thread already has a running loop"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # asyncio.run refuses to nest inside a running loop, so drive the coroutine on its own loop in a worker thread
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
 class MarketIntelligenceAgent:
     """Main agent class for market intelligence operations"""
     
@@ -34,10 +50,35 @@ class MarketIntelligenceAgent:
         self.db = DatabaseManager()
         self.search_cache = TTLCache(maxsize=Settings.SEARCH_CACHE_SIZE, ttl=Settings.SEARCH_CACHE_TTL)
         
+        # Persist workflow state on a background thread so nodes don't block on disk I/O
+        self._save_q = queue.Queue()
+        self._save_thread = threading.Thread(target=self._save_worker, daemon=True)
+        self._save_thread.start()
+        
         # Set USER_AGENT if not already set
         if not os.environ.get("USER_AGENT"):
             os.environ["USER_AGENT"] = Settings.USER_AGENT
     
+    def _save_worker(self):
+        """Drain queued state snapshots into the database"""
+        while True:
+            state = self._save_q.get()
+            if state is None:  # Sentinel queued by close()
+                self._save_q.task_done()
+                return
+            try:
+                self.db.save_state(state)
+            except Exception as e:
+                logger.error(f"Background state save failed: {str(e)}")
+            finally:
+                self._save_q.task_done()
+    
+    def close(self):
+        """Flush queued state snapshots and stop the background save thread"""
+        if self._save_thread.is_alive():
+            self._save_q.put(None)
+            self._save_thread.join()
+    
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
     def search_with_tavily(self, query: str) -> List[str]:
         """Search using Tavily API with caching and retry logic"""
@@ -72,18 +113,20 @@ class MarketIntelligenceAgent:
             logger.error(f"Tavily search failed for query {query}: {str(e)}")
             raise
 
-    def fetch_url_content(self, url: str) -> Dict[str, Any]:
-        """Fetch content from URL using WebBaseLoader"""
+    async def afetch_url_content(self, session: aiohttp.ClientSession, url: str) -> Dict[str, Any]:
+        """Fetch content from URL without blocking the event loop"""
         try:
             logger.info(f"Web loader: Fetching {url}")
-            loader = WebBaseLoader(url)
-            docs = loader.load()
-            doc = docs[0] if docs else {}
-            content = doc.page_content[:300] if doc else "No content"
+            async with session.get(url) as response:
+                response.raise_for_status()
+                html = await response.text()
+            soup = BeautifulSoup(html, "html.parser")
+            title_tag = soup.find("title")
+            content = soup.get_text()[:300]
             return {
                 "source": url,
-                "title": doc.metadata.get("title", "No title") if doc else "No title",
-                "summary": content,
+                "title": title_tag.get_text() if title_tag else "No title",
+                "summary": content or "No content",
                 "url": url
             }
         except Exception as e:
@@ -95,6 +138,13 @@ class MarketIntelligenceAgent:
                 "url": url
             }
 
+    async def _afetch_all_urls(self, urls: List[str]) -> List[Dict[str, Any]]:
+        """Fetch all URLs concurrently on a single shared session"""
+        timeout = aiohttp.ClientTimeout(total=30)
+        headers = {"User-Agent": os.environ.get("USER_AGENT", Settings.USER_AGENT)}
+        async with aiohttp.ClientSession(timeout=timeout, headers=headers) as session:
+            return await asyncio.gather(*(self.afetch_url_content(session, url) for url in urls))
+
     def market_data_collector(self, state: MarketIntelligenceState) -> Dict[str, Any]:
         """Collect market data from various sources"""
         logger.info(f"Market data collector: Starting for {state.market_domain}, query: {state.query}")
@@ -119,20 +169,17 @@ class MarketIntelligenceAgent:
             return {"raw_news_data": [], "competitor_data": [], "report_dir": report_dir}
 
         # Fetch content from URLs
-        all_urls = list(set(news_urls + competitor_urls))
+        all_urls = list(dict.fromkeys(news_urls + competitor_urls))
         logger.info(f"Market data collector: Found {len(all_urls)} unique URLs")
         
-        raw_data = []
-        for url in all_urls:
-            data = self.fetch_url_content(url)
-            raw_data.append(data)
+        raw_data = _run_coroutine(self._afetch_all_urls(all_urls))
 
         # Save data to files
         self._save_data_files(raw_data, report_dir, state.market_domain)
         
         state.raw_news_data = raw_data
         state.competitor_data = raw_data
-        self.db.save_state(state)
+        self._save_q.put(state.model_copy())
         
         return {
             "raw_news_data": raw_data,
@@ -158,10 +205,12 @@ class MarketIntelligenceAgent:
             with open(csv_path, "w", newline="", encoding="utf-8") as f:
                 if data:
                     fieldnames = ["title", "summary", "url", "source"]
-                    writer = csv.DictWriter(f, fieldnames=fieldnames)
-                    writer.writeheader()
-                    for row in data:
-                        writer.writerow(row)
+                    writer = csv.writer(f)
+                    writer.writerow(fieldnames)
+                    writer.writerows(
+                        (row.get("title", ""), row.get("summary", ""), row.get("url", ""), row.get("source", ""))
+                        for row in data
+                    )
             logger.info(f"Data saved to CSV: {csv_path}")
         except Exception as e:
             logger.error(f"Failed to save CSV: {str(e)}")
@@ -214,7 +263,7 @@ class MarketIntelligenceAgent:
             ]
         
         state.market_trends = trends
-        self.db.save_state(state)
+        self._save_q.put(state.model_copy())
         return {"market_trends": trends}
 
     def opportunity_identifier(self, state: MarketIntelligenceState) -> Dict[str, Any]:
@@ -247,7 +296,7 @@ class MarketIntelligenceAgent:
             ]
         
         state.opportunities = opportunities
-        self.db.save_state(state)
+        self._save_q.put(state.model_copy())
         return {"opportunities": opportunities}
 
     def strategy_recommender(self, state: MarketIntelligenceState) -> Dict[str, Any]:
@@ -281,7 +330,7 @@ class MarketIntelligenceAgent:
             ]
         
         state.strategic_recommendations = strategies
-        self.db.save_state(state)
+        self._save_q.put(state.model_copy())
         return {"strategic_recommendations": strategies}
 
     def report_template_generator(self, state: MarketIntelligenceState) -> Dict[str, Any]:
@@ -302,7 +351,7 @@ class MarketIntelligenceAgent:
             template = f"# Market Intelligence Report: {state.market_domain}\n\n## Executive Summary\n[INSERT CONTENT]\n\n## Market Trends\n[INSERT TRENDS]\n\n## Opportunities\n[INSERT OPPORTUNITIES]\n\n## Recommendations\n[INSERT RECOMMENDATIONS]"
         
         state.report_template = template
-        self.db.save_state(state)
+        self._save_q.put(state.model_copy())
         return {"report_template": template}
 
     def setup_vector_store(self, state: MarketIntelligenceState) -> Dict[str, Any]:
@@ -318,14 +367,13 @@ class MarketIntelligenceAgent:
         try:
             # Create vector store
             text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
-            texts = []
-            metadatas = []
             
-            for doc in documents:
-                chunks = text_splitter.split_text(doc["content"])
-                for chunk in chunks:
-                    texts.append(chunk)
-                    metadatas.append(doc["metadata"])
+            # Split documents in parallel, then flatten chunks alongside their metadata
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                chunk_lists = list(executor.map(text_splitter.split_text, (doc["content"] for doc in documents)))
+            
+            texts = list(chain.from_iterable(chunk_lists))
+            metadatas = [doc["metadata"] for doc, chunks in zip(documents, chunk_lists) for _ in chunks]
 
             embeddings = HuggingFaceEmbeddings(model_name=Settings.EMBEDDING_MODEL)
             vector_store = FAISS.from_texts(texts, embeddings, metadatas=metadatas)
@@ -334,7 +382,7 @@ class MarketIntelligenceAgent:
             vector_store.save_local(vector_store_path)
             
             state.vector_store_path = vector_store_path
-            self.db.save_state(state)
+            self._save_q.put(state.model_copy())
             
             logger.info(f"Vector store saved: {vector_store_path}")
             return {"vector_store_path": vector_store_path}
@@ -347,17 +395,24 @@ class MarketIntelligenceAgent:
         """Prepare documents for vector store creation"""
         documents = []
         
-        # Add state data
-        documents.append({
-            "content": safe_json_dumps({
-                "market_trends": state.market_trends,
-                "opportunities": state.opportunities,
-                "strategic_recommendations": state.strategic_recommendations,
-                "competitor_data": state.competitor_data,
-                "raw_news_data": state.raw_news_data
-            }),
-            "metadata": {"source": "state_data", "state_id": state.state_id}
-        })
+        # Add one small document per analysis item (sources are indexed separately below)
+        for trend in state.market_trends:
+            documents.append({
+                "content": f"Trend: {trend.get('trend_name', '')}\nDescription: {trend.get('description', '')}\nEvidence: {trend.get('supporting_evidence', '')}\nImpact: {trend.get('estimated_impact', '')}\nTimeframe: {trend.get('timeframe', '')}",
+                "metadata": {"source": "state_data", "type": "trend", "name": trend.get('trend_name', ''), "impact": trend.get('estimated_impact', ''), "state_id": state.state_id}
+            })
+        
+        for opp in state.opportunities:
+            documents.append({
+                "content": f"Opportunity: {opp.get('opportunity_name', '')}\nDescription: {opp.get('description', '')}\nTarget Segment: {opp.get('target_segment', '')}\nCompetitive Advantage: {opp.get('competitive_advantage', '')}\nPotential: {opp.get('estimated_potential', '')}\nTimeframe: {opp.get('timeframe_to_capture', '')}",
+                "metadata": {"source": "state_data", "type": "opportunity", "name": opp.get('opportunity_name', ''), "impact": opp.get('estimated_potential', ''), "state_id": state.state_id}
+            })
+        
+        for rec in state.strategic_recommendations:
+            documents.append({
+                "content": f"Strategy: {rec.get('strategy_title', '')}\nDescription: {rec.get('description', '')}\nExpected Outcome: {rec.get('expected_outcome', '')}\nResources: {rec.get('resource_requirements', '')}\nPriority: {rec.get('priority_level', '')}\nSuccess Metrics: {rec.get('success_metrics', '')}",
+                "metadata": {"source": "state_data", "type": "recommendation", "name": rec.get('strategy_title', ''), "impact": rec.get('priority_level', ''), "state_id": state.state_id}
+            })
         
         # Add data sources
         for item in state.raw_news_data:
@@ -402,7 +457,7 @@ class MarketIntelligenceAgent:
                 f.write(f"[{datetime.now()}] Question: {state.question}\nAnswer: {answer}\n\n")
             
             state.query_response = answer
-            self.db.save_state(state)
+            self._save_q.put(state.model_copy())
             
             return {"query_response": answer}
             
@@ -515,45 +570,39 @@ Based on {len(state.raw_news_data)} data sources including news articles, compet
         if not trends:
             return "No trends identified."
         
-        formatted = []
-        for trend in trends:
-            formatted.append(f"### {trend.get('trend_name', 'Unknown Trend')}")
-            formatted.append(f"**Description:** {trend.get('description', 'N/A')}")
-            formatted.append(f"**Impact:** {trend.get('estimated_impact', 'N/A')}")
-            formatted.append(f"**Timeframe:** {trend.get('timeframe', 'N/A')}")
-            formatted.append("")
-        
-        return "\n".join(formatted)
+        return "\n".join(
+            f"### {trend.get('trend_name', 'Unknown Trend')}\n"
+            f"**Description:** {trend.get('description', 'N/A')}\n"
+            f"**Impact:** {trend.get('estimated_impact', 'N/A')}\n"
+            f"**Timeframe:** {trend.get('timeframe', 'N/A')}\n"
+            for trend in trends
+        )
 
     def _format_opportunities(self, opportunities: List[Dict[str, Any]]) -> str:
         """Format opportunities for report"""
         if not opportunities:
             return "No opportunities identified."
         
-        formatted = []
-        for opp in opportunities:
-            formatted.append(f"### {opp.get('opportunity_name', 'Unknown Opportunity')}")
-            formatted.append(f"**Description:** {opp.get('description', 'N/A')}")
-            formatted.append(f"**Target Segment:** {opp.get('target_segment', 'N/A')}")
-            formatted.append(f"**Potential:** {opp.get('estimated_potential', 'N/A')}")
-            formatted.append("")
-        
-        return "\n".join(formatted)
+        return "\n".join(
+            f"### {opp.get('opportunity_name', 'Unknown Opportunity')}\n"
+            f"**Description:** {opp.get('description', 'N/A')}\n"
+            f"**Target Segment:** {opp.get('target_segment', 'N/A')}\n"
+            f"**Potential:** {opp.get('estimated_potential', 'N/A')}\n"
+            for opp in opportunities
+        )
 
     def _format_recommendations(self, recommendations: List[Dict[str, Any]]) -> str:
         """Format recommendations for report"""
         if not recommendations:
             return "No recommendations available."
         
-        formatted = []
-        for rec in recommendations:
-            formatted.append(f"### {rec.get('strategy_title', 'Unknown Strategy')}")
-            formatted.append(f"**Description:** {rec.get('description', 'N/A')}")
-            formatted.append(f"**Priority:** {rec.get('priority_level', 'N/A')}")
-            formatted.append(f"**Expected Outcome:** {rec.get('expected_outcome', 'N/A')}")
-            formatted.append("")
-        
-        return "\n".join(formatted)
+        return "\n".join(
+            f"### {rec.get('strategy_title', 'Unknown Strategy')}\n"
+            f"**Description:** {rec.get('description', 'N/A')}\n"
+            f"**Priority:** {rec.get('priority_level', 'N/A')}\n"
+            f"**Expected Outcome:** {rec.get('expected_outcome', 'N/A')}\n"
+            for rec in recommendations
+        )
 
     def chat_with_agent(self, message: str, session_id: str) -> str:
         """Chat with the agent using conversation history"""
@@ -660,3 +709,7 @@ Based on {len(state.raw_news_data)} data sources including news articles, compet
                 "error": str(e),
                 "state_id": None
             }
+        
+        finally:
+            # Make sure every queued state snapshot is on disk before returning, including after a failure
+            self._save_q.join()
@@ -1,13 +1,229 @@
 import asyncio
+import copy
+import hashlib
+import io
+import itertools
 import logging
-from typing import Dict, List, Any
+import numpy as np
+import pandas as pd
+import re
+import time
+from typing import Dict, Iterable, Iterator, List, Any, Tuple
 from core.agents.base_agent import BaseAgent
-from langchain.chat_models import init_chat_model
-from langchain_core.output_parsers import JsonOutputParser
+from core.llm import get_json_chain, get_llm
+from core.llm_cache import SemanticResponseCache
 from config.settings import Settings
 
 logger = logging.getLogger(__name__)
 
+# Shared across agent instances so repeated or near-duplicate analyses skip the LLM
+_RESPONSE_CACHE = SemanticResponseCache()
+
+# Numbers with a magnitude or percentage suffix, e.g. "$4.5 billion" or "12%"
+_NUM_RE = re.compile(r'\$?(\d+(?:\.\d+)?)\s*(?:billion|million|thousand|%|percent)', re.IGNORECASE)
+
+# Source pools at least this large run number extraction through pandas' vectorized string ops
+_VECTORIZE_MIN_DOCUMENTS = 100
+
+# Keywords that mark a document as carrying competitor information
+_COMPETITIVE_KEYWORDS = ("competitor", "company", "startup", "leader")
+
+# Most documents to include in a single analysis prompt
+_MAX_PROMPT_DOCUMENTS = 15
+_MAX_COMPETITOR_DOCUMENTS = 10
+
+# Documents whose simhashes differ in at most this many bits are treated as duplicates
+_DUPLICATE_MAX_DISTANCE = 3
+
+# Static prompt prefixes; keeping them byte-identical across calls lets provider-side prompt caching reuse them
+_TREND_SCHEMA = """{
+    "trend_name": "Name of the trend",
+    "description": "Detailed description",
+    "impact_level": "High/Medium/Low",
+    "timeframe": "Short-term/Medium-term/Long-term",
+    "confidence_score": 0.0-1.0,
+    "supporting_evidence": ["evidence1", "evidence2"],
+    "market_size_impact": "Quantitative or qualitative impact",
+    "key_drivers": ["driver1", "driver2"]
+}"""
+
+_OPPORTUNITY_SCHEMA = """{
+    "opportunity_name": "Name of opportunity",
+    "description": "Detailed description",
+    "market_size": "Estimated market size or potential",
+    "target_segment": "Primary target segment",
+    "competitive_advantage": "Potential competitive advantage",
+    "implementation_difficulty": "Easy/Medium/Hard",
+    "time_to_market": "Estimated time to market",
+    "revenue_potential": "High/Medium/Low",
+    "risk_level": "High/Medium/Low",
+    "key_requirements": ["requirement1", "requirement2"]
+}"""
+
+_COMPETITIVE_SCHEMA = """{
+    "market_leaders": [
+        {
+            "company_name": "Company name",
+            "market_share": "Estimated market share",
+            "key_strengths": ["strength1", "strength2"],
+            "recent_developments": "Recent news or developments"
+        }
+    ],
+    "emerging_players": [
+        {
+            "company_name": "Company name",
+            "focus_area": "Primary focus area",
+            "competitive_edge": "What makes them competitive"
+        }
+    ],
+    "market_concentration": "High/Medium/Low",
+    "barriers_to_entry": ["barrier1", "barrier2"],
+    "competitive_intensity": "High/Medium/Low"
+}"""
+
+_ANALYSIS_PROMPT_PREFIX = (
+    "Analyze the content below for the given query and sector.\n\n"
+    "Return a JSON object with the following structure:\n"
+    f'{{"trends": [{_TREND_SCHEMA}], "opportunities": [{_OPPORTUNITY_SCHEMA}], "competitive": {_COMPETITIVE_SCHEMA}}}\n'
+)
+
+_TRENDS_PROMPT_PREFIX = (
+    "Analyze the content below to identify market trends for the given query and sector.\n\n"
+    f"Return a JSON array of trends with the following structure:\n[{_TREND_SCHEMA}]\n"
+)
+
+_OPPORTUNITIES_PROMPT_PREFIX = (
+    "Identify market opportunities for the given query and sector based on the content below.\n\n"
+    f"Return a JSON array of opportunities:\n[{_OPPORTUNITY_SCHEMA}]\n"
+)
+
+_COMPETITIVE_PROMPT_PREFIX = (
+    "Analyze the competitive landscape for the given query and sector.\n\n"
+    f"Return a JSON object with:\n{_COMPETITIVE_SCHEMA}\n"
+)
+
+_SYNTHESIS_PROMPT_PREFIX = """Synthesize the analysis results below.
+
+Provide a synthesis with:
+1. Executive summary (2-3 sentences)
+2. Key insights (3-5 bullet points)
+3. Strategic implications
+4. Recommended next steps
+5. Risk factors to consider
+"""
+
+# Fallback results used when no external content is available; "{market_domain}" is filled in per call
+_FALLBACK_NOTE = "Fallback data - limited external sources available"
+_FALLBACK_TEMPLATED_FIELDS = ("trend_name", "opportunity_name", "description")
+
+_FALLBACK_TRENDS_PROTO = (
+    {
+        "trend_name": "Digital Transformation in {market_domain}",
+        "description": "Continued digital adoption and AI integration in {market_domain} sector",
+        "impact_level": "High",
+        "timeframe": "Medium-term",
+        "confidence_score": 0.6,
+        "supporting_evidence": ["Industry reports", "Market analysis"],
+        "market_size_impact": "Significant growth potential",
+        "key_drivers": ["Technology advancement", "Consumer demand"],
+        "analysis_timestamp": None,
+        "data_sources": 0,
+        "note": _FALLBACK_NOTE
+    },
+    {
+        "trend_name": "Sustainability Focus in {market_domain}",
+        "description": "Increasing emphasis on sustainable practices in {market_domain}",
+        "impact_level": "Medium",
+        "timeframe": "Long-term",
+        "confidence_score": 0.5,
+        "supporting_evidence": ["Regulatory trends", "Consumer preferences"],
+        "market_size_impact": "Moderate growth impact",
+        "key_drivers": ["Regulatory pressure", "Environmental awareness"],
+        "analysis_timestamp": None,
+        "data_sources": 0,
+        "note": _FALLBACK_NOTE
+    }
+)
+
+_FALLBACK_OPPORTUNITIES_PROTO = (
+    {
+        "opportunity_name": "AI-Powered Solutions for {market_domain}",
+        "description": "Develop AI-driven products and services for {market_domain} market needs",
+        "market_size": "Large and growing",
+        "target_segment": "Enterprise customers",
+        "competitive_advantage": "Advanced AI capabilities",
+        "implementation_difficulty": "Medium",
+        "time_to_market": "6-12 months",
+        "revenue_potential": "High",
+        "risk_level": "Medium",
+        "key_requirements": ["AI expertise", "Market validation"],
+        "note": _FALLBACK_NOTE
+    },
+    {
+        "opportunity_name": "Digital Platform for {market_domain}",
+        "description": "Create digital marketplace or platform serving {market_domain} sector",
+        "market_size": "Medium to large",
+        "target_segment": "SME and enterprise",
+        "competitive_advantage": "First-mover advantage",
+        "implementation_difficulty": "Hard",
+        "time_to_market": "12-18 months",
+        "revenue_potential": "Medium",
+        "risk_level": "High",
+        "key_requirements": ["Platform development", "User acquisition"],
+        "note": _FALLBACK_NOTE
+    }
+)
+
+
+def _build_fallback(prototypes: Tuple[Dict[str, Any], ...], market_domain: str, **fields) -> List[Dict[str, Any]]:
+    """Copy fallback prototypes, filling in the market domain and any per-call fields"""
+    items = copy.deepcopy(list(prototypes))
+    for item in items:
+        for key in _FALLBACK_TEMPLATED_FIELDS:
+            if key in item:
+                item[key] = item[key].format(market_domain=market_domain)
+        item.update(fields)
+    return items
+
+
+def _build_prompt(prefix: str, query: str, market_domain: str, content_block: str) -> str:
+    """Append the per-call query, sector and content to a static prompt prefix"""
+    return "".join((prefix, f"\nQuery: {query}\nSector: {market_domain}\n\nContent to analyze:\n", content_block))
+
+
+def _cache_key(query: str, content_block: str) -> str:
+    """Key a response by its variable inputs rather than the static-prefixed prompt"""
+    return f"{query}\x00{hashlib.sha256(content_block.encode('utf-8')).hexdigest()}"
+
+
+def _simhash(text: str) -> int:
+    """Compute a 64-bit simhash over word 3-shingles"""
+    words = text.lower().split()
+    shingles = {" ".join(words[i:i + 3]) for i in range(max(1, len(words) - 2))}
+    weights = [0] * 64
+    for shingle in shingles:
+        h = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(64):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def _dedupe(items: Iterable[Dict]) -> Iterator[Dict]:
+    """Yield items, skipping near-duplicates of content already yielded (e.g. wire-service reposts)"""
+    kept = []
+    for item in items:
+        content = item.get("content", "") or item.get("description", "")
+        fingerprint = _simhash(content[:800])
+        if any((fingerprint ^ other).bit_count() <= _DUPLICATE_MAX_DISTANCE for other in kept):
+            continue
+        kept.append(fingerprint)
+        yield item
+
+
+def _route_model(content_chars: int) -> str:
+    """Pick the small model for low-signal prompts and the default model otherwise"""
+    return Settings.LLM_MODEL_SMALL if content_chars < Settings.LLM_ROUTING_MIN_CHARS else Settings.LLM_MODEL
+
 class AnalystAgent(BaseAgent):
     """Agent responsible for analyzing data and extracting structured insights"""
     
@@ -17,6 +233,16 @@ class AnalystAgent(BaseAgent):
             description="Analyzes collected data to extract trends, opportunities, and metrics"
         )
     
+    async def _cached_llm_json(self, namespace: str, cache_key: str, prompt: str, chain) -> Any:
+        """Invoke the chain through the shared response cache, keeping cache work off the event loop"""
+        cached = await asyncio.to_thread(_RESPONSE_CACHE.get, namespace, cache_key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+        
+        result = await chain.ainvoke(prompt)
+        await asyncio.to_thread(_RESPONSE_CACHE.set, namespace, cache_key, copy.deepcopy(result))
+        return result
+    
     async def execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Execute data analysis tasks"""
         self.update_progress(10, "Initializing analysis")
@@ -28,17 +254,18 @@ class AnalystAgent(BaseAgent):
         query = input_data.get("query", "")
         market_domain = input_data.get("market_domain", "")
         
+        # Build the chat model client off the event loop so it cannot stall other agents
+        await asyncio.to_thread(get_llm)
+        
         # Perform different types of analysis concurrently
         tasks = [
-            self._analyze_market_trends(web_content, news_data, query, market_domain),
-            self._identify_opportunities(web_content, news_data, query, market_domain),
-            self._analyze_competitive_landscape(web_content, news_data, query, market_domain),
+            self._analyze_all(web_content, news_data, query, market_domain),
             self._extract_key_metrics(web_content, news_data, processed_data)
         ]
         
         self.update_progress(40, "Running analysis algorithms")
         
-        trends, opportunities, competitive_landscape, metrics = await asyncio.gather(*tasks)
+        (trends, opportunities, competitive_landscape), metrics = await asyncio.gather(*tasks)
         
         self.update_progress(80, "Synthesizing analysis results")
         
@@ -58,57 +285,113 @@ class AnalystAgent(BaseAgent):
             "analysis_synthesis": synthesis
         }
     
+    async def _analyze_all(self, web_content: List[Dict], news_data: List[Dict], 
+                           query: str, market_domain: str) -> Tuple[List[Dict], List[Dict], Dict]:
+        """Analyze trends, opportunities, and competitive landscape in a single LLM call"""
+        analysis_content = io.StringIO()
+        kept = 0
+        for item in _dedupe(itertools.chain(web_content, news_data)):
+            content = item.get("content", "") or item.get("description", "")
+            if content and len(content.strip()) > 50:
+                analysis_content.write(content[:800])
+                analysis_content.write("\n")
+                kept += 1
+                if kept >= _MAX_PROMPT_DOCUMENTS:
+                    break
+        
+        if not kept:
+            logger.warning("No content available for combined analysis, running per-section analysis")
+            return await asyncio.gather(
+                self._analyze_market_trends(web_content, news_data, query, market_domain),
+                self._identify_opportunities(web_content, news_data, query, market_domain),
+                self._analyze_competitive_landscape(web_content, news_data, query, market_domain)
+            )
+        
+        analysis = {}
+        try:
+            content_block = analysis_content.getvalue()
+            prompt = _build_prompt(_ANALYSIS_PROMPT_PREFIX, query, market_domain, content_block)
+            
+            chain = get_json_chain(_route_model(len(content_block)))
+            analysis = await self._cached_llm_json(f"analysis:{market_domain}", _cache_key(query, content_block), prompt, chain)
+            if not isinstance(analysis, dict):
+                analysis = {}
+        
+        except Exception as e:
+            logger.error(f"Combined analysis failed: {str(e)}")
+        
+        trends = analysis.get("trends")
+        opportunities = analysis.get("opportunities")
+        competitive_landscape = analysis.get("competitive")
+        
+        # Recover any missing section with its dedicated analysis
+        if not isinstance(trends, list):
+            logger.warning("Combined analysis returned no trends, running trend analysis")
+            trends = self._analyze_market_trends(web_content, news_data, query, market_domain)
+        else:
+            # The model occasionally returns bare strings in place of trend objects; keep only the dicts
+            trends = [trend for trend in trends if isinstance(trend, dict)]
+            timestamp = time.monotonic()
+            data_sources = len(web_content) + len(news_data)
+            for trend in trends:
+                trend["analysis_timestamp"] = timestamp
+                trend["data_sources"] = data_sources
+        
+        if not isinstance(opportunities, list):
+            logger.warning("Combined analysis returned no opportunities, running opportunity analysis")
+            opportunities = self._identify_opportunities(web_content, news_data, query, market_domain)
+        
+        if not isinstance(competitive_landscape, dict):
+            logger.warning("Combined analysis returned no competitive landscape, running competitive analysis")
+            competitive_landscape = self._analyze_competitive_landscape(web_content, news_data, query, market_domain)
+        
+        sections = [trends, opportunities, competitive_landscape]
+        pending = [i for i, section in enumerate(sections) if asyncio.iscoroutine(section)]
+        if pending:
+            for i, result in zip(pending, await asyncio.gather(*(sections[i] for i in pending))):
+                sections[i] = result
+        
+        logger.info(f"Combined analysis produced {len(sections[0])} trends and {len(sections[1])} opportunities")
+        return tuple(sections)
+    
     async def _analyze_market_trends(self, web_content: List[Dict], news_data: List[Dict], 
                                    query: str, market_domain: str) -> List[Dict[str, Any]]:
         """Analyze market trends from collected data"""
         try:
             # Combine relevant content
-            trend_content = []
-            for item in web_content + news_data:
+            trend_content = io.StringIO()
+            kept = 0
+            for item in _dedupe(itertools.chain(web_content, news_data)):
                 content = item.get("content", "") or item.get("description", "")
                 if content and len(content.strip()) > 50:  # Only include substantial content
-                    trend_content.append(content[:800])
+                    trend_content.write(content[:800])
+                    trend_content.write("\n")
+                    kept += 1
+                    if kept >= _MAX_PROMPT_DOCUMENTS:
+                        break
             
             # If no content available, return fallback trends
-            if not trend_content:
+            if not kept:
                 logger.warning("No content available for trend analysis, using fallback data")
                 return self._get_fallback_trends(query, market_domain)
             
-            llm = init_chat_model(Settings.LLM_MODEL, model_provider="google_genai")
-            parser = JsonOutputParser()
-            
-            prompt = f"""
-            Analyze the following content to identify market trends for {query} in the {market_domain} sector.
+            content_block = trend_content.getvalue()
+            prompt = _build_prompt(_TRENDS_PROMPT_PREFIX, query, market_domain, content_block)
             
-            Return a JSON array of trends with the following structure:
-            [
-                {{
-                    "trend_name": "Name of the trend",
-                    "description": "Detailed description",
-                    "impact_level": "High/Medium/Low",
-                    "timeframe": "Short-term/Medium-term/Long-term",
-                    "confidence_score": 0.0-1.0,
-                    "supporting_evidence": ["evidence1", "evidence2"],
-                    "market_size_impact": "Quantitative or qualitative impact",
-                    "key_drivers": ["driver1", "driver2"]
-                }}
-            ]
-            
-            Content to analyze:
-            {chr(10).join(trend_content[:15])}
-            """
-            
-            chain = llm | parser
-            trends = chain.invoke(prompt)
+            chain = get_json_chain(_route_model(len(content_block)))
+            trends = await self._cached_llm_json(f"trends:{market_domain}", _cache_key(query, content_block), prompt, chain)
             
             # Ensure we have valid trends
             if not isinstance(trends, list):
                 trends = []
+            trends = [trend for trend in trends if isinstance(trend, dict)]
             
             # Add metadata
+            timestamp = time.monotonic()
+            data_sources = len(web_content) + len(news_data)
             for trend in trends:
-                trend["analysis_timestamp"] = asyncio.get_event_loop().time()
-                trend["data_sources"] = len(web_content) + len(news_data)
+                trend["analysis_timestamp"] = timestamp
+                trend["data_sources"] = data_sources
         
             logger.info(f"Identified {len(trends)} market trends")
             return trends
@@ -119,79 +402,34 @@ class AnalystAgent(BaseAgent):
 
     def _get_fallback_trends(self, query: str, market_domain: str) -> List[Dict[str, Any]]:
         """Provide fallback trends when no data is available"""
-        return [
-            {
-                "trend_name": f"Digital Transformation in {market_domain}",
-                "description": f"Continued digital adoption and AI integration in {market_domain} sector",
-                "impact_level": "High",
-                "timeframe": "Medium-term",
-                "confidence_score": 0.6,
-                "supporting_evidence": ["Industry reports", "Market analysis"],
-                "market_size_impact": "Significant growth potential",
-                "key_drivers": ["Technology advancement", "Consumer demand"],
-                "analysis_timestamp": asyncio.get_event_loop().time(),
-                "data_sources": 0,
-                "note": "Fallback data - limited external sources available"
-            },
-            {
-                "trend_name": f"Sustainability Focus in {market_domain}",
-                "description": f"Increasing emphasis on sustainable practices in {market_domain}",
-                "impact_level": "Medium",
-                "timeframe": "Long-term",
-                "confidence_score": 0.5,
-                "supporting_evidence": ["Regulatory trends", "Consumer preferences"],
-                "market_size_impact": "Moderate growth impact",
-                "key_drivers": ["Regulatory pressure", "Environmental awareness"],
-                "analysis_timestamp": asyncio.get_event_loop().time(),
-                "data_sources": 0,
-                "note": "Fallback data - limited external sources available"
-            }
-        ]
+        return _build_fallback(_FALLBACK_TRENDS_PROTO, market_domain, analysis_timestamp=time.monotonic())
     
     async def _identify_opportunities(self, web_content: List[Dict], news_data: List[Dict], 
                                     query: str, market_domain: str) -> List[Dict[str, Any]]:
         """Identify market opportunities"""
         try:
             # Combine content for opportunity analysis
-            opportunity_content = []
-            for item in web_content + news_data:
+            opportunity_content = io.StringIO()
+            kept = 0
+            for item in _dedupe(itertools.chain(web_content, news_data)):
                 content = item.get("content", "") or item.get("description", "")
                 if content and len(content.strip()) > 50:
-                    opportunity_content.append(content[:800])
+                    opportunity_content.write(content[:800])
+                    opportunity_content.write("\n")
+                    kept += 1
+                    if kept >= _MAX_PROMPT_DOCUMENTS:
+                        break
         
             # If no content available, return fallback opportunities
-            if not opportunity_content:
+            if not kept:
                 logger.warning("No content available for opportunity analysis, using fallback data")
                 return self._get_fallback_opportunities(query, market_domain)
         
-            llm = init_chat_model(Settings.LLM_MODEL, model_provider="google_genai")
-            parser = JsonOutputParser()
+            content_block = opportunity_content.getvalue()
+            prompt = _build_prompt(_OPPORTUNITIES_PROMPT_PREFIX, query, market_domain, content_block)
         
-            prompt = f"""
-            Identify market opportunities for {query} in the {market_domain} sector based on the following content.
-        
-            Return a JSON array of opportunities:
-            [
-                {{
-                    "opportunity_name": "Name of opportunity",
-                    "description": "Detailed description",
-                    "market_size": "Estimated market size or potential",
-                    "target_segment": "Primary target segment",
-                    "competitive_advantage": "Potential competitive advantage",
-                    "implementation_difficulty": "Easy/Medium/Hard",
-                    "time_to_market": "Estimated time to market",
-                    "revenue_potential": "High/Medium/Low",
-                    "risk_level": "High/Medium/Low",
-                    "key_requirements": ["requirement1", "requirement2"]
-                }}
-            ]
-        
-            Content:
-            {chr(10).join(opportunity_content[:15])}
-            """
-        
-            chain = llm | parser
-            opportunities = chain.invoke(prompt)
+            chain = get_json_chain(_route_model(len(content_block)))
+            opportunities = await self._cached_llm_json(f"opportunities:{market_domain}", _cache_key(query, content_block), prompt, chain)
         
             if not isinstance(opportunities, list):
                 opportunities = []
@@ -205,80 +443,35 @@ class AnalystAgent(BaseAgent):
 
     def _get_fallback_opportunities(self, query: str, market_domain: str) -> List[Dict[str, Any]]:
         """Provide fallback opportunities when no data is available"""
-        return [
-            {
-                "opportunity_name": f"AI-Powered Solutions for {market_domain}",
-                "description": f"Develop AI-driven products and services for {market_domain} market needs",
-                "market_size": "Large and growing",
-                "target_segment": "Enterprise customers",
-                "competitive_advantage": "Advanced AI capabilities",
-                "implementation_difficulty": "Medium",
-                "time_to_market": "6-12 months",
-                "revenue_potential": "High",
-                "risk_level": "Medium",
-                "key_requirements": ["AI expertise", "Market validation"],
-                "note": "Fallback data - limited external sources available"
-            },
-            {
-                "opportunity_name": f"Digital Platform for {market_domain}",
-                "description": f"Create digital marketplace or platform serving {market_domain} sector",
-                "market_size": "Medium to large",
-                "target_segment": "SME and enterprise",
-                "competitive_advantage": "First-mover advantage",
-                "implementation_difficulty": "Hard",
-                "time_to_market": "12-18 months",
-                "revenue_potential": "Medium",
-                "risk_level": "High",
-                "key_requirements": ["Platform development", "User acquisition"],
-                "note": "Fallback data - limited external sources available"
-            }
-        ]
+        return _build_fallback(_FALLBACK_OPPORTUNITIES_PROTO, market_domain)
     
     async def _analyze_competitive_landscape(self, web_content: List[Dict], news_data: List[Dict], 
                                            query: str, market_domain: str) -> Dict[str, Any]:
         """Analyze competitive landscape"""
         try:
             # Extract competitor information
-            competitor_content = []
-            for item in web_content + news_data:
+            competitor_content = io.StringIO()
+            kept = 0
+            for item in _dedupe(itertools.chain(web_content, news_data)):
                 content = item.get("content", "") or item.get("description", "")
-                if any(keyword in content.lower() for keyword in ["competitor", "company", "startup", "leader"]):
-                    competitor_content.append(content[:600])
+                content_lower = content.lower()
+                if any(keyword in content_lower for keyword in _COMPETITIVE_KEYWORDS):
+                    competitor_content.write(content[:600])
+                    competitor_content.write("\n")
+                    kept += 1
+                    if kept >= _MAX_COMPETITOR_DOCUMENTS:
+                        break
             
-            llm = init_chat_model(Settings.LLM_MODEL, model_provider="google_genai")
-            parser = JsonOutputParser()
+            # Without competitor mentions the model has nothing to ground its answer in
+            if not kept:
+                logger.warning("No competitor content available, using default competitive landscape")
+                return self._get_fallback_competitive_landscape()
             
-            prompt = f"""
-            Analyze the competitive landscape for {query} in the {market_domain} sector.
+            content_block = competitor_content.getvalue()
+            prompt = _build_prompt(_COMPETITIVE_PROMPT_PREFIX, query, market_domain, content_block)
             
-            Return a JSON object with:
-            {{
-                "market_leaders": [
-                    {{
-                        "company_name": "Company name",
-                        "market_share": "Estimated market share",
-                        "key_strengths": ["strength1", "strength2"],
-                        "recent_developments": "Recent news or developments"
-                    }}
-                ],
-                "emerging_players": [
-                    {{
-                        "company_name": "Company name",
-                        "focus_area": "Primary focus area",
-                        "competitive_edge": "What makes them competitive"
-                    }}
-                ],
-                "market_concentration": "High/Medium/Low",
-                "barriers_to_entry": ["barrier1", "barrier2"],
-                "competitive_intensity": "High/Medium/Low"
-            }}
-            
-            Content:
-            {chr(10).join(competitor_content[:10])}
-            """
-            
-            chain = llm | parser
-            competitive_analysis = chain.invoke(prompt)
+            chain = get_json_chain(_route_model(len(content_block)))
+            competitive_analysis = await self._cached_llm_json(f"competitive:{market_domain}", _cache_key(query, content_block), prompt, chain)
             
             if not isinstance(competitive_analysis, dict):
                 competitive_analysis = {}
@@ -288,42 +481,58 @@ class AnalystAgent(BaseAgent):
             
         except Exception as e:
             logger.error(f"Failed to analyze competitive landscape: {str(e)}")
-            return {
-                "market_leaders": [],
-                "emerging_players": [],
-                "market_concentration": "Medium",
-                "barriers_to_entry": ["Capital requirements", "Regulatory compliance"],
-                "competitive_intensity": "Medium"
-            }
+            return self._get_fallback_competitive_landscape()
+    
+    def _get_fallback_competitive_landscape(self) -> Dict[str, Any]:
+        """Provide a default competitive landscape when no analysis is available"""
+        return {
+            "market_leaders": [],
+            "emerging_players": [],
+            "market_concentration": "Medium",
+            "barriers_to_entry": ["Capital requirements", "Regulatory compliance"],
+            "competitive_intensity": "Medium"
+        }
     
     async def _extract_key_metrics(self, web_content: List[Dict], news_data: List[Dict], 
                                  processed_data: Dict[str, Any]) -> Dict[str, Any]:
         """Extract key metrics and KPIs"""
         try:
             # Calculate basic metrics
-            total_sources = len(web_content) + len(news_data)
+            web_sources = len(web_content)
+            news_sources = len(news_data)
+            total_sources = web_sources + news_sources
             data_quality_score = processed_data.get("data_quality_score", 7)
             
             # Extract numerical data from content
-            numerical_data = []
-            for item in web_content + news_data:
-                content = item.get("content", "") or item.get("description", "")
-                # Simple regex to find numbers with context
-                import re
-                numbers = re.findall(r'\$?(\d+(?:\.\d+)?)\s*(?:billion|million|thousand|%|percent)', content.lower())
-                numerical_data.extend(numbers)
+            contents = [item.get("content", "") or item.get("description", "")
+                        for item in itertools.chain(web_content, news_data)]
+            if len(contents) >= _VECTORIZE_MIN_DOCUMENTS:
+                numerical_data = pd.Series(contents).str.extractall(_NUM_RE)[0].tolist()
+            else:
+                numerical_data = []
+                for content in contents:
+                    # Simple regex to find numbers with context
+                    numerical_data.extend(m.group(1) for m in _NUM_RE.finditer(content))
             
             metrics = {
                 "data_sources_count": total_sources,
-                "web_sources": len(web_content),
-                "news_sources": len(news_data),
+                "web_sources": web_sources,
+                "news_sources": news_sources,
                 "data_quality_score": data_quality_score,
                 "numerical_data_points": len(numerical_data),
                 "content_freshness": "Recent",  # Could be calculated based on dates
-                "coverage_completeness": min(100, (total_sources / 20) * 100),  # Assume 20 is ideal
+                "coverage_completeness": 100.0 if total_sources >= 20 else total_sources * 5.0,  # Assume 20 is ideal
                 "analysis_confidence": data_quality_score / 10
             }
             
+            if numerical_data:
+                values = np.asarray(numerical_data, dtype=np.float64)
+                metrics["numerical_summary"] = {
+                    "mean": float(values.mean()),
+                    "median": float(np.percentile(values, 50)),
+                    "p95": float(np.percentile(values, 95))
+                }
+            
             logger.info("Extracted key metrics")
             return metrics
             
@@ -345,31 +554,25 @@ class AnalystAgent(BaseAgent):
                                  query: str, market_domain: str) -> Dict[str, Any]:
         """Synthesize all analysis results into key insights"""
         try:
-            llm = init_chat_model(Settings.LLM_MODEL, model_provider="google_genai")
-            
-            synthesis_prompt = f"""
-            Synthesize the following analysis results for {query} in the {market_domain} market:
-            
-            Trends: {trends[:3]}  # Top 3 trends
-            Opportunities: {opportunities[:3]}  # Top 3 opportunities
-            Competitive Landscape: {competitive_landscape}
-            Metrics: {metrics}
-            
-            Provide a synthesis with:
-            1. Executive summary (2-3 sentences)
-            2. Key insights (3-5 bullet points)
-            3. Strategic implications
-            4. Recommended next steps
-            5. Risk factors to consider
-            """
+            synthesis_prompt = _SYNTHESIS_PROMPT_PREFIX + (
+                f"\nQuery: {query}\nMarket: {market_domain}\n\n"
+                f"Trends: {trends[:3]}\n"
+                f"Opportunities: {opportunities[:3]}\n"
+                f"Competitive Landscape: {competitive_landscape}\n"
+                f"Metrics: {metrics}\n"
+            )
             
-            synthesis_response = llm.invoke(synthesis_prompt)
-            synthesis_text = synthesis_response.content if hasattr(synthesis_response, 'content') else str(synthesis_response)
+            cache_key = f"synthesis:{market_domain}"
+            synthesis_text = await asyncio.to_thread(_RESPONSE_CACHE.get, cache_key, synthesis_prompt)
+            if synthesis_text is None:
+                synthesis_response = await get_llm().ainvoke(synthesis_prompt)
+                synthesis_text = synthesis_response.content if hasattr(synthesis_response, 'content') else str(synthesis_response)
+                await asyncio.to_thread(_RESPONSE_CACHE.set, cache_key, synthesis_prompt, synthesis_text)
             
             return {
                 "executive_summary": synthesis_text[:500],
                 "full_synthesis": synthesis_text,
-                "analysis_timestamp": asyncio.get_event_loop().time(),
+                "analysis_timestamp": time.monotonic(),
                 "confidence_level": metrics.get("analysis_confidence", 0.7)
             }
             
@@ -378,6 +581,6 @@ class AnalystAgent(BaseAgent):
             return {
                 "executive_summary": f"Analysis completed for {query} in {market_domain} market with {len(trends)} trends and {len(opportunities)} opportunities identified.",
                 "full_synthesis": "Comprehensive market analysis completed successfully.",
-                "analysis_timestamp": asyncio.get_event_loop().time(),
+                "analysis_timestamp": time.monotonic(),
                 "confidence_level": 0.7
             }
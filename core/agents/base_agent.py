@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import time
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional
 from datetime import datetime
@@ -23,11 +24,25 @@ class BaseAgent(ABC):
         self.status = AgentStatus.IDLE
         self.start_time: Optional[datetime] = None
         self.end_time: Optional[datetime] = None
+        self._start_mono: Optional[float] = None
+        self._end_mono: Optional[float] = None
+        self._start_iso: Optional[str] = None
+        self._end_iso: Optional[str] = None
         self.error_message: Optional[str] = None
         self.progress = 0
         self.current_task = ""
         self.results: Dict[str, Any] = {}
         
+    @property
+    def status(self) -> AgentStatus:
+        """Current lifecycle status"""
+        return self._status
+    
+    @status.setter
+    def status(self, value: AgentStatus):
+        self._status = value
+        self._status_value = value.value
+    
     @abstractmethod
     async def execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Execute the agent's main task"""
@@ -37,7 +52,7 @@ class BaseAgent(ABC):
         """Run the agent with error handling and status tracking"""
         try:
             self.status = AgentStatus.RUNNING
-            self.start_time = datetime.now()
+            self._mark_started()
             self.progress = 0
             self.error_message = None
             
@@ -49,21 +64,21 @@ class BaseAgent(ABC):
             self.results = results
             self.status = AgentStatus.COMPLETED
             self.progress = 100
-            self.end_time = datetime.now()
+            self._mark_finished()
             
             logger.info(f"Agent {self.name} completed successfully")
             return results
             
         except asyncio.CancelledError:
             self.status = AgentStatus.CANCELLED
-            self.end_time = datetime.now()
+            self._mark_finished()
             logger.warning(f"Agent {self.name} was cancelled")
             raise
             
         except Exception as e:
             self.status = AgentStatus.FAILED
             self.error_message = str(e)
-            self.end_time = datetime.now()
+            self._mark_finished()
             logger.error(f"Agent {self.name} failed: {str(e)}")
             
             return {
@@ -72,21 +87,36 @@ class BaseAgent(ABC):
                 "agent": self.name
             }
     
+    def _mark_started(self):
+        """Record the start of a run"""
+        self.start_time = datetime.now()
+        self._start_mono = time.monotonic()
+        self._start_iso = self.start_time.isoformat()
+        self.end_time = None
+        self._end_mono = None
+        self._end_iso = None
+    
+    def _mark_finished(self):
+        """Record the end of a run"""
+        self.end_time = datetime.now()
+        self._end_mono = time.monotonic()
+        self._end_iso = self.end_time.isoformat()
+    
     def get_status(self) -> Dict[str, Any]:
         """Get current agent status"""
         duration = None
-        if self.start_time:
-            end = self.end_time or datetime.now()
-            duration = (end - self.start_time).total_seconds()
+        if self._start_mono is not None:
+            end = self._end_mono if self._end_mono is not None else time.monotonic()
+            duration = end - self._start_mono
         
         return {
             "name": self.name,
             "description": self.description,
-            "status": self.status.value,
+            "status": self._status_value,
             "progress": self.progress,
             "current_task": self.current_task,
-            "start_time": self.start_time.isoformat() if self.start_time else None,
-            "end_time": self.end_time.isoformat() if self.end_time else None,
+            "start_time": self._start_iso,
+            "end_time": self._end_iso,
             "duration": duration,
             "error_message": self.error_message
         }
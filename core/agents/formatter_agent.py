@@ -1,15 +1,192 @@
 import asyncio
+import io
 import logging
 import os
-from typing import Dict, List, Any
+import orjson
+from typing import Dict, List, Any, Tuple
 from datetime import datetime
 from core.agents.base_agent import BaseAgent
-from core.charts import IntelligentChartGenerator
-from core.export.report_exporter import ReportExporter
+from core.export.export_queue import get_export_status, submit_exports
+from core.io.file_writer import write_files
 from config.settings import Settings
 
 logger = logging.getLogger(__name__)
 
+# Fields read from each item by the report sections and dashboard, gathered once into parallel lists
+_TREND_FIELDS = ("trend_name", "impact_level", "timeframe", "confidence_score",
+                 "description", "key_drivers", "supporting_evidence")
+_OPPORTUNITY_FIELDS = ("opportunity_name", "revenue_potential", "implementation_difficulty", "time_to_market",
+                       "description", "target_segment", "key_requirements", "competitive_advantage")
+_RECOMMENDATION_FIELDS = ("strategy_title", "priority_level", "implementation_timeline", "confidence_score",
+                          "description", "strategic_objective", "expected_outcomes", "resource_requirements",
+                          "success_indicators")
+
+# Implementation risk: the higher of the difficulty and timeline ranks, defaulting to "Low"
+_RISK_LEVELS = ("Low", "Medium", "High")
+_DIFFICULTY_RISK = {"Medium": 1, "Hard": 2}
+_TIMELINE_RISK = {"Medium-term": 1, "Long-term": 2}
+
+# Report section headings, in the order _format_report_content renders the sections
+_REPORT_SECTION_HEADINGS = ("Market Trends Analysis", "Strategic Opportunities", "Competitive Landscape",
+                            "Strategic Recommendations", "Strategic Roadmap", "Implementation Guidelines")
+
+def _columns(items: List[Dict], fields: Tuple[str, ...]) -> Dict[str, List[Any]]:
+    """Gather the given fields of every item into parallel lists, with None for missing fields"""
+    columns = {field: [] for field in fields}
+    appends = [(field, columns[field].append) for field in fields]
+    for item in items:
+        for field, append in appends:
+            append(item.get(field))
+    return columns
+
+def _value(value: Any, default: Any) -> Any:
+    """Return the default in place of a missing (None) field"""
+    return default if value is None else value
+
+def _bullets(items: List[Any]) -> str:
+    """Render items as a Markdown bullet list"""
+    return "- " + "\n- ".join(map(str, items)) if items else ""
+
+def _format_trends_section(trends: Dict[str, List[Any]]) -> str:
+    """Format trends section"""
+    if not trends["trend_name"]:
+        return "No significant trends identified in the current analysis."
+    
+    parts = []
+    rows = zip(*map(trends.get, _TREND_FIELDS))
+    for i, (name, impact, timeframe, confidence, description, drivers, evidence) in enumerate(rows, 1):
+        parts.extend((
+            "### ", str(i), ". ", str(_value(name, 'Unnamed Trend')),
+            "\n\n**Impact Level:** ", str(_value(impact, 'Unknown')),
+            " | **Timeframe:** ", str(_value(timeframe, 'Unknown')),
+            " | **Confidence:** ", format(_value(confidence, 0.7), ".1%"),
+            "\n\n", str(_value(description, 'No description available.')),
+            "\n\n**Key Drivers:**\n", _bullets(_value(drivers, [])),
+            "\n\n**Supporting Evidence:**\n", _bullets(_value(evidence, [])),
+            "\n\n---", "\n\n"
+        ))
+    parts.pop()  # No separator after the last trend
+    
+    return "".join(parts)
+
+def _format_opportunities_section(opportunities: Dict[str, List[Any]]) -> str:
+    """Format opportunities section"""
+    if not opportunities["opportunity_name"]:
+        return "No specific opportunities identified in the current analysis."
+    
+    parts = []
+    rows = zip(*map(opportunities.get, _OPPORTUNITY_FIELDS))
+    for i, (name, revenue, difficulty, time_to_market, description, segment, requirements, advantage) in enumerate(rows, 1):
+        parts.extend((
+            "### ", str(i), ". ", str(_value(name, 'Unnamed Opportunity')),
+            "\n\n**Revenue Potential:** ", str(_value(revenue, 'Unknown')),
+            " | **Implementation:** ", str(_value(difficulty, 'Unknown')),
+            " | **Time to Market:** ", str(_value(time_to_market, 'Unknown')),
+            "\n\n", str(_value(description, 'No description available.')),
+            "\n\n**Target Segment:** ", str(_value(segment, 'Not specified')),
+            "\n\n**Key Requirements:**\n", _bullets(_value(requirements, [])),
+            "\n\n**Competitive Advantage:** ", str(_value(advantage, 'Not specified')),
+            "\n\n---", "\n\n"
+        ))
+    parts.pop()  # No separator after the last opportunity
+    
+    return "".join(parts)
+
+def _format_competitive_section(competitive_landscape: Dict) -> str:
+    """Format competitive landscape section"""
+    if not competitive_landscape:
+        return "Competitive landscape analysis not available."
+    
+    formatted = [f"**Market Concentration:** {competitive_landscape.get('market_concentration', 'Unknown')}"]
+    formatted.append(f"**Competitive Intensity:** {competitive_landscape.get('competitive_intensity', 'Unknown')}")
+    
+    leaders = competitive_landscape.get('market_leaders', [])
+    if leaders:
+        formatted.append("\n### Market Leaders")
+        for leader in leaders:
+            formatted.append(f"- **{leader.get('company_name', 'Unknown')}**: {leader.get('recent_developments', 'No recent developments')}")
+    
+    emerging = competitive_landscape.get('emerging_players', [])
+    if emerging:
+        formatted.append("\n### Emerging Players")
+        for player in emerging:
+            formatted.append(f"- **{player.get('company_name', 'Unknown')}**: {player.get('competitive_edge', 'No competitive edge specified')}")
+    
+    barriers = competitive_landscape.get('barriers_to_entry', [])
+    if barriers:
+        formatted.append("\n### Barriers to Entry")
+        formatted.extend([f"- {barrier}" for barrier in barriers])
+    
+    return "\n".join(formatted)
+
+def _format_recommendations_section(recommendations: Dict[str, List[Any]]) -> str:
+    """Format recommendations section"""
+    if not recommendations["strategy_title"]:
+        return "No strategic recommendations generated."
+    
+    parts = []
+    rows = zip(*map(recommendations.get, _RECOMMENDATION_FIELDS))
+    for i, (title, priority, timeline, _, description, objective, outcomes, resources, indicators) in enumerate(rows, 1):
+        outcomes = _value(outcomes, {})
+        resources = _value(resources, {})
+        parts.extend((
+            "### ", str(i), ". ", str(_value(title, 'Unnamed Strategy')),
+            "\n\n**Priority:** ", str(_value(priority, 'Unknown')),
+            " | **Timeline:** ", str(_value(timeline, 'Unknown')),
+            "\n\n", str(_value(description, 'No description available.')),
+            "\n\n**Strategic Objective:** ", str(_value(objective, 'Not specified')),
+            "\n\n**Expected Outcomes:**\n- **Revenue Impact:** ", str(outcomes.get('revenue_impact', 'Not specified')),
+            "\n- **Market Share Impact:** ", str(outcomes.get('market_share_impact', 'Not specified')),
+            "\n- **Competitive Advantage:** ", str(outcomes.get('competitive_advantage', 'Not specified')),
+            "\n\n**Resource Requirements:**\n- **Budget:** ", str(resources.get('budget_estimate', 'Not specified')),
+            "\n- **Team Size:** ", str(resources.get('team_size', 'Not specified')),
+            "\n- **Key Skills:** ", ', '.join(resources.get('key_skills', [])),
+            "\n\n**Success Indicators:**\n", _bullets(_value(indicators, [])),
+            "\n\n---", "\n\n"
+        ))
+    parts.pop()  # No separator after the last recommendation
+    
+    return "".join(parts)
+
+def _format_roadmap_section(roadmap: Dict) -> str:
+    """Format strategic roadmap section"""
+    if not roadmap:
+        return "Strategic roadmap not available."
+    
+    formatted = [roadmap.get('executive_summary', 'No executive summary available.')]
+    
+    timeline_view = roadmap.get('timeline_view', {})
+    if timeline_view:
+        formatted.append("\n### Implementation Timeline")
+        
+        for timeframe, items in timeline_view.items():
+            if items:
+                formatted.append(f"\n**{timeframe.replace('_', ' ').title()}:**")
+                for item in items:
+                    formatted.append(f"- {item.get('strategy_title', 'Unnamed strategy')}")
+    
+    return "\n".join(formatted)
+
+def _format_implementation_section(recommendations: Dict[str, List[Any]]) -> str:
+    """Format implementation guidelines section"""
+    if not recommendations["strategy_title"]:
+        return "No implementation guidelines available."
+    
+    formatted = ["### Getting Started"]
+    formatted.append("1. **Prioritize High-Impact Initiatives**: Focus on high-priority recommendations first")
+    formatted.append("2. **Secure Resources**: Ensure adequate budget and team allocation")
+    formatted.append("3. **Establish Metrics**: Set up tracking for success indicators")
+    formatted.append("4. **Create Timeline**: Develop detailed implementation schedule")
+    formatted.append("5. **Monitor Progress**: Regular reviews and adjustments")
+    
+    formatted.append("\n### Next Steps")
+    formatted.append("- Review and validate recommendations with stakeholders")
+    formatted.append("- Develop detailed project plans for priority initiatives")
+    formatted.append("- Establish governance and reporting structure")
+    formatted.append("- Begin implementation of quick wins")
+    
+    return "\n".join(formatted)
+
 class FormatterAgent(BaseAgent):
     """Agent responsible for formatting reports, charts, and export layouts"""
     
@@ -35,16 +212,22 @@ class FormatterAgent(BaseAgent):
         query = input_data.get("query", "")
         market_domain = input_data.get("market_domain", "")
         
-        # Create report directory
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M")
-        report_dir = os.path.join(Settings.REPORTS_DIR, f"report_{timestamp}")
+        # Create report directory; the directory name and report footer share one clock read
+        now = datetime.now()
+        report_dir = os.path.join(Settings.REPORTS_DIR, f"report_{now:%Y%m%d_%H%M}")
+        generated_at = f"{now:%Y-%m-%d %H:%M:%S}"
         os.makedirs(report_dir, exist_ok=True)
         
+        # Read each item's fields once; the report sections and dashboard share the columns
+        trend_columns = _columns(trends, _TREND_FIELDS)
+        opportunity_columns = _columns(opportunities, _OPPORTUNITY_FIELDS)
+        recommendation_columns = _columns(recommendations, _RECOMMENDATION_FIELDS)
+        
         # Execute formatting tasks concurrently
         tasks = [
             self._generate_charts(trends, opportunities, recommendations, report_dir, query, market_domain),
-            self._format_report_content(trends, opportunities, competitive_landscape, recommendations, roadmap, query, market_domain),
-            self._create_dashboard_data(trends, opportunities, recommendations, success_metrics)
+            self._format_report_content(trend_columns, opportunity_columns, competitive_landscape, recommendation_columns, roadmap, query, market_domain, generated_at),
+            self._create_dashboard_data(trend_columns, opportunity_columns, recommendation_columns, success_metrics)
         ]
         
         self.update_progress(40, "Generating charts and formatting content")
@@ -66,7 +249,8 @@ class FormatterAgent(BaseAgent):
             "chart_files": chart_files,
             "report_content": report_content,
             "dashboard_data": dashboard_data,
-            "export_files": export_files
+            "export_files": export_files,
+            "export_status": get_export_status(report_dir)["status"] if Settings.BACKGROUND_EXPORTS else "completed"
         }
     
     async def _generate_charts(self, trends: List[Dict], opportunities: List[Dict], 
@@ -74,6 +258,8 @@ class FormatterAgent(BaseAgent):
                              query: str, market_domain: str) -> List[str]:
         """Generate intelligent charts based on analysis results"""
         try:
+            # Imported here so matplotlib is only loaded when charts are rendered
+            from core.charts import IntelligentChartGenerator
             chart_gen = IntelligentChartGenerator(report_dir)
             
             chart_data = {
@@ -93,40 +279,24 @@ class FormatterAgent(BaseAgent):
             logger.error(f"Failed to generate charts: {str(e)}")
             return []
     
-    async def _format_report_content(self, trends: List[Dict], opportunities: List[Dict], 
-                                   competitive_landscape: Dict, recommendations: List[Dict], 
-                                   roadmap: Dict, query: str, market_domain: str) -> str:
+    async def _format_report_content(self, trends: Dict[str, List[Any]], opportunities: Dict[str, List[Any]], 
+                                   competitive_landscape: Dict, recommendations: Dict[str, List[Any]], 
+                                   roadmap: Dict, query: str, market_domain: str, generated_at: str) -> str:
         """Format comprehensive report content"""
         try:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            report_content = f"""# Market Intelligence Report: {market_domain}
-
-## Executive Summary
-This comprehensive market intelligence report analyzes **{query}** in the {market_domain} sector. Our analysis identified {len(trends)} key market trends, {len(opportunities)} strategic opportunities, and {len(recommendations)} actionable recommendations.
-
-## Market Trends Analysis
-{self._format_trends_section(trends)}
-
-## Strategic Opportunities
-{self._format_opportunities_section(opportunities)}
-
-## Competitive Landscape
-{self._format_competitive_section(competitive_landscape)}
-
-## Strategic Recommendations
-{self._format_recommendations_section(recommendations)}
-
-## Strategic Roadmap
-{self._format_roadmap_section(roadmap)}
-
-## Implementation Guidelines
-{self._format_implementation_section(recommendations)}
-
----
-*Report generated on {timestamp} by Market Intelligence Agent v2.0*
-*Query: {query} | Market: {market_domain}*
-"""
+            # Each section is a few string joins, cheaper inline than shipping its data to a worker
+            sections = [
+                _format_trends_section(trends),
+                _format_opportunities_section(opportunities),
+                _format_competitive_section(competitive_landscape),
+                _format_recommendations_section(recommendations),
+                _format_roadmap_section(roadmap),
+                _format_implementation_section(recommendations)
+            ]
+            report_content = self._build_report_content(
+                sections, len(trends["trend_name"]), len(opportunities["opportunity_name"]),
+                len(recommendations["strategy_title"]), query, market_domain, generated_at
+            )
             
             logger.info("Formatted comprehensive report content")
             return report_content
@@ -135,22 +305,46 @@ This comprehensive market intelligence report analyzes **{query}** in the {marke
             logger.error(f"Failed to format report content: {str(e)}")
             return f"# Market Intelligence Report: {market_domain}\n\nReport generation encountered an error."
     
-    async def _create_dashboard_data(self, trends: List[Dict], opportunities: List[Dict], 
-                                   recommendations: List[Dict], success_metrics: Dict) -> Dict[str, Any]:
+    def _build_report_content(self, sections: List[str], trend_count: int, opportunity_count: int, 
+                              recommendation_count: int, query: str, market_domain: str, generated_at: str) -> str:
+        """Assemble the Markdown report from its rendered sections"""
+        out = io.StringIO()
+        out.write(f"# Market Intelligence Report: {market_domain}\n\n")
+        out.write("## Executive Summary\n")
+        out.write(f"This comprehensive market intelligence report analyzes **{query}** in the {market_domain} sector. "
+                  f"Our analysis identified {trend_count} key market trends, {opportunity_count} strategic opportunities, "
+                  f"and {recommendation_count} actionable recommendations.\n")
+        
+        for heading, section in zip(_REPORT_SECTION_HEADINGS, sections):
+            out.write("\n## ")
+            out.write(heading)
+            out.write("\n")
+            out.write(section)
+            out.write("\n")
+        
+        out.write("\n---\n")
+        out.write(f"*Report generated on {generated_at} by Market Intelligence Agent v2.0*\n")
+        out.write(f"*Query: {query} | Market: {market_domain}*\n")
+        return out.getvalue()
+    
+    async def _create_dashboard_data(self, trends: Dict[str, List[Any]], opportunities: Dict[str, List[Any]], 
+                                   recommendations: Dict[str, List[Any]], success_metrics: Dict) -> Dict[str, Any]:
         """Create data structure for interactive dashboard"""
         try:
+            recommendation_data, timeline_data, risk_data, high_priority = self._prepare_recommendation_views(recommendations)
+            
             dashboard_data = {
                 "summary_metrics": {
-                    "total_trends": len(trends),
-                    "total_opportunities": len(opportunities),
-                    "total_recommendations": len(recommendations),
-                    "high_priority_items": len([r for r in recommendations if r.get("priority_level") == "High"])
+                    "total_trends": len(trends["trend_name"]),
+                    "total_opportunities": len(opportunities["opportunity_name"]),
+                    "total_recommendations": len(recommendations["strategy_title"]),
+                    "high_priority_items": high_priority
                 },
                 "trend_data": self._prepare_trend_data(trends),
                 "opportunity_data": self._prepare_opportunity_data(opportunities),
-                "recommendation_data": self._prepare_recommendation_data(recommendations),
-                "timeline_data": self._prepare_timeline_data(recommendations),
-                "risk_data": self._prepare_risk_data(recommendations),
+                "recommendation_data": recommendation_data,
+                "timeline_data": timeline_data,
+                "risk_data": risk_data,
                 "success_metrics": success_metrics
             }
             
@@ -166,35 +360,40 @@ This comprehensive market intelligence report analyzes **{query}** in the {marke
                                  query: str, market_domain: str) -> Dict[str, str]:
         """Create various export file formats"""
         try:
-            exporter = ReportExporter(report_dir)
+            title = f"{market_domain} Market Intelligence Report"
+            md_file = os.path.join(report_dir, f"{market_domain.lower().replace(' ', '_')}_report.md")
+            json_file = os.path.join(report_dir, "dashboard_data.json")
+            
             export_files = {}
             
-            # Save markdown report
-            md_file = os.path.join(report_dir, f"{market_domain.lower().replace(' ', '_')}_report.md")
-            with open(md_file, "w", encoding="utf-8") as f:
-                f.write(report_content)
-            export_files["markdown"] = md_file
+            # Markdown and JSON are read by the UI right away, so they are always written as one batch inline
+            exports = {
+                "markdown/json": asyncio.to_thread(self._write_text_exports, md_file, report_content, json_file, dashboard_data)
+            }
             
-            # Create PDF export
-            try:
-                pdf_file = await exporter.export_to_pdf(report_content, chart_files, f"{market_domain} Market Intelligence Report")
-                export_files["pdf"] = pdf_file
-            except Exception as e:
-                logger.warning(f"PDF export failed: {str(e)}")
+            if Settings.BACKGROUND_EXPORTS:
+                # PDF and DOCX render on the export worker pool; the report page polls get_export_status(report_dir)
+                # for progress and the finished paths
+                try:
+                    submit_exports(report_dir, report_content, chart_files, title)
+                except Exception as e:
+                    logger.warning(f"Could not queue PDF/DOCX export: {str(e)}")
+            else:
+                # Imported here so reportlab and python-docx are only loaded when exporting
+                from core.export.report_exporter import ReportExporter
+                exporter = ReportExporter(report_dir)
+                exports["pdf"] = exporter.export_to_pdf(report_content, chart_files, title)
+                exports["docx"] = exporter.export_to_docx(report_content, chart_files, title)
             
-            # Create DOCX export
-            try:
-                docx_file = await exporter.export_to_docx(report_content, chart_files, f"{market_domain} Market Intelligence Report")
-                export_files["docx"] = docx_file
-            except Exception as e:
-                logger.warning(f"DOCX export failed: {str(e)}")
+            results = await asyncio.gather(*exports.values(), return_exceptions=True)
             
-            # Save dashboard data as JSON
-            json_file = os.path.join(report_dir, "dashboard_data.json")
-            import json
-            with open(json_file, "w", encoding="utf-8") as f:
-                json.dump(dashboard_data, f, indent=2, ensure_ascii=False)
-            export_files["json"] = json_file
+            for export_format, result in zip(exports, results):
+                if isinstance(result, Exception):
+                    logger.warning(f"{export_format.upper()} export failed: {str(result)}")
+                elif export_format == "markdown/json":
+                    export_files["markdown"], export_files["json"] = result
+                else:
+                    export_files[export_format] = result
             
             logger.info(f"Created {len(export_files)} export files")
             return export_files
@@ -203,208 +402,72 @@ This comprehensive market intelligence report analyzes **{query}** in the {marke
             logger.error(f"Failed to create export files: {str(e)}")
             return {}
     
-    def _format_trends_section(self, trends: List[Dict]) -> str:
-        """Format trends section"""
-        if not trends:
-            return "No significant trends identified in the current analysis."
-        
-        formatted = []
-        for i, trend in enumerate(trends, 1):
-            formatted.append(f"""### {i}. {trend.get('trend_name', 'Unnamed Trend')}
-
-**Impact Level:** {trend.get('impact_level', 'Unknown')} | **Timeframe:** {trend.get('timeframe', 'Unknown')} | **Confidence:** {trend.get('confidence_score', 0.7):.1%}
-
-{trend.get('description', 'No description available.')}
-
-**Key Drivers:**
-{chr(10).join([f"- {driver}" for driver in trend.get('key_drivers', [])])}
-
-**Supporting Evidence:**
-{chr(10).join([f"- {evidence}" for evidence in trend.get('supporting_evidence', [])])}
-
----""")
-        
-        return "\n\n".join(formatted)
-    
-    def _format_opportunities_section(self, opportunities: List[Dict]) -> str:
-        """Format opportunities section"""
-        if not opportunities:
-            return "No specific opportunities identified in the current analysis."
-        
-        formatted = []
-        for i, opp in enumerate(opportunities, 1):
-            formatted.append(f"""### {i}. {opp.get('opportunity_name', 'Unnamed Opportunity')}
-
-**Revenue Potential:** {opp.get('revenue_potential', 'Unknown')} | **Implementation:** {opp.get('implementation_difficulty', 'Unknown')} | **Time to Market:** {opp.get('time_to_market', 'Unknown')}
-
-{opp.get('description', 'No description available.')}
-
-**Target Segment:** {opp.get('target_segment', 'Not specified')}
-
-**Key Requirements:**
-{chr(10).join([f"- {req}" for req in opp.get('key_requirements', [])])}
-
-**Competitive Advantage:** {opp.get('competitive_advantage', 'Not specified')}
-
----""")
-        
-        return "\n\n".join(formatted)
-    
-    def _format_competitive_section(self, competitive_landscape: Dict) -> str:
-        """Format competitive landscape section"""
-        if not competitive_landscape:
-            return "Competitive landscape analysis not available."
-        
-        formatted = [f"**Market Concentration:** {competitive_landscape.get('market_concentration', 'Unknown')}"]
-        formatted.append(f"**Competitive Intensity:** {competitive_landscape.get('competitive_intensity', 'Unknown')}")
-        
-        leaders = competitive_landscape.get('market_leaders', [])
-        if leaders:
-            formatted.append("\n### Market Leaders")
-            for leader in leaders:
-                formatted.append(f"- **{leader.get('company_name', 'Unknown')}**: {leader.get('recent_developments', 'No recent developments')}")
-        
-        emerging = competitive_landscape.get('emerging_players', [])
-        if emerging:
-            formatted.append("\n### Emerging Players")
-            for player in emerging:
-                formatted.append(f"- **{player.get('company_name', 'Unknown')}**: {player.get('competitive_edge', 'No competitive edge specified')}")
-        
-        barriers = competitive_landscape.get('barriers_to_entry', [])
-        if barriers:
-            formatted.append("\n### Barriers to Entry")
-            formatted.extend([f"- {barrier}" for barrier in barriers])
-        
-        return "\n".join(formatted)
-    
-    def _format_recommendations_section(self, recommendations: List[Dict]) -> str:
-        """Format recommendations section"""
-        if not recommendations:
-            return "No strategic recommendations generated."
-        
-        formatted = []
-        for i, rec in enumerate(recommendations, 1):
-            formatted.append(f"""### {i}. {rec.get('strategy_title', 'Unnamed Strategy')}
-
-**Priority:** {rec.get('priority_level', 'Unknown')} | **Timeline:** {rec.get('implementation_timeline', 'Unknown')}
-
-{rec.get('description', 'No description available.')}
-
-**Strategic Objective:** {rec.get('strategic_objective', 'Not specified')}
-
-**Expected Outcomes:**
-- **Revenue Impact:** {rec.get('expected_outcomes', {}).get('revenue_impact', 'Not specified')}
-- **Market Share Impact:** {rec.get('expected_outcomes', {}).get('market_share_impact', 'Not specified')}
-- **Competitive Advantage:** {rec.get('expected_outcomes', {}).get('competitive_advantage', 'Not specified')}
-
-**Resource Requirements:**
-- **Budget:** {rec.get('resource_requirements', {}).get('budget_estimate', 'Not specified')}
-- **Team Size:** {rec.get('resource_requirements', {}).get('team_size', 'Not specified')}
-- **Key Skills:** {', '.join(rec.get('resource_requirements', {}).get('key_skills', []))}
-
-**Success Indicators:**
-{chr(10).join([f"- {indicator}" for indicator in rec.get('success_indicators', [])])}
-
----""")
-        
-        return "\n\n".join(formatted)
+    def _write_text_exports(self, md_file: str, report_content: str, 
+                            json_file: str, dashboard_data: Dict) -> List[str]:
+        """Save the markdown report and dashboard JSON in a single batch"""
+        return write_files([
+            (md_file, report_content.encode("utf-8")),
+            (json_file, orjson.dumps(dashboard_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        ])
     
-    def _format_roadmap_section(self, roadmap: Dict) -> str:
-        """Format strategic roadmap section"""
-        if not roadmap:
-            return "Strategic roadmap not available."
-        
-        formatted = [roadmap.get('executive_summary', 'No executive summary available.')]
-        
-        timeline_view = roadmap.get('timeline_view', {})
-        if timeline_view:
-            formatted.append("\n### Implementation Timeline")
-            
-            for timeframe, items in timeline_view.items():
-                if items:
-                    formatted.append(f"\n**{timeframe.replace('_', ' ').title()}:**")
-                    for item in items:
-                        formatted.append(f"- {item.get('strategy_title', 'Unnamed strategy')}")
-        
-        return "\n".join(formatted)
-    
-    def _format_implementation_section(self, recommendations: List[Dict]) -> str:
-        """Format implementation guidelines section"""
-        if not recommendations:
-            return "No implementation guidelines available."
-        
-        formatted = ["### Getting Started"]
-        formatted.append("1. **Prioritize High-Impact Initiatives**: Focus on high-priority recommendations first")
-        formatted.append("2. **Secure Resources**: Ensure adequate budget and team allocation")
-        formatted.append("3. **Establish Metrics**: Set up tracking for success indicators")
-        formatted.append("4. **Create Timeline**: Develop detailed implementation schedule")
-        formatted.append("5. **Monitor Progress**: Regular reviews and adjustments")
-        
-        formatted.append("\n### Next Steps")
-        formatted.append("- Review and validate recommendations with stakeholders")
-        formatted.append("- Develop detailed project plans for priority initiatives")
-        formatted.append("- Establish governance and reporting structure")
-        formatted.append("- Begin implementation of quick wins")
-        
-        return "\n".join(formatted)
-    
-    def _prepare_trend_data(self, trends: List[Dict]) -> List[Dict]:
+    def _prepare_trend_data(self, trends: Dict[str, List[Any]]) -> List[Dict]:
         """Prepare trend data for dashboard visualization"""
         return [{
-            "name": trend.get("trend_name", "Unknown"),
-            "impact": trend.get("impact_level", "Medium"),
-            "timeframe": trend.get("timeframe", "Medium-term"),
-            "confidence": trend.get("confidence_score", 0.7)
-        } for trend in trends]
+            "name": _value(name, "Unknown"),
+            "impact": _value(impact, "Medium"),
+            "timeframe": _value(timeframe, "Medium-term"),
+            "confidence": _value(confidence, 0.7)
+        } for name, impact, timeframe, confidence in zip(
+            trends["trend_name"], trends["impact_level"], trends["timeframe"], trends["confidence_score"]
+        )]
     
-    def _prepare_opportunity_data(self, opportunities: List[Dict]) -> List[Dict]:
+    def _prepare_opportunity_data(self, opportunities: Dict[str, List[Any]]) -> List[Dict]:
         """Prepare opportunity data for dashboard visualization"""
         return [{
-            "name": opp.get("opportunity_name", "Unknown"),
-            "revenue_potential": opp.get("revenue_potential", "Medium"),
-            "implementation_difficulty": opp.get("implementation_difficulty", "Medium"),
-            "time_to_market": opp.get("time_to_market", "Unknown")
-        } for opp in opportunities]
+            "name": _value(name, "Unknown"),
+            "revenue_potential": _value(revenue, "Medium"),
+            "implementation_difficulty": _value(difficulty, "Medium"),
+            "time_to_market": _value(time_to_market, "Unknown")
+        } for name, revenue, difficulty, time_to_market in zip(
+            opportunities["opportunity_name"], opportunities["revenue_potential"],
+            opportunities["implementation_difficulty"], opportunities["time_to_market"]
+        )]
     
-    def _prepare_recommendation_data(self, recommendations: List[Dict]) -> List[Dict]:
-        """Prepare recommendation data for dashboard visualization"""
-        return [{
-            "title": rec.get("strategy_title", "Unknown"),
-            "priority": rec.get("priority_level", "Medium"),
-            "timeline": rec.get("implementation_timeline", "Medium-term"),
-            "confidence": rec.get("confidence_score", 0.7)
-        } for rec in recommendations]
-    
-    def _prepare_timeline_data(self, recommendations: List[Dict]) -> Dict[str, List]:
-        """Prepare timeline data for dashboard visualization"""
-        timeline = {"Short-term": [], "Medium-term": [], "Long-term": []}
-        
-        for rec in recommendations:
-            timeframe = rec.get("implementation_timeline", "Medium-term")
-            if timeframe in timeline:
-                timeline[timeframe].append(rec.get("strategy_title", "Unknown"))
+    def _prepare_recommendation_views(self, recommendations: Dict[str, List[Any]]) -> Tuple[List[Dict], Dict[str, List], List[Dict], int]:
+        """Prepare recommendation, timeline and risk dashboard data and the high-priority count in one pass"""
+        recommendation_data = []
+        timeline_data = {"Short-term": [], "Medium-term": [], "Long-term": []}
+        risk_data = []
+        high_priority = 0
         
-        return timeline
-    
-    def _prepare_risk_data(self, recommendations: List[Dict]) -> List[Dict]:
-        """Prepare risk data for dashboard visualization"""
-        # Extract risk information from recommendations
-        risks = []
-        for rec in recommendations:
-            # Simple risk assessment based on implementation difficulty and timeline
-            difficulty = rec.get("resource_requirements", {}).get("implementation_difficulty", "Medium")
-            timeline = rec.get("implementation_timeline", "Medium-term")
+        for title, priority, timeline, confidence, resources in zip(
+            recommendations["strategy_title"], recommendations["priority_level"],
+            recommendations["implementation_timeline"], recommendations["confidence_score"],
+            recommendations["resource_requirements"]
+        ):
+            title = _value(title, "Unknown")
+            timeline = _value(timeline, "Medium-term")
+            if priority == "High":
+                high_priority += 1
+            
+            recommendation_data.append({
+                "title": title,
+                "priority": _value(priority, "Medium"),
+                "timeline": timeline,
+                "confidence": _value(confidence, 0.7)
+            })
+            
+            if timeline in timeline_data:
+                timeline_data[timeline].append(title)
             
-            risk_level = "Low"
-            if difficulty == "Hard" or timeline == "Long-term":
-                risk_level = "High"
-            elif difficulty == "Medium" or timeline == "Medium-term":
-                risk_level = "Medium"
+            # Simple risk assessment based on implementation difficulty and timeline
+            difficulty = _value(resources, {}).get("implementation_difficulty", "Medium")
+            risk_rank = max(_DIFFICULTY_RISK.get(difficulty, 0), _TIMELINE_RISK.get(timeline, 0))
             
-            risks.append({
-                "strategy": rec.get("strategy_title", "Unknown"),
-                "risk_level": risk_level,
+            risk_data.append({
+                "strategy": title,
+                "risk_level": _RISK_LEVELS[risk_rank],
                 "category": "Implementation"
             })
         
-        return risks
+        return recommendation_data, timeline_data, risk_data, high_priority
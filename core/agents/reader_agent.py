@@ -1,14 +1,193 @@
+import aiohttp
 import asyncio
+import copy
+import dataclasses
+import functools
+import itertools
 import logging
-from typing import Dict, List, Any
+import re
+import threading
+from typing import Dict, Iterator, List, Any, Optional, Tuple, Union
+from cachetools import LRUCache, TTLCache
+from pydantic import BaseModel, Field
 from core.agents.base_agent import BaseAgent
 from core.integrations.firecrawl_client import FirecrawlClient
 from core.integrations.newsdata_client import NewsDataClient
-from langchain.chat_models import init_chat_model
+from core.llm import get_llm
+from core.llm_cache import SemanticResponseCache
 from config.settings import Settings
 
 logger = logging.getLogger(__name__)
 
+_MAX_ANALYSIS_ITEMS = 20
+_WEB_SUBQUERIES = ("market trends", "competitors", "pricing strategy", "regulation")
+_WEB_RESULTS_PER_SUBQUERY = 3
+_MAX_WEB_PAGES = 8
+_ANALYSIS_CHUNK_SIZE = 5  # Content items per partial analysis prompt
+_LIST_FIELDS = ("key_themes", "market_signals", "recommended_focus_areas")
+_ESCALATION_QUALITY_SCORE = 4  # Partials scored below this are redone with the main model
+
+# Prompt label for each analysed source. Trending topics only feed the returned data, not the analysis prompt
+_ANALYSIS_LABELS = {"web": "WEB", "news": "NEWS"}
+_ANALYSIS_TEXT_CHARS = 300
+_TITLE_SIMILARITY = 0.8  # Titles at or above this 5-gram Jaccard similarity count as duplicates
+_WHITESPACE_RE = re.compile(r"\s+")
+_OFFLOAD_MIN_ITEMS = 200  # Larger batches are deduplicated in a worker thread instead of on the event loop
+
+# Static instructions come first so every partial prompt shares a cacheable prefix; the query,
+# market and data are appended per call by _build_partial_prompt
+_PARTIAL_ANALYSIS_PROMPT_PREFIX = """Analyze the collected market data below for the given query and market.
+This is one part of a larger data set; report only what this part shows.
+
+Extract and return a JSON object with:
+1. key_themes: List of main themes found
+2. market_signals: Important market signals or indicators
+3. data_quality_score: Score from 1-10 for data quality
+4. content_summary: One-sentence summary of this content
+5. recommended_focus_areas: Areas that need more research
+"""
+
+
+class PartialAnalysis(BaseModel):
+    """Structured result of one partial analysis prompt"""
+    key_themes: List[str] = Field(default_factory=list, description="Main themes found")
+    market_signals: List[str] = Field(default_factory=list, description="Important market signals or indicators")
+    data_quality_score: float = Field(5, description="Score from 1-10 for data quality")
+    content_summary: str = Field("", description="One-sentence summary of this content")
+    recommended_focus_areas: List[str] = Field(default_factory=list, description="Areas that need more research")
+
+
+# Merged analyses keyed on (query, market_domain, analysis items); identical re-runs skip the LLM
+_PROCESSED_CACHE = LRUCache(maxsize=32)
+
+# Merged analyses by query embedding within a market, so near-duplicate queries skip the LLM too
+_RESPONSE_CACHE = SemanticResponseCache()
+
+# Collected source data keyed on (query, market_domain); news goes stale faster than web content
+_WEB_CACHE = TTLCache(maxsize=Settings.SEARCH_CACHE_SIZE, ttl=Settings.WEB_CACHE_TTL)
+_NEWS_CACHE = TTLCache(maxsize=Settings.SEARCH_CACHE_SIZE, ttl=Settings.NEWS_CACHE_TTL)
+_TRENDING_CACHE = TTLCache(maxsize=1, ttl=Settings.TRENDING_CACHE_TTL)
+_SOURCE_CACHE_LOCK = threading.Lock()  # Each Streamlit run drives its own event loop thread
+
+
+@dataclasses.dataclass(slots=True)
+class WebItem:
+    """A scraped web page kept for analysis"""
+    source: str
+    url: str
+    title: str
+    content: str
+    preview: str
+    metadata: Dict[str, Any]
+
+
+@dataclasses.dataclass(slots=True)
+class NewsItem:
+    """A NewsData.io article kept for analysis"""
+    source: str
+    title: str
+    description: str
+    content: str
+    preview: str
+    url: str
+    published_date: str
+    news_source: str
+    category: List[str]
+    keywords: List[str]
+    country: List[str]
+    language: str
+    article_id: str
+
+
+SourceItem = Union[WebItem, NewsItem]
+
+
+def _cached_sources(cache: TTLCache, key: Tuple) -> Optional[List[Any]]:
+    """Return a copy of cached source data, or None on a miss"""
+    with _SOURCE_CACHE_LOCK:
+        cached = cache.get(key)
+    return list(cached) if cached is not None else None
+
+
+def _cache_sources(cache: TTLCache, key: Tuple, items: List[Any]):
+    """Cache non-empty source data; empty results usually mean a failed fetch and are retried next run"""
+    if items:
+        with _SOURCE_CACHE_LOCK:
+            cache[key] = list(items)
+
+
+def _title_shingles(title: str) -> frozenset:
+    """Character 5-grams of a normalized title"""
+    title = title.lower()
+    return frozenset(title[i:i + 5] for i in range(len(title) - 4))
+
+
+def _preview(text: str) -> str:
+    """Whitespace-collapsed prompt excerpt of an item's text"""
+    # Collapse whitespace on a bounded slice so long scraped pages are not scanned in full
+    return _WHITESPACE_RE.sub(" ", text[:2 * _ANALYSIS_TEXT_CHARS]).strip()[:_ANALYSIS_TEXT_CHARS]
+
+
+def _analysis_candidates(source: str, items: List[SourceItem], kept_titles: List[frozenset]) -> Iterator[str]:
+    """Yield compact prompt lines for items whose title is not a near-duplicate of one already kept"""
+    label = _ANALYSIS_LABELS[source]
+    for item in items:
+        title = _WHITESPACE_RE.sub(" ", item.title or "").strip()
+        shingles = _title_shingles(title)
+        if shingles:
+            if any(len(shingles & kept) >= _TITLE_SIMILARITY * len(shingles | kept) for kept in kept_titles):
+                continue
+            kept_titles.append(shingles)
+        yield f"{label}: {title} | {item.preview}"
+
+
+def _dedupe_candidates(source: str, items: List[SourceItem],
+                       kept_titles: List[frozenset]) -> Tuple[List[str], List[frozenset]]:
+    """Build the prompt lines for a batch of items, returning them with the updated kept titles"""
+    kept_titles = list(kept_titles)
+    return list(_analysis_candidates(source, items, kept_titles)), kept_titles
+
+
+def _select_analysis_items(candidates: List[str], query: str) -> List[str]:
+    """Keep the candidates mentioning the most query terms, preserving arrival order among ties"""
+    terms = query.lower().split()
+    return sorted(candidates, key=lambda line: -sum(term in line.lower() for term in terms))[:_MAX_ANALYSIS_ITEMS]
+
+
+def _build_partial_prompt(query: str, market_domain: str, lines: List[str]) -> str:
+    """Append the per-call query, market and data lines to the static analysis prefix"""
+    return "".join((_PARTIAL_ANALYSIS_PROMPT_PREFIX, f"\nQuery: {query}\nMarket: {market_domain}\n\nData:\n",
+                    "\n".join(lines)))
+
+
+@functools.lru_cache(maxsize=2)
+def _get_analysis_llm(model_name: str):
+    """Wrap a shared chat model so it returns PartialAnalysis objects instead of free text"""
+    return get_llm(model_name).with_structured_output(PartialAnalysis)
+
+
+def _needs_escalation(partial: Optional[Dict[str, Any]]) -> bool:
+    """Whether a summary-model analysis is unusable or rates its data too low to trust"""
+    if partial is None:
+        return True
+    score = partial.get("data_quality_score")
+    return isinstance(score, (int, float)) and score < _ESCALATION_QUALITY_SCORE
+
+
+def _merge_partials(partials: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Reduce partial analyses into one, de-duplicating list fields in first-seen order"""
+    merged = {field: list(dict.fromkeys(
+        str(value) for partial in partials for value in (partial.get(field) or [])
+    )) for field in _LIST_FIELDS}
+    
+    scores = [partial["data_quality_score"] for partial in partials
+              if isinstance(partial.get("data_quality_score"), (int, float))]
+    merged["data_quality_score"] = round(sum(scores) / len(scores)) if scores else 5
+    merged["content_summary"] = " ".join(
+        str(partial["content_summary"]) for partial in partials if partial.get("content_summary")
+    )
+    return merged
+
 class ReaderAgent(BaseAgent):
     """Agent responsible for reading and collecting data from various sources"""
     
@@ -18,6 +197,14 @@ class ReaderAgent(BaseAgent):
             description="Collects data from web sources, news APIs, and documents"
         )
         self.firecrawl = FirecrawlClient()
+        self._limits: Dict[str, asyncio.Semaphore] = {}
+        
+        # Build the shared chat model up front so the first analysis does not pay for client setup
+        try:
+            self._llm = _get_analysis_llm(Settings.LLM_SUMMARY_MODEL)
+        except Exception as e:
+            logger.warning(f"Could not initialize LLM, will retry on first use: {str(e)}")
+            self._llm = None
         
         # Initialize NewsData client with error handling
         try:
@@ -38,93 +225,152 @@ class ReaderAgent(BaseAgent):
         
         self.update_progress(10, "Initializing data collection")
         
-        # Collect data from multiple sources concurrently
-        tasks = [
-            self._collect_web_content(query, market_domain),
-        ]
-        
-        # Only add news collection if NewsData client is available
-        if self.newsdata:
-            tasks.append(self._collect_news_data(query, market_domain))
-            tasks.append(self._collect_trending_topics())
-        else:
-            logger.warning("NewsData.io not available - skipping news collection")
-        
-        self.update_progress(30, "Collecting data from sources")
-        
-        if len(tasks) == 1:
-            # Only web content
-            web_content = await tasks[0]
-            news_data = []
-            trending_topics = []
-        else:
-            # Web content + news data
-            web_content, news_data, trending_topics = await asyncio.gather(*tasks)
-        
-        self.update_progress(80, "Processing collected data")
+        # Collect data from multiple sources concurrently; cancelling the agent cancels every in-flight fetch.
+        # The session is created here so it binds to the running loop and is shared by every collector
+        # Per-host semaphores cap in-flight requests to each provider; retries release them while backing off
+        self._limits = {
+            "firecrawl": asyncio.Semaphore(Settings.FETCH_MAX_CONCURRENCY),
+            "newsdata": asyncio.Semaphore(Settings.NEWSDATA_MAX_CONCURRENCY)
+        }
+        connector = aiohttp.TCPConnector(limit=64, limit_per_host=8)
+        # Connect and read limits fail a stalled socket fast; each collector also has an overall budget
+        timeout = aiohttp.ClientTimeout(total=30, connect=Settings.HTTP_CONNECT_TIMEOUT,
+                                        sock_read=Settings.HTTP_READ_TIMEOUT)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            async with asyncio.TaskGroup() as tg:
+                tasks = {"web": tg.create_task(self._collect_web_content(session, query, market_domain))}
+                
+                # Only add news collection if NewsData client is available
+                if self.newsdata:
+                    tasks["news"] = tg.create_task(self._collect_news_data(session, query, market_domain))
+                    tasks["trending"] = tg.create_task(self._collect_trending_topics(session))
+                else:
+                    logger.warning("NewsData.io not available - skipping news collection")
+                
+                self.update_progress(30, "Collecting data from sources")
+                
+                # Feed items into the analysis as sources finish; once enough have arrived the LLM
+                # analysis starts while slower sources keep draining for the returned data
+                # Near-duplicate titles (common across newswires) are dropped and the most relevant items kept
+                candidates, kept_titles = [], []
+                processing_task = None
+                pending = set(tasks.values())
+                while pending and processing_task is None:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for source, task in tasks.items():
+                        if task not in done or source not in _ANALYSIS_LABELS:
+                            continue
+                        items = task.result()
+                        if len(items) > _OFFLOAD_MIN_ITEMS:
+                            # Keep the loop free for the other collectors; small batches stay inline
+                            lines, kept_titles = await asyncio.to_thread(
+                                _dedupe_candidates, source, items, kept_titles
+                            )
+                            candidates.extend(lines)
+                        else:
+                            candidates.extend(_analysis_candidates(source, items, kept_titles))
+                    if len(candidates) >= _MAX_ANALYSIS_ITEMS or not pending:
+                        self.update_progress(80, "Processing collected data")
+                        processing_task = tg.create_task(self._process_collected_data(
+                            _select_analysis_items(candidates, query), query, market_domain
+                        ))
         
-        # Process and structure the collected data
-        processed_data = await self._process_collected_data(
-            web_content, news_data, trending_topics, query, market_domain
-        )
+        web_content = tasks["web"].result()
+        news_data = tasks["news"].result() if "news" in tasks else []
+        trending_topics = tasks["trending"].result() if "trending" in tasks else []
+        processed_data = processing_task.result()
         
         self.update_progress(100, "Data collection completed")
         
+        # Items stay slotted dataclasses internally and become plain dicts only at the agent boundary
         return {
             "success": True,
-            "web_content": web_content,
-            "news_data": news_data,
+            "web_content": [dataclasses.asdict(item) for item in web_content],
+            "news_data": [dataclasses.asdict(item) for item in news_data],
             "trending_topics": trending_topics,
             "processed_data": processed_data,
             "total_sources": len(web_content) + len(news_data)
         }
     
-    async def _collect_web_content(self, query: str, market_domain: str) -> List[Dict[str, Any]]:
+    async def _collect_web_content(self, session: aiohttp.ClientSession, query: str, market_domain: str) -> List[WebItem]:
         """Collect web content using Firecrawl"""
+        cached = _cached_sources(_WEB_CACHE, (query, market_domain))
+        if cached is not None:
+            logger.info(f"Using {len(cached)} cached web content pieces")
+            return cached
+        
         try:
-            # Search and scrape relevant content
-            search_query = f"{query} {market_domain} market analysis trends"
-            web_results = self.firecrawl.search_and_scrape(search_query, num_results=8)
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + Settings.WEB_COLLECT_TIMEOUT
+            
+            # Search focused sub-queries concurrently; interleaving their results keeps every facet
+            # represented, and URLs found by more than one sub-query are scraped once
+            async with asyncio.timeout_at(deadline):
+                searches = await asyncio.gather(*(self.firecrawl.search_async(
+                    session, f"{query} {market_domain} {topic}", num_results=_WEB_RESULTS_PER_SUBQUERY,
+                    semaphore=self._limits["firecrawl"]
+                ) for topic in _WEB_SUBQUERIES))
+            ranked_urls = (url for tier in itertools.zip_longest(*searches) for url in tier if url)
+            urls = list(dict.fromkeys(ranked_urls))[:_MAX_WEB_PAGES]
+            
+            # Scrape every result page concurrently; the per-host limit bounds in-flight requests
+            # Pages still loading at the deadline are dropped so one hung site cannot stall the run
+            scrapes = [asyncio.create_task(self.firecrawl.scrape_url_async(
+                session, url, semaphore=self._limits["firecrawl"]
+            )) for url in urls]
+            pending = set()
+            if scrapes:
+                _, pending = await asyncio.wait(scrapes, timeout=max(deadline - loop.time(), 0))
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    logger.warning(f"Dropped {len(pending)} web scrapes exceeding the {Settings.WEB_COLLECT_TIMEOUT}s budget")
+            web_results = [task.exception() or task.result() for task in scrapes if task not in pending]
             
             # Filter and clean results
             filtered_results = []
             for result in web_results:
-                if result.get("content") and len(result["content"]) > 100:
-                    filtered_results.append({
-                        "source": "web_scraping",
-                        "url": result.get("url", ""),
-                        "title": result.get("title", ""),
-                        "content": result.get("content", "")[:2000],  # Limit content length
-                        "metadata": result.get("metadata", {})
-                    })
+                if isinstance(result, Exception):
+                    logger.warning(f"Failed to scrape web result: {str(result)}")
+                    continue
+                content = result.get("content") or ""
+                if len(content) > 100:
+                    filtered_results.append(WebItem(
+                        source="web_scraping",
+                        url=result.get("url", ""),
+                        title=result.get("title", ""),
+                        content=content[:2000],  # Limit content length
+                        preview=_preview(content),  # Prompt excerpt, computed once and cached with the item
+                        metadata=result.get("metadata", {})
+                    ))
             
             logger.info(f"Collected {len(filtered_results)} web content pieces")
+            _cache_sources(_WEB_CACHE, (query, market_domain), filtered_results)
             return filtered_results
             
+        except TimeoutError:
+            logger.warning(f"Web search timed out after {Settings.WEB_COLLECT_TIMEOUT}s")
+            return []
         except Exception as e:
             logger.error(f"Failed to collect web content: {str(e)}")
             return []
     
-    async def _collect_news_data(self, query: str, market_domain: str) -> List[Dict[str, Any]]:
+    async def _collect_news_data(self, session: aiohttp.ClientSession, query: str, market_domain: str) -> List[NewsItem]:
         """Collect news data using NewsData.io"""
+        cached = _cached_sources(_NEWS_CACHE, (query, market_domain))
+        if cached is not None:
+            logger.info(f"NewsData.io: Using {len(cached)} cached news articles")
+            return cached
+        
         try:
             logger.info(f"NewsData.io: Starting news collection for '{query}' in {market_domain}")
             
-            # Create comprehensive search query
-            news_query = f"{query} {market_domain}"
-            
-            # Try to get news with the query
-            news_articles = self.newsdata.get_latest_news(news_query, size=20)
-            
-            # If no results with combined query, try with just the query
-            if not news_articles and query != market_domain:
-                logger.info(f"NewsData.io: Retrying with query only: {query}")
-                news_articles = self.newsdata.get_latest_news(query, size=15)
-            
-            # If still no results, try with just market domain
-            if not news_articles:
-                logger.info(f"NewsData.io: Retrying with market domain: {market_domain}")
-                news_articles = self.newsdata.get_latest_news(market_domain, size=15)
+            # Query the combined, query-only and domain-only variants concurrently and merge their results
+            news_queries = {f"{query} {market_domain}": 20, query: 15, market_domain: 15}
+            async with asyncio.timeout(Settings.NEWS_COLLECT_TIMEOUT):
+                news_articles = await self.newsdata.get_latest_news_multi(
+                    session, news_queries, semaphore=self._limits["newsdata"]
+                )
             
             # Process news articles
             processed_articles = []
@@ -140,83 +386,124 @@ class ReaderAgent(BaseAgent):
                 if not title and not description:
                     continue
                 
-                processed_article = {
-                    "source": "newsdata_io",
-                    "title": title,
-                    "description": description,
-                    "content": content or description,  # Use description if no content
-                    "url": article.get("url", ""),
-                    "published_date": article.get("published_date", ""),
-                    "news_source": article.get("source_name", article.get("source", "")),
-                    "category": article.get("category", []),
-                    "keywords": article.get("keywords", []),
-                    "country": article.get("country", []),
-                    "language": article.get("language", ""),
-                    "article_id": article.get("article_id", "")
-                }
+                processed_article = NewsItem(
+                    source="newsdata_io",
+                    title=title,
+                    description=description,
+                    content=content or description,  # Use description if no content
+                    preview=_preview(description),
+                    url=article.get("url", ""),
+                    published_date=article.get("published_date", ""),
+                    news_source=article.get("source_name", article.get("source", "")),
+                    category=article.get("category", []),
+                    keywords=article.get("keywords", []),
+                    country=article.get("country", []),
+                    language=article.get("language", ""),
+                    article_id=article.get("article_id", "")
+                )
                 processed_articles.append(processed_article)
         
             logger.info(f"NewsData.io: Successfully collected {len(processed_articles)} news articles")
+            _cache_sources(_NEWS_CACHE, (query, market_domain), processed_articles)
             return processed_articles
             
+        except TimeoutError:
+            logger.warning(f"NewsData.io: News collection timed out after {Settings.NEWS_COLLECT_TIMEOUT}s")
+            return []
         except Exception as e:
             logger.error(f"NewsData.io: Failed to collect news data: {str(e)}")
             return []
     
-    async def _collect_trending_topics(self) -> List[Dict[str, Any]]:
+    async def _collect_trending_topics(self, session: aiohttp.ClientSession) -> List[Dict[str, Any]]:
         """Collect trending topics"""
+        cached = _cached_sources(_TRENDING_CACHE, ())
+        if cached is not None:
+            logger.info(f"NewsData.io: Using {len(cached)} cached trending topics")
+            return cached
+        
         try:
             logger.info("NewsData.io: Collecting trending topics")
-            trending = self.newsdata.get_trending_topics()
+            async with asyncio.timeout(Settings.TRENDING_COLLECT_TIMEOUT):
+                trending = await self.newsdata.get_trending_topics_async(session, semaphore=self._limits["newsdata"])
             
             if trending:
                 logger.info(f"NewsData.io: Collected {len(trending)} trending topics")
+                _cache_sources(_TRENDING_CACHE, (), trending)
             else:
                 logger.warning("NewsData.io: No trending topics retrieved")
             
             return trending
         
+        except TimeoutError:
+            logger.warning(f"NewsData.io: Trending topics timed out after {Settings.TRENDING_COLLECT_TIMEOUT}s")
+            return []
         except Exception as e:
             logger.error(f"NewsData.io: Failed to collect trending topics: {str(e)}")
             return []
     
-    async def _process_collected_data(self, web_content: List[Dict], news_data: List[Dict], 
-                                    trending_topics: List[Dict], query: str, market_domain: str) -> Dict[str, Any]:
+    async def _analyze_partial(self, prompt: str, semaphore: asyncio.Semaphore,
+                               progress_step: float) -> Optional[Dict[str, Any]]:
+        """Analyze one chunk with the summary model, escalating to the main model if the result is unusable"""
+        async with semaphore:
+            try:
+                result = await self._llm.ainvoke(prompt)
+                partial = result.model_dump() if result is not None else None
+            except Exception as e:
+                logger.warning(f"Summary model failed on partial analysis: {str(e)}", exc_info=True)
+                partial = None
+            
+            if _needs_escalation(partial):
+                logger.info("Escalating partial analysis to the main model")
+                try:
+                    result = await _get_analysis_llm(Settings.LLM_MODEL).ainvoke(prompt)
+                    partial = result.model_dump() if result is not None else partial
+                except Exception as e:
+                    logger.error(f"Main model failed on escalated partial analysis: {str(e)}")
+        
+        self.update_progress(int(self.progress + progress_step), "Processing collected data")
+        return partial
+    
+    async def _process_collected_data(self, analysis_items: List[str], query: str, market_domain: str) -> Dict[str, Any]:
         """Process and analyze collected data using LLM"""
         try:
-            # Combine all content for analysis
-            all_content = []
-            
-            for item in web_content:
-                all_content.append(f"WEB: {item.get('title', '')} - {item.get('content', '')[:500]}")
-            
-            for item in news_data:
-                all_content.append(f"NEWS: {item.get('title', '')} - {item.get('description', '')}")
+            # Identical items for the same query reuse the previous analysis
+            cache_key = (query, market_domain, tuple(analysis_items))
+            if cache_key in _PROCESSED_CACHE:
+                logger.info("Reusing cached analysis of collected data")
+                return copy.deepcopy(_PROCESSED_CACHE[cache_key])
             
-            # Use LLM to extract key themes and insights
-            llm = init_chat_model(Settings.LLM_MODEL, model_provider="google_genai")
+            # A similar query in the same market reuses its analysis; embedding runs off the event loop
+            semantic_namespace = f"reader_analysis:{market_domain}"
+            cached = await asyncio.to_thread(_RESPONSE_CACHE.get, semantic_namespace, query, True)
+            if cached is not None:
+                return copy.deepcopy(cached)
             
-            analysis_prompt = f"""
-            Analyze the following collected data about "{query}" in the {market_domain} market.
+            # Split the content into small prompts that run in parallel and are merged afterwards
+            prompts = [_build_partial_prompt(query, market_domain, analysis_items[i:i + _ANALYSIS_CHUNK_SIZE])
+                       for i in range(0, len(analysis_items), _ANALYSIS_CHUNK_SIZE)]
             
-            Extract and return a JSON object with:
-            1. key_themes: List of main themes found
-            2. market_signals: Important market signals or indicators
-            3. data_quality_score: Score from 1-10 for data quality
-            4. content_summary: Brief summary of collected content
-            5. recommended_focus_areas: Areas that need more research
+            if self._llm is None:
+                self._llm = _get_analysis_llm(Settings.LLM_SUMMARY_MODEL)
+            # Run each partial analysis on the summary model, advancing progress from 80% towards 100% as they complete
+            semaphore = asyncio.Semaphore(Settings.LLM_BATCH_CONCURRENCY)
+            progress_step = 15 / max(len(prompts), 1)
+            results = await asyncio.gather(*(
+                self._analyze_partial(prompt, semaphore, progress_step) for prompt in prompts
+            ), return_exceptions=True)
+            partials = []
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.warning(f"Partial analysis failed: {str(result)}", exc_info=result)
+                elif result is not None:
+                    partials.append(result)
             
-            Data:
-            {chr(10).join(all_content[:20])}  # Limit to first 20 items
-            """
-            
-            response = llm.invoke(analysis_prompt)
-            
-            # Try to parse as JSON, fallback to structured text
-            try:
-                import json
-                processed = json.loads(response.content if hasattr(response, 'content') else str(response))
-            except:
+            # Fall back to structured text if no partial analysis could be parsed
+            if partials:
+                processed = _merge_partials(partials)
+                _PROCESSED_CACHE[cache_key] = copy.deepcopy(processed)
+                await asyncio.to_thread(_RESPONSE_CACHE.set, semantic_namespace, query,
+                                        copy.deepcopy(processed), True)
+            else:
                 processed = {
                     "key_themes": ["Data processing", "Market analysis"],
                     "market_signals": ["Emerging trends identified"],
@@ -228,7 +515,7 @@ class ReaderAgent(BaseAgent):
             return processed
             
         except Exception as e:
-            logger.error(f"Failed to process collected data: {str(e)}")
+            logger.error(f"Failed to process collected data: {str(e)}", exc_info=True)
             return {
                 "key_themes": [],
                 "market_signals": [],
@@ -1,13 +1,261 @@
 import asyncio
+import contextlib
+import copy
 import logging
-from typing import Dict, List, Any
+import orjson
+import re
+from collections import Counter
+from typing import Dict, List, Any, Optional
 from core.agents.base_agent import BaseAgent
-from langchain.chat_models import init_chat_model
-from langchain_core.output_parsers import JsonOutputParser
+from core.llm import get_json_chain
+from core.llm_cache import SemanticResponseCache
 from config.settings import Settings
 
 logger = logging.getLogger(__name__)
 
+# Shared across agent instances so repeated or near-duplicate strategy prompts skip the LLM
+_RESPONSE_CACHE = SemanticResponseCache()
+
+# Integers within budget and team size estimates, e.g. "$100K - $500K" or "5-10 people"
+_DIGITS = re.compile(r'\d+')
+
+# Word tokens with punctuation stripped, so "AI-driven" and "markets," match "ai" and "markets"
+_WORDS = re.compile(r'\w+')
+
+# Fields stamped on analysis items at run time; they are left out of prompts so re-runs hit the cache
+_VOLATILE_FIELDS = frozenset({"analysis_timestamp", "generated_timestamp"})
+
+# Returned when a stage has no analysis to work from or fails; callers get deep copies since results are annotated downstream
+_DEFAULT_RECOMMENDATIONS = [{
+    "strategy_title": "Market Entry Strategy",
+    "description": "Develop a comprehensive market entry approach",
+    "strategic_objective": "Establish market presence and capture market share",
+    "priority_level": "High",
+    "implementation_timeline": "Medium-term",
+    "resource_requirements": {
+        "budget_estimate": "$100K - $500K",
+        "team_size": "5-10 people",
+        "key_skills": ["Market research", "Product development"],
+        "technology_stack": ["Analytics platform", "CRM system"]
+    },
+    "expected_outcomes": {
+        "revenue_impact": "Positive revenue growth",
+        "market_share_impact": "5-10% market share",
+        "competitive_advantage": "First-mover advantage"
+    },
+    "success_indicators": ["Revenue targets", "Customer acquisition"],
+    "implementation_steps": [
+        {
+            "step": "Market research and validation",
+            "timeline": "1-2 months",
+            "dependencies": ["Budget approval", "Team assembly"]
+        }
+    ]
+}]
+
+_DEFAULT_RISK_ASSESSMENT = {
+    "market_risks": [],
+    "competitive_risks": [],
+    "operational_risks": [],
+    "overall_risk_level": "Medium",
+    "risk_management_framework": "Standard risk management practices recommended"
+}
+
+_DEFAULT_SUCCESS_METRICS = {
+    "financial_metrics": [],
+    "market_metrics": [],
+    "operational_metrics": [],
+    "leading_indicators": [],
+    "lagging_indicators": [],
+    "dashboard_recommendations": "Standard business metrics dashboard recommended"
+}
+
+_EMPTY_RECOMMENDATION_VIEWS = {
+    "strategic_priorities": {"high_priority": [], "medium_priority": [], "low_priority": []},
+    "timeline_view": {"short_term": [], "medium_term": [], "long_term": []},
+    "implementation_sequence": [],
+    "resource_allocation": {}
+}
+
+# Task instructions for each stage, filled with str.format; the recommendation, risk and metrics prompts
+# follow the shared market context block
+_RECOMMENDATIONS_PROMPT = """Based on the market analysis above for {query} in the {market_domain} sector, generate strategic recommendations.
+
+Competitive Landscape: {competitive_landscape}
+
+Return a JSON array of strategic recommendations:
+[
+    {{
+        "strategy_title": "Clear, actionable strategy title",
+        "description": "Detailed description of the strategy",
+        "strategic_objective": "Primary objective this strategy achieves",
+        "priority_level": "High/Medium/Low",
+        "implementation_timeline": "Short-term/Medium-term/Long-term",
+        "resource_requirements": {{
+            "budget_estimate": "Budget range or estimate",
+            "team_size": "Estimated team size needed",
+            "key_skills": ["skill1", "skill2"],
+            "technology_stack": ["tech1", "tech2"]
+        }},
+        "expected_outcomes": {{
+            "revenue_impact": "Expected revenue impact",
+            "market_share_impact": "Expected market share impact",
+            "competitive_advantage": "Competitive advantage gained"
+        }},
+        "success_indicators": ["indicator1", "indicator2"],
+        "implementation_steps": [
+            {{
+                "step": "Step description",
+                "timeline": "Timeline for this step",
+                "dependencies": ["dependency1", "dependency2"]
+            }}
+        ]
+    }}
+]
+"""
+
+_ACTION_PLAN_PROMPT = """Create a detailed action plan for the following opportunity in the {market_domain} sector:
+
+Opportunity: {opportunity}
+Market Context: {query}
+Relevant Trends: {relevant_trends}
+
+Return a JSON object with:
+{{
+    "opportunity_name": "Name of the opportunity",
+    "action_plan": {{
+        "phase_1": {{
+            "title": "Phase 1 title",
+            "duration": "Duration estimate",
+            "objectives": ["objective1", "objective2"],
+            "key_activities": ["activity1", "activity2"],
+            "deliverables": ["deliverable1", "deliverable2"],
+            "resources_needed": ["resource1", "resource2"],
+            "success_criteria": ["criteria1", "criteria2"]
+        }},
+        "phase_2": {{
+            "title": "Phase 2 title",
+            "duration": "Duration estimate",
+            "objectives": ["objective1", "objective2"],
+            "key_activities": ["activity1", "activity2"],
+            "deliverables": ["deliverable1", "deliverable2"],
+            "resources_needed": ["resource1", "resource2"],
+            "success_criteria": ["criteria1", "criteria2"]
+        }},
+        "phase_3": {{
+            "title": "Phase 3 title",
+            "duration": "Duration estimate",
+            "objectives": ["objective1", "objective2"],
+            "key_activities": ["activity1", "activity2"],
+            "deliverables": ["deliverable1", "deliverable2"],
+            "resources_needed": ["resource1", "resource2"],
+            "success_criteria": ["criteria1", "criteria2"]
+        }}
+    }},
+    "total_timeline": "Overall timeline estimate",
+    "budget_estimate": "Total budget estimate",
+    "risk_factors": ["risk1", "risk2"],
+    "contingency_plans": ["plan1", "plan2"]
+}}
+"""
+
+_RISK_PROMPT = """Assess risks and develop mitigation strategies based on the market analysis above and:
+
+Competitive Landscape: {competitive_landscape}
+
+Return a JSON object with:
+{{
+    "market_risks": [
+        {{
+            "risk_name": "Risk name",
+            "description": "Risk description",
+            "probability": "High/Medium/Low",
+            "impact": "High/Medium/Low",
+            "risk_score": 1-10,
+            "mitigation_strategies": ["strategy1", "strategy2"],
+            "monitoring_indicators": ["indicator1", "indicator2"]
+        }}
+    ],
+    "competitive_risks": [
+        {{
+            "risk_name": "Risk name",
+            "description": "Risk description",
+            "probability": "High/Medium/Low",
+            "impact": "High/Medium/Low",
+            "risk_score": 1-10,
+            "mitigation_strategies": ["strategy1", "strategy2"],
+            "monitoring_indicators": ["indicator1", "indicator2"]
+        }}
+    ],
+    "operational_risks": [
+        {{
+            "risk_name": "Risk name",
+            "description": "Risk description",
+            "probability": "High/Medium/Low",
+            "impact": "High/Medium/Low",
+            "risk_score": 1-10,
+            "mitigation_strategies": ["strategy1", "strategy2"],
+            "monitoring_indicators": ["indicator1", "indicator2"]
+        }}
+    ],
+    "overall_risk_level": "High/Medium/Low",
+    "risk_management_framework": "Description of risk management approach"
+}}
+"""
+
+_METRICS_PROMPT = """Develop success metrics and KPIs for the {market_domain} market based on the market analysis above.
+
+Return a JSON object with:
+{{
+    "financial_metrics": [
+        {{
+            "metric_name": "Metric name",
+            "description": "What this metric measures",
+            "target_value": "Target value or range",
+            "measurement_frequency": "How often to measure",
+            "data_source": "Where to get the data"
+        }}
+    ],
+    "market_metrics": [
+        {{
+            "metric_name": "Metric name",
+            "description": "What this metric measures",
+            "target_value": "Target value or range",
+            "measurement_frequency": "How often to measure",
+            "data_source": "Where to get the data"
+        }}
+    ],
+    "operational_metrics": [
+        {{
+            "metric_name": "Metric name",
+            "description": "What this metric measures",
+            "target_value": "Target value or range",
+            "measurement_frequency": "How often to measure",
+            "data_source": "Where to get the data"
+        }}
+    ],
+    "leading_indicators": ["indicator1", "indicator2"],
+    "lagging_indicators": ["indicator1", "indicator2"],
+    "dashboard_recommendations": "Recommendations for metric dashboards"
+}}
+"""
+
+def _stable(items: List[Dict]) -> List[Dict]:
+    """Drop per-run fields so identical analyses serialize to identical prompts and cache keys"""
+    return [{key: value for key, value in item.items() if key not in _VOLATILE_FIELDS}
+            if isinstance(item, dict) else item for item in items]
+
+def _market_context(trends: List[Dict], opportunities: List[Dict]) -> str:
+    """Serialize the top trends and opportunities into the block that opens the strategist prompts"""
+    if not trends and not opportunities:
+        return ""
+    return (f"Market Trends: {orjson.dumps(_stable(trends[:5]), default=str).decode()}\n"
+            f"Opportunities: {orjson.dumps(_stable(opportunities[:5]), default=str).decode()}\n\n")
+
+def _leading_keywords(description: str) -> frozenset:
+    """Word tokens of a description's first five words"""
+    return frozenset(_WORDS.findall(" ".join(description.lower().split()[:5])))
+
 class StrategistAgent(BaseAgent):
     """Agent responsible for generating strategic recommendations and action plans"""
     
@@ -16,11 +264,29 @@ class StrategistAgent(BaseAgent):
             name="Strategist Agent",
             description="Generates strategic recommendations and actionable insights"
         )
+        self._llm_limit: Optional[asyncio.Semaphore] = None
+    
+    async def _cached_llm_json(self, prompt_key: str, prompt: str) -> Any:
+        """Invoke the strategist chain through the shared response cache"""
+        # Exact-tier only: every prompt carries its variable inputs (context, landscape, opportunity), so
+        # hashing the full prompt keys on them, whereas an embedding would only see the shared template
+        cached = await asyncio.to_thread(_RESPONSE_CACHE.get, prompt_key, prompt)
+        if cached is not None:
+            return copy.deepcopy(cached)
+        
+        # The limit is held only while a request is in flight, so cache hits never queue behind it
+        async with self._llm_limit or contextlib.nullcontext():
+            result = await get_json_chain().ainvoke(prompt)
+        await asyncio.to_thread(_RESPONSE_CACHE.set, prompt_key, prompt, copy.deepcopy(result))
+        return result
     
     async def execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Execute strategic analysis and recommendation generation"""
         self.update_progress(10, "Initializing strategic analysis")
         
+        # Created per run so it binds to the running loop; bounds this agent's concurrent LLM requests
+        self._llm_limit = asyncio.Semaphore(Settings.LLM_BATCH_CONCURRENCY)
+        
         # Get analysis results from Analyst Agent
         trends = input_data.get("market_trends", [])
         opportunities = input_data.get("opportunities", [])
@@ -30,23 +296,37 @@ class StrategistAgent(BaseAgent):
         query = input_data.get("query", "")
         market_domain = input_data.get("market_domain", "")
         
-        # Generate strategic recommendations concurrently
-        tasks = [
-            self._generate_strategic_recommendations(trends, opportunities, competitive_landscape, query, market_domain),
-            self._create_action_plans(opportunities, trends, query, market_domain),
-            self._assess_risks_and_mitigation(trends, opportunities, competitive_landscape),
-            self._develop_success_metrics(opportunities, trends, market_domain)
-        ]
+        # Serialized once; the recommendation, risk and metrics prompts all open with this identical
+        # block, so providers with prefix caching can reuse it across the concurrent calls
+        # Empty when the analyst found nothing, in which case stages answer with their defaults
+        market_context = _market_context(trends, opportunities)
         
         self.update_progress(40, "Generating strategic recommendations")
         
-        recommendations, action_plans, risk_assessment, success_metrics = await asyncio.gather(*tasks)
+        # Generate strategic recommendations concurrently
+        async with asyncio.TaskGroup() as tg:
+            recommendations_task = tg.create_task(self._generate_strategic_recommendations(
+                market_context, trends, opportunities, competitive_landscape, query, market_domain
+            ))
+            action_plans_task = tg.create_task(self._create_action_plans(opportunities, trends, query, market_domain))
+            risk_task = tg.create_task(self._assess_risks_and_mitigation(
+                market_context, competitive_landscape, market_domain
+            ))
+            metrics_task = tg.create_task(self._develop_success_metrics(market_context, market_domain))
+            
+            # Roadmap views that need only the recommendations are built while the other stages are still in flight
+            recommendations = await recommendations_task
+            recommendation_views = self._build_recommendation_views(recommendations)
+        
+        action_plans = action_plans_task.result()
+        risk_assessment = risk_task.result()
+        success_metrics = metrics_task.result()
         
         self.update_progress(80, "Creating strategic roadmap")
         
-        # Create comprehensive strategic roadmap
-        roadmap = await self._create_strategic_roadmap(
-            recommendations, action_plans, risk_assessment, success_metrics, query, market_domain
+        # Create comprehensive strategic roadmap; only dict assembly remains, so it runs inline
+        roadmap = self._create_strategic_roadmap(
+            recommendations, recommendation_views, action_plans, risk_assessment, success_metrics, query, market_domain
         )
         
         self.update_progress(100, "Strategic analysis completed")
@@ -60,156 +340,64 @@ class StrategistAgent(BaseAgent):
             "strategic_roadmap": roadmap
         }
     
-    async def _generate_strategic_recommendations(self, trends: List[Dict], opportunities: List[Dict], 
+    async def _generate_strategic_recommendations(self, market_context: str, trends: List[Dict], opportunities: List[Dict], 
                                                 competitive_landscape: Dict, query: str, market_domain: str) -> List[Dict[str, Any]]:
         """Generate strategic recommendations based on analysis"""
+        if not market_context and not competitive_landscape:
+            logger.info("No analysis to base recommendations on, using default recommendations")
+            return copy.deepcopy(_DEFAULT_RECOMMENDATIONS)
+        
         try:
-            llm = init_chat_model(Settings.LLM_MODEL, model_provider="google_genai")
-            parser = JsonOutputParser()
-            
-            prompt = f"""
-            Based on the market analysis for {query} in the {market_domain} sector, generate strategic recommendations.
-            
-            Market Trends: {trends[:5]}
-            Opportunities: {opportunities[:5]}
-            Competitive Landscape: {competitive_landscape}
+            prompt = market_context + _RECOMMENDATIONS_PROMPT.format(
+                query=query, market_domain=market_domain, competitive_landscape=competitive_landscape
+            )
             
-            Return a JSON array of strategic recommendations:
-            [
-                {{
-                    "strategy_title": "Clear, actionable strategy title",
-                    "description": "Detailed description of the strategy",
-                    "strategic_objective": "Primary objective this strategy achieves",
-                    "priority_level": "High/Medium/Low",
-                    "implementation_timeline": "Short-term/Medium-term/Long-term",
-                    "resource_requirements": {{
-                        "budget_estimate": "Budget range or estimate",
-                        "team_size": "Estimated team size needed",
-                        "key_skills": ["skill1", "skill2"],
-                        "technology_stack": ["tech1", "tech2"]
-                    }},
-                    "expected_outcomes": {{
-                        "revenue_impact": "Expected revenue impact",
-                        "market_share_impact": "Expected market share impact",
-                        "competitive_advantage": "Competitive advantage gained"
-                    }},
-                    "success_indicators": ["indicator1", "indicator2"],
-                    "implementation_steps": [
-                        {{
-                            "step": "Step description",
-                            "timeline": "Timeline for this step",
-                            "dependencies": ["dependency1", "dependency2"]
-                        }}
-                    ]
-                }}
-            ]
-            """
-            
-            chain = llm | parser
-            recommendations = chain.invoke(prompt)
+            recommendations = await self._cached_llm_json(f"strategy:{market_domain}", prompt)
             
             if not isinstance(recommendations, list):
                 recommendations = []
             
-            # Enhance recommendations with additional metadata
+            # Leading description words of each trend and high-revenue opportunity, matched against every recommendation
+            trend_keywords = [_leading_keywords(trend.get("description", "")) for trend in trends]
+            opportunity_keywords = [_leading_keywords(opp.get("description", ""))
+                                    for opp in opportunities if opp.get("revenue_potential") == "High"]
+            
+            # Enhance recommendations with additional metadata; the whole batch shares one timestamp
+            generated_timestamp = asyncio.get_running_loop().time()
             for rec in recommendations:
-                rec["generated_timestamp"] = asyncio.get_event_loop().time()
-                rec["confidence_score"] = self._calculate_recommendation_confidence(rec, trends, opportunities)
+                rec["generated_timestamp"] = generated_timestamp
+                rec["confidence_score"] = self._calculate_recommendation_confidence(
+                    rec, trend_keywords, opportunity_keywords
+                )
             
             logger.info(f"Generated {len(recommendations)} strategic recommendations")
             return recommendations
             
         except Exception as e:
             logger.error(f"Failed to generate strategic recommendations: {str(e)}")
-            return [{
-                "strategy_title": "Market Entry Strategy",
-                "description": "Develop a comprehensive market entry approach",
-                "strategic_objective": "Establish market presence and capture market share",
-                "priority_level": "High",
-                "implementation_timeline": "Medium-term",
-                "resource_requirements": {
-                    "budget_estimate": "$100K - $500K",
-                    "team_size": "5-10 people",
-                    "key_skills": ["Market research", "Product development"],
-                    "technology_stack": ["Analytics platform", "CRM system"]
-                },
-                "expected_outcomes": {
-                    "revenue_impact": "Positive revenue growth",
-                    "market_share_impact": "5-10% market share",
-                    "competitive_advantage": "First-mover advantage"
-                },
-                "success_indicators": ["Revenue targets", "Customer acquisition"],
-                "implementation_steps": [
-                    {
-                        "step": "Market research and validation",
-                        "timeline": "1-2 months",
-                        "dependencies": ["Budget approval", "Team assembly"]
-                    }
-                ]
-            }]
+            return copy.deepcopy(_DEFAULT_RECOMMENDATIONS)
     
     async def _create_action_plans(self, opportunities: List[Dict], trends: List[Dict], 
                                  query: str, market_domain: str) -> List[Dict[str, Any]]:
         """Create detailed action plans for top opportunities"""
+        if not opportunities:
+            return []
+        
         try:
-            # Focus on top 3 opportunities
-            top_opportunities = opportunities[:3]
-            action_plans = []
+            # Focus on top 3 opportunities, planned concurrently
+            relevant_trends = orjson.dumps(_stable(trends[:3]), default=str).decode()
+            prompts = [_ACTION_PLAN_PROMPT.format(opportunity=opportunity, query=query, market_domain=market_domain,
+                                                  relevant_trends=relevant_trends)
+                       for opportunity in _stable(opportunities[:3])]
+            results = await asyncio.gather(*(
+                self._cached_llm_json(f"action_plan:{market_domain}", prompt) for prompt in prompts
+            ), return_exceptions=True)
             
-            for opportunity in top_opportunities:
-                llm = init_chat_model(Settings.LLM_MODEL, model_provider="google_genai")
-                parser = JsonOutputParser()
-                
-                prompt = f"""
-                Create a detailed action plan for the following opportunity in the {market_domain} sector:
-                
-                Opportunity: {opportunity}
-                Market Context: {query}
-                Relevant Trends: {trends[:3]}
-                
-                Return a JSON object with:
-                {{
-                    "opportunity_name": "Name of the opportunity",
-                    "action_plan": {{
-                        "phase_1": {{
-                            "title": "Phase 1 title",
-                            "duration": "Duration estimate",
-                            "objectives": ["objective1", "objective2"],
-                            "key_activities": ["activity1", "activity2"],
-                            "deliverables": ["deliverable1", "deliverable2"],
-                            "resources_needed": ["resource1", "resource2"],
-                            "success_criteria": ["criteria1", "criteria2"]
-                        }},
-                        "phase_2": {{
-                            "title": "Phase 2 title",
-                            "duration": "Duration estimate",
-                            "objectives": ["objective1", "objective2"],
-                            "key_activities": ["activity1", "activity2"],
-                            "deliverables": ["deliverable1", "deliverable2"],
-                            "resources_needed": ["resource1", "resource2"],
-                            "success_criteria": ["criteria1", "criteria2"]
-                        }},
-                        "phase_3": {{
-                            "title": "Phase 3 title",
-                            "duration": "Duration estimate",
-                            "objectives": ["objective1", "objective2"],
-                            "key_activities": ["activity1", "activity2"],
-                            "deliverables": ["deliverable1", "deliverable2"],
-                            "resources_needed": ["resource1", "resource2"],
-                            "success_criteria": ["criteria1", "criteria2"]
-                        }}
-                    }},
-                    "total_timeline": "Overall timeline estimate",
-                    "budget_estimate": "Total budget estimate",
-                    "risk_factors": ["risk1", "risk2"],
-                    "contingency_plans": ["plan1", "plan2"]
-                }}
-                """
-                
-                chain = llm | parser
-                action_plan = chain.invoke(prompt)
-                
-                if isinstance(action_plan, dict):
+            action_plans = []
+            for action_plan in results:
+                if isinstance(action_plan, Exception):
+                    logger.warning(f"Failed to create an action plan: {str(action_plan)}")
+                elif isinstance(action_plan, dict):
                     action_plans.append(action_plan)
             
             logger.info(f"Created {len(action_plans)} detailed action plans")
@@ -219,62 +407,17 @@ class StrategistAgent(BaseAgent):
             logger.error(f"Failed to create action plans: {str(e)}")
             return []
     
-    async def _assess_risks_and_mitigation(self, trends: List[Dict], opportunities: List[Dict], 
-                                         competitive_landscape: Dict) -> Dict[str, Any]:
+    async def _assess_risks_and_mitigation(self, market_context: str, competitive_landscape: Dict,
+                                           market_domain: str) -> Dict[str, Any]:
         """Assess risks and develop mitigation strategies"""
+        if not market_context and not competitive_landscape:
+            logger.info("No analysis to assess risks from, using default risk assessment")
+            return copy.deepcopy(_DEFAULT_RISK_ASSESSMENT)
+        
         try:
-            llm = init_chat_model(Settings.LLM_MODEL, model_provider="google_genai")
-            parser = JsonOutputParser()
-            
-            prompt = f"""
-            Assess risks and develop mitigation strategies based on:
-            
-            Market Trends: {trends[:5]}
-            Opportunities: {opportunities[:5]}
-            Competitive Landscape: {competitive_landscape}
-            
-            Return a JSON object with:
-            {{
-                "market_risks": [
-                    {{
-                        "risk_name": "Risk name",
-                        "description": "Risk description",
-                        "probability": "High/Medium/Low",
-                        "impact": "High/Medium/Low",
-                        "risk_score": 1-10,
-                        "mitigation_strategies": ["strategy1", "strategy2"],
-                        "monitoring_indicators": ["indicator1", "indicator2"]
-                    }}
-                ],
-                "competitive_risks": [
-                    {{
-                        "risk_name": "Risk name",
-                        "description": "Risk description",
-                        "probability": "High/Medium/Low",
-                        "impact": "High/Medium/Low",
-                        "risk_score": 1-10,
-                        "mitigation_strategies": ["strategy1", "strategy2"],
-                        "monitoring_indicators": ["indicator1", "indicator2"]
-                    }}
-                ],
-                "operational_risks": [
-                    {{
-                        "risk_name": "Risk name",
-                        "description": "Risk description",
-                        "probability": "High/Medium/Low",
-                        "impact": "High/Medium/Low",
-                        "risk_score": 1-10,
-                        "mitigation_strategies": ["strategy1", "strategy2"],
-                        "monitoring_indicators": ["indicator1", "indicator2"]
-                    }}
-                ],
-                "overall_risk_level": "High/Medium/Low",
-                "risk_management_framework": "Description of risk management approach"
-            }}
-            """
+            prompt = market_context + _RISK_PROMPT.format(competitive_landscape=competitive_landscape)
             
-            chain = llm | parser
-            risk_assessment = chain.invoke(prompt)
+            risk_assessment = await self._cached_llm_json(f"risks:{market_domain}", prompt)
             
             if not isinstance(risk_assessment, dict):
                 risk_assessment = {}
@@ -284,64 +427,18 @@ class StrategistAgent(BaseAgent):
             
         except Exception as e:
             logger.error(f"Failed to assess risks: {str(e)}")
-            return {
-                "market_risks": [],
-                "competitive_risks": [],
-                "operational_risks": [],
-                "overall_risk_level": "Medium",
-                "risk_management_framework": "Standard risk management practices recommended"
-            }
+            return copy.deepcopy(_DEFAULT_RISK_ASSESSMENT)
     
-    async def _develop_success_metrics(self, opportunities: List[Dict], trends: List[Dict], 
-                                     market_domain: str) -> Dict[str, Any]:
+    async def _develop_success_metrics(self, market_context: str, market_domain: str) -> Dict[str, Any]:
         """Develop success metrics and KPIs"""
+        if not market_context:
+            logger.info("No analysis to derive metrics from, using default success metrics")
+            return copy.deepcopy(_DEFAULT_SUCCESS_METRICS)
+        
         try:
-            llm = init_chat_model(Settings.LLM_MODEL, model_provider="google_genai")
-            parser = JsonOutputParser()
-            
-            prompt = f"""
-            Develop success metrics and KPIs for the {market_domain} market based on:
+            prompt = market_context + _METRICS_PROMPT.format(market_domain=market_domain)
             
-            Opportunities: {opportunities[:5]}
-            Market Trends: {trends[:5]}
-            
-            Return a JSON object with:
-            {{
-                "financial_metrics": [
-                    {{
-                        "metric_name": "Metric name",
-                        "description": "What this metric measures",
-                        "target_value": "Target value or range",
-                        "measurement_frequency": "How often to measure",
-                        "data_source": "Where to get the data"
-                    }}
-                ],
-                "market_metrics": [
-                    {{
-                        "metric_name": "Metric name",
-                        "description": "What this metric measures",
-                        "target_value": "Target value or range",
-                        "measurement_frequency": "How often to measure",
-                        "data_source": "Where to get the data"
-                    }}
-                ],
-                "operational_metrics": [
-                    {{
-                        "metric_name": "Metric name",
-                        "description": "What this metric measures",
-                        "target_value": "Target value or range",
-                        "measurement_frequency": "How often to measure",
-                        "data_source": "Where to get the data"
-                    }}
-                ],
-                "leading_indicators": ["indicator1", "indicator2"],
-                "lagging_indicators": ["indicator1", "indicator2"],
-                "dashboard_recommendations": "Recommendations for metric dashboards"
-            }}
-            """
-            
-            chain = llm | parser
-            success_metrics = chain.invoke(prompt)
+            success_metrics = await self._cached_llm_json(f"metrics:{market_domain}", prompt)
             
             if not isinstance(success_metrics, dict):
                 success_metrics = {}
@@ -351,43 +448,49 @@ class StrategistAgent(BaseAgent):
             
         except Exception as e:
             logger.error(f"Failed to develop success metrics: {str(e)}")
-            return {
-                "financial_metrics": [],
-                "market_metrics": [],
-                "operational_metrics": [],
-                "leading_indicators": [],
-                "lagging_indicators": [],
-                "dashboard_recommendations": "Standard business metrics dashboard recommended"
-            }
+            return copy.deepcopy(_DEFAULT_SUCCESS_METRICS)
     
-    async def _create_strategic_roadmap(self, recommendations: List[Dict], action_plans: List[Dict], 
-                                      risk_assessment: Dict, success_metrics: Dict, 
-                                      query: str, market_domain: str) -> Dict[str, Any]:
-        """Create comprehensive strategic roadmap"""
+    def _build_recommendation_views(self, recommendations: List[Dict]) -> Dict[str, Any]:
+        """Build the roadmap views that depend only on the recommendations"""
         try:
-            # Organize recommendations by priority and timeline
-            high_priority = [r for r in recommendations if r.get("priority_level") == "High"]
-            medium_priority = [r for r in recommendations if r.get("priority_level") == "Medium"]
-            low_priority = [r for r in recommendations if r.get("priority_level") == "Low"]
-            
-            short_term = [r for r in recommendations if r.get("implementation_timeline") == "Short-term"]
-            medium_term = [r for r in recommendations if r.get("implementation_timeline") == "Medium-term"]
-            long_term = [r for r in recommendations if r.get("implementation_timeline") == "Long-term"]
+            # Organize recommendations by priority and timeline in one pass; unrecognised values are left out
+            by_priority = {"High": [], "Medium": [], "Low": []}
+            by_timeline = {"Short-term": [], "Medium-term": [], "Long-term": []}
+            for r in recommendations:
+                priority = by_priority.get(r.get("priority_level"))
+                if priority is not None:
+                    priority.append(r)
+                timeline = by_timeline.get(r.get("implementation_timeline"))
+                if timeline is not None:
+                    timeline.append(r)
             
-            roadmap = {
-                "executive_summary": f"Strategic roadmap for {query} in the {market_domain} market with {len(recommendations)} key recommendations",
+            return {
                 "strategic_priorities": {
-                    "high_priority": high_priority,
-                    "medium_priority": medium_priority,
-                    "low_priority": low_priority
+                    "high_priority": by_priority["High"],
+                    "medium_priority": by_priority["Medium"],
+                    "low_priority": by_priority["Low"]
                 },
                 "timeline_view": {
-                    "short_term": short_term,
-                    "medium_term": medium_term,
-                    "long_term": long_term
+                    "short_term": by_timeline["Short-term"],
+                    "medium_term": by_timeline["Medium-term"],
+                    "long_term": by_timeline["Long-term"]
                 },
                 "implementation_sequence": self._create_implementation_sequence(recommendations),
-                "resource_allocation": self._calculate_resource_allocation(recommendations),
+                "resource_allocation": self._calculate_resource_allocation(recommendations)
+            }
+            
+        except Exception as e:
+            logger.error(f"Failed to organize recommendations: {str(e)}")
+            return copy.deepcopy(_EMPTY_RECOMMENDATION_VIEWS)
+    
+    def _create_strategic_roadmap(self, recommendations: List[Dict], recommendation_views: Dict[str, Any],
+                                  action_plans: List[Dict], risk_assessment: Dict, success_metrics: Dict, 
+                                  query: str, market_domain: str) -> Dict[str, Any]:
+        """Create comprehensive strategic roadmap"""
+        try:
+            roadmap = {
+                "executive_summary": f"Strategic roadmap for {query} in the {market_domain} market with {len(recommendations)} key recommendations",
+                **recommendation_views,
                 "milestone_schedule": self._create_milestone_schedule(recommendations, action_plans),
                 "success_tracking": success_metrics,
                 "risk_monitoring": risk_assessment,
@@ -405,38 +508,31 @@ class StrategistAgent(BaseAgent):
             logger.error(f"Failed to create strategic roadmap: {str(e)}")
             return {
                 "executive_summary": f"Strategic roadmap for {market_domain} market analysis",
-                "strategic_priorities": {"high_priority": [], "medium_priority": [], "low_priority": []},
-                "timeline_view": {"short_term": [], "medium_term": [], "long_term": []},
-                "implementation_sequence": [],
-                "resource_allocation": {},
+                **copy.deepcopy(_EMPTY_RECOMMENDATION_VIEWS),
                 "milestone_schedule": [],
                 "success_tracking": {},
                 "risk_monitoring": {},
                 "review_schedule": {}
             }
     
-    def _calculate_recommendation_confidence(self, recommendation: Dict, trends: List[Dict], opportunities: List[Dict]) -> float:
+    def _calculate_recommendation_confidence(self, recommendation: Dict, trend_keywords: List[frozenset],
+                                             opportunity_keywords: List[frozenset]) -> float:
         """Calculate confidence score for a recommendation"""
         try:
             # Simple confidence calculation based on data availability and alignment
             base_confidence = 0.7
+            rec_words = set(_WORDS.findall(recommendation.get("description", "").lower()))
             
             # Boost confidence if recommendation aligns with multiple trends
-            trend_alignment = sum(1 for trend in trends if any(
-                keyword in recommendation.get("description", "").lower() 
-                for keyword in trend.get("description", "").lower().split()[:5]
-            ))
+            trend_alignment = sum(1 for keywords in trend_keywords if keywords & rec_words)
             
             # Boost confidence if recommendation addresses high-impact opportunities
-            opportunity_alignment = sum(1 for opp in opportunities if 
-                                      opp.get("revenue_potential") == "High" and
-                                      any(keyword in recommendation.get("description", "").lower() 
-                                          for keyword in opp.get("description", "").lower().split()[:5]))
+            opportunity_alignment = sum(1 for keywords in opportunity_keywords if keywords & rec_words)
             
             confidence_boost = min(0.3, (trend_alignment + opportunity_alignment) * 0.05)
             return min(1.0, base_confidence + confidence_boost)
             
-        except:
+        except (AttributeError, TypeError):  # Non-string description
             return 0.7
     
     def _create_implementation_sequence(self, recommendations: List[Dict]) -> List[Dict]:
@@ -454,7 +550,7 @@ class StrategistAgent(BaseAgent):
                 })
             
             return sequence
-        except:
+        except (AttributeError, IndexError, TypeError):  # Malformed or empty implementation steps
             return []
     
     def _calculate_resource_allocation(self, recommendations: List[Dict]) -> Dict[str, Any]:
@@ -462,7 +558,7 @@ class StrategistAgent(BaseAgent):
         try:
             total_budget = 0
             total_team_size = 0
-            skill_requirements = {}
+            skill_requirements = Counter()
             
             for rec in recommendations:
                 resources = rec.get("resource_requirements", {})
@@ -470,34 +566,31 @@ class StrategistAgent(BaseAgent):
                 # Extract budget (simple parsing)
                 budget_str = resources.get("budget_estimate", "0")
                 try:
-                    import re
-                    budget_numbers = re.findall(r'\d+', budget_str.replace(',', ''))
+                    budget_numbers = _DIGITS.findall(budget_str.replace(',', ''))
                     if budget_numbers:
                         total_budget += int(budget_numbers[-1]) * 1000  # Assume thousands
-                except:
+                except (AttributeError, TypeError):  # Non-string estimate
                     pass
                 
                 # Extract team size
                 team_str = resources.get("team_size", "0")
                 try:
-                    team_numbers = re.findall(r'\d+', team_str)
+                    team_numbers = _DIGITS.findall(team_str)
                     if team_numbers:
                         total_team_size += int(team_numbers[-1])
-                except:
+                except (AttributeError, TypeError):
                     pass
                 
                 # Collect skills
-                skills = resources.get("key_skills", [])
-                for skill in skills:
-                    skill_requirements[skill] = skill_requirements.get(skill, 0) + 1
+                skill_requirements.update(resources.get("key_skills", []))
             
             return {
                 "total_budget_estimate": f"${total_budget:,}",
                 "total_team_size": total_team_size,
-                "top_skills_needed": sorted(skill_requirements.items(), key=lambda x: x[1], reverse=True)[:5],
+                "top_skills_needed": skill_requirements.most_common(5),
                 "resource_distribution": "Balanced across strategic priorities"
             }
-        except:
+        except (AttributeError, TypeError):  # Malformed resource requirements or unhashable skills
             return {
                 "total_budget_estimate": "To be determined",
                 "total_team_size": "To be determined",
@@ -520,5 +613,5 @@ class StrategistAgent(BaseAgent):
                 })
             
             return milestones
-        except:
+        except (AttributeError, TypeError):
             return []
@@ -1,21 +1,110 @@
+import copy
+import functools
+import hashlib
+import io
+import orjson
 import os
 import logging
-from typing import Dict, Any, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import seaborn as sns
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
+import plotly.io as pio
 from plotly.subplots import make_subplots
 import numpy as np
 from datetime import datetime
-from langchain.chat_models import init_chat_model
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
 from config.settings import Settings
+from core.io.file_writer import write_files
+from core.llm import get_json_chain
+from core.llm_cache import SemanticResponseCache
 
 logger = logging.getLogger(__name__)
 
+# Serialize figure data with orjson (a pinned dependency) when writing Plotly HTML
+pio.json.config.default_engine = "orjson"
+
+# Static instructions lead every suggestion prompt; only the human data summary varies
+_SUGGESTION_SYSTEM_PROMPT = """You are an expert data visualization analyst. Analyze the provided market intelligence data and suggest the most effective charts to visualize the insights.
+
+Consider:
+- Data types and structures available
+- Key insights that need highlighting
+- Audience needs (business executives)
+- Visual impact and clarity
+
+Return a JSON array of chart suggestions with:
+- chart_type: 'bar', 'pie', 'line', 'scatter', 'heatmap', 'radar', 'treemap', 'funnel'
+- title: descriptive title
+- filename: snake_case filename without extension
+- data_source: which data to use
+- visualization_goal: what insight this chart reveals
+- priority: 'high', 'medium', 'low'
+- interactive: true/false (whether to make it interactive)
+
+Maximum 5 suggestions, prioritize high-impact visualizations."""
+_SUGGESTION_HUMAN_TEMPLATE = "Query: {query}\nMarket Domain: {market_domain}\n\nData Summary:\n- Trends: {trend_count}\n- Opportunities: {opp_count}\n- Recommendations: {rec_count}\n\nSample Data: {sample_data}"
+
+# Fewer trends, opportunities and recommendations than this get the default charts without an LLM call
+_MIN_ITEMS_FOR_AI_SUGGESTIONS = 4
+
+# Upper bound on charts rendered at once
+_MAX_CHART_WORKERS = 8
+
+# Chart suggestions by market and data shape, so repeated analyses skip the LLM
+_SUGGESTION_CACHE = SemanticResponseCache()
+
+# Sample fields that identify the data in the cache key; per-run timestamps are left out
+_SAMPLE_KEY_FIELDS = ("trend_name", "opportunity_name", "strategy_title",
+                      "impact_level", "revenue_potential", "priority_level")
+
+@functools.lru_cache(maxsize=1)
+def _get_suggestion_chain():
+    """Build the chart suggestion chain once on the shared chat model"""
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", _SUGGESTION_SYSTEM_PROMPT),
+        ("human", _SUGGESTION_HUMAN_TEMPLATE)
+    ])
+    return prompt | get_json_chain()
+
+@functools.lru_cache(maxsize=1)
+def _init_styles():
+    """Apply the matplotlib and seaborn styling once per process"""
+    plt.style.use('seaborn-v0_8')
+    sns.set_palette("husl")
+
+# High/Medium/Low levels as 3/2/1 scores, and the colour for each score (index = score - 1)
+_LEVEL_SCORES = {'high': 3, 'medium': 2, 'low': 1}
+_LEVEL_COLORS = np.array(['#98D8C8', '#FFA07A', '#FF6B6B'])
+_LABEL_FIELDS = ['trend_name', 'opportunity_name', 'strategy_title']
+
+def _first_present(frame: pd.DataFrame, fields: List[str]) -> pd.Series:
+    """Take the first truthy value across the given columns, row by row"""
+    columns = frame.reindex(columns=fields).astype(object)
+    return columns.where(columns.astype(bool) & columns.notna()).bfill(axis=1).iloc[:, 0]
+
+def _vectorize_items(items: List[Dict], level_fields: Tuple[str, ...] = ('impact_level',),
+                     label_len: int = 25, default_label: Optional[str] = 'Unknown') -> pd.DataFrame:
+    """Score a batch of items in one pass: label, level text, 1-3 score, colour and confidence per item"""
+    frame = pd.DataFrame(items)
+    level = _first_present(frame, list(level_fields)).fillna('Medium')
+    label = _first_present(frame, _LABEL_FIELDS)
+    if default_label is not None:
+        label = label.fillna(default_label)
+    score = level.astype(str).str.lower().map(_LEVEL_SCORES).fillna(1).astype(int).to_numpy()
+    return pd.DataFrame({
+        'label': label.astype(object).str.slice(0, label_len),
+        'level': level,
+        'score': score,
+        'color': _LEVEL_COLORS[score - 1],
+        'confidence': pd.to_numeric(frame.reindex(columns=['confidence_score'])['confidence_score'].astype(object),
+                                    errors='coerce').fillna(0.7),
+    }, index=frame.index)
+
 class IntelligentChartGenerator:
     """Advanced chart generator with AI-powered contextual analysis"""
     
@@ -23,13 +112,30 @@ class IntelligentChartGenerator:
         self.output_dir = output_dir
         os.makedirs(output_dir, exist_ok=True)
         
-        # Set styling
-        plt.style.use('seaborn-v0_8')
-        sns.set_palette("husl")
+        _init_styles()
         
         # Plotly theme
         self.plotly_theme = "plotly_white"
         
+        # PNG bytes of the static charts rendered so far, packed into one file after generation
+        self._png_charts: Dict[str, bytes] = {}
+        
+        # Chart builders by suggested chart_type
+        self._plotly_builders = {
+            "bar": self._create_plotly_bar_chart,
+            "pie": self._create_plotly_pie_chart,
+            "line": self._create_plotly_line_chart,
+            "scatter": self._create_plotly_scatter_chart,
+            "treemap": self._create_plotly_treemap,
+            "funnel": self._create_plotly_funnel_chart
+        }
+        self._matplotlib_builders = {
+            "bar": self._create_matplotlib_bar_chart,
+            "pie": self._create_matplotlib_pie_chart,
+            "heatmap": self._create_matplotlib_heatmap,
+            "radar": self._create_matplotlib_radar_chart
+        }
+        
     def generate_contextual_charts(self, data: Dict[str, Any]) -> List[str]:
         """Generate contextual charts using AI analysis"""
         logger.info("Starting intelligent chart generation")
@@ -38,83 +144,126 @@ class IntelligentChartGenerator:
             # Analyze data to determine optimal charts
             chart_suggestions = self._analyze_data_with_ai(data)
             
-            generated_charts = []
+            # Each chart renders independently, so the suggested charts, the dashboard and the timeline run together
+            jobs = [(suggestion.get('filename', 'unknown'), self._generate_chart_from_suggestion, suggestion, data)
+                    for suggestion in chart_suggestions]
+            jobs.append(("dashboard", self._create_comprehensive_dashboard, data))
+            if data.get("strategic_recommendations"):
+                jobs.append(("timeline", self._create_timeline_chart, data["strategic_recommendations"]))
             
-            for suggestion in chart_suggestions:
+            with ThreadPoolExecutor(max_workers=min(_MAX_CHART_WORKERS, len(jobs))) as pool:
+                futures = [(name, pool.submit(render, *args)) for name, render, *args in jobs]
+            
+            generated_charts = []
+            # Collect in submission order so the chart order stays stable between runs
+            for name, future in futures:
                 try:
-                    chart_file = self._generate_chart_from_suggestion(suggestion, data)
+                    chart_file = future.result()
                     if chart_file:
                         generated_charts.append(chart_file)
                 except Exception as e:
-                    logger.error(f"Failed to generate chart {suggestion.get('filename', 'unknown')}: {str(e)}")
-            
-            # Generate additional Plotly interactive charts
-            interactive_charts = self._generate_interactive_charts(data)
-            generated_charts.extend(interactive_charts)
+                    logger.error(f"Failed to generate chart {name}: {str(e)}")
             
             if not generated_charts:
                 logger.warning("No charts generated, creating fallback charts")
                 generated_charts = self._create_fallback_charts(data)
             
             logger.info(f"Generated {len(generated_charts)} contextual charts")
+            self._pack_charts(generated_charts)
             return generated_charts
             
         except Exception as e:
             logger.error(f"Chart generation failed: {str(e)}")
-            return self._create_fallback_charts(data)
+            fallback_charts = self._create_fallback_charts(data)
+            self._pack_charts(fallback_charts)
+            return fallback_charts
+    
+    def _save_png(self, fig: Figure, filename: str) -> str:
+        """Save a matplotlib figure as PNG, keeping its bytes for the chart pack"""
+        buf = io.BytesIO()
+        fig.savefig(buf, format='png', dpi=300, bbox_inches='tight', facecolor='white')
+        self._png_charts[filename] = buf.getvalue()
+        
+        # The loose PNG is still written because the charts page and chat view list and download
+        # individual .png files from the report directory; the pack only serves the PDF/DOCX exporters
+        filepath = os.path.join(self.output_dir, filename)
+        with open(filepath, 'wb') as f:
+            f.write(self._png_charts[filename])
+        return filepath
+    
+    def _save_html(self, fig: go.Figure, filename: str) -> str:
+        """Save a Plotly figure as HTML that loads plotly.js from the CDN instead of inlining it"""
+        filepath = os.path.join(self.output_dir, filename)
+        fig.write_html(filepath, include_plotlyjs='cdn', full_html=True, validate=False,
+                       config={'responsive': True}, default_width='100%')
+        return filepath
+    
+    def _pack_charts(self, chart_files: List[str]):
+        """Write the static charts into one packed file plus an offset index for the exporters"""
+        names = [name for name in chart_files if name in self._png_charts]
+        if not names:
+            return
+        
+        index = {}
+        offset = 0
+        for name in names:
+            length = len(self._png_charts[name])
+            index[name] = [offset, length]
+            offset += length
+        
+        try:
+            write_files([
+                (os.path.join(self.output_dir, Settings.CHART_PACK_FILE), b"".join(self._png_charts[name] for name in names)),
+                (os.path.join(self.output_dir, Settings.CHART_INDEX_FILE), orjson.dumps(index))
+            ])
+            logger.info(f"Packed {len(names)} charts into {Settings.CHART_PACK_FILE}")
+        except Exception as e:
+            logger.warning(f"Failed to pack charts: {str(e)}")
     
     def _analyze_data_with_ai(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Use AI to analyze data and suggest optimal charts"""
         try:
-            llm = init_chat_model(Settings.LLM_MODEL, model_provider="google_genai")
-            parser = JsonOutputParser()
-            
-            prompt = ChatPromptTemplate.from_messages([
-                ("system", """You are an expert data visualization analyst. Analyze the provided market intelligence data and suggest the most effective charts to visualize the insights.
-
-Consider:
-- Data types and structures available
-- Key insights that need highlighting
-- Audience needs (business executives)
-- Visual impact and clarity
-
-Return a JSON array of chart suggestions with:
-- chart_type: 'bar', 'pie', 'line', 'scatter', 'heatmap', 'radar', 'treemap', 'funnel'
-- title: descriptive title
-- filename: snake_case filename without extension
-- data_source: which data to use
-- visualization_goal: what insight this chart reveals
-- priority: 'high', 'medium', 'low'
-- interactive: true/false (whether to make it interactive)
-
-Maximum 5 suggestions, prioritize high-impact visualizations."""),
-                ("human", "Query: {query}\nMarket Domain: {market_domain}\n\nData Summary:\n- Trends: {trend_count}\n- Opportunities: {opp_count}\n- Recommendations: {rec_count}\n\nSample Data: {sample_data}")
-            ])
-            
-            chain = prompt | llm | parser
-            
             # Prepare data summary
             trends = data.get("market_trends", [])
             opportunities = data.get("opportunities", [])
             recommendations = data.get("strategic_recommendations", [])
             
+            if len(trends) + len(opportunities) + len(recommendations) < _MIN_ITEMS_FOR_AI_SUGGESTIONS:
+                logger.info("Too little data for AI chart suggestions, using default charts")
+                return self._get_default_suggestions(data)
+            
             sample_data = {
                 "trends_sample": trends[:2] if trends else [],
                 "opportunities_sample": opportunities[:2] if opportunities else [],
                 "recommendations_sample": recommendations[:2] if recommendations else []
             }
             
-            suggestions = chain.invoke({
+            inputs = {
                 "query": data.get("query", ""),
                 "market_domain": data.get("market_domain", ""),
                 "trend_count": len(trends),
                 "opp_count": len(opportunities),
                 "rec_count": len(recommendations),
                 "sample_data": str(sample_data)[:1000]
-            })
+            }
+            
+            # Only an analysis of the same shape and sample data in the same market reuses the earlier suggestions
+            namespace = f"chart_suggestions:{inputs['market_domain']}"
+            sample_shape = [[item.get(field) for field in _SAMPLE_KEY_FIELDS] for samples in sample_data.values()
+                            for item in samples if isinstance(item, dict)]
+            cache_key = "\x00".join(map(str, (
+                inputs["query"], inputs["trend_count"], inputs["opp_count"], inputs["rec_count"],
+                hashlib.sha256(repr(sample_shape).encode("utf-8")).hexdigest()
+            )))
+            cached = _SUGGESTION_CACHE.get(namespace, cache_key)
+            if cached is not None:
+                return copy.deepcopy(cached)
+            
+            suggestions = _get_suggestion_chain().invoke(inputs)
             
             if isinstance(suggestions, list):
                 logger.info(f"AI suggested {len(suggestions)} charts")
+                _SUGGESTION_CACHE.set(namespace, cache_key, copy.deepcopy(suggestions))
                 return suggestions
             else:
                 logger.warning("AI returned invalid chart suggestions")
@@ -185,24 +334,11 @@ Maximum 5 suggestions, prioritize high-impact visualizations."""),
             if not source_data:
                 return None
             
-            fig = None
-            
-            if chart_type == "bar":
-                fig = self._create_plotly_bar_chart(source_data, title)
-            elif chart_type == "pie":
-                fig = self._create_plotly_pie_chart(source_data, title)
-            elif chart_type == "line":
-                fig = self._create_plotly_line_chart(source_data, title)
-            elif chart_type == "scatter":
-                fig = self._create_plotly_scatter_chart(source_data, title)
-            elif chart_type == "treemap":
-                fig = self._create_plotly_treemap(source_data, title)
-            elif chart_type == "funnel":
-                fig = self._create_plotly_funnel_chart(source_data, title)
+            builder = self._plotly_builders.get(chart_type)
+            fig = builder(source_data, title) if builder else None
             
             if fig:
-                filepath = os.path.join(self.output_dir, filename)
-                fig.write_html(filepath)
+                filepath = self._save_html(fig, filename)
                 logger.info(f"Generated interactive chart: {filepath}")
                 return filename
             
@@ -224,59 +360,32 @@ Maximum 5 suggestions, prioritize high-impact visualizations."""),
             if not source_data:
                 return None
             
-            plt.figure(figsize=(12, 8))
+            # A standalone Figure stays out of pyplot's global figure state, so charts can render on threads
+            fig = Figure(figsize=(12, 8))
             
-            if chart_type == "bar":
-                self._create_matplotlib_bar_chart(source_data, title)
-            elif chart_type == "pie":
-                self._create_matplotlib_pie_chart(source_data, title)
-            elif chart_type == "heatmap":
-                self._create_matplotlib_heatmap(source_data, title)
-            elif chart_type == "radar":
-                self._create_matplotlib_radar_chart(source_data, title)
+            builder = self._matplotlib_builders.get(chart_type)
+            if builder:
+                builder(fig, source_data, title)
             
-            filepath = os.path.join(self.output_dir, filename)
-            plt.savefig(filepath, dpi=300, bbox_inches='tight', facecolor='white')
-            plt.close()
+            filepath = self._save_png(fig, filename)
             
             logger.info(f"Generated static chart: {filepath}")
             return filename
             
         except Exception as e:
             logger.error(f"Failed to generate matplotlib chart: {str(e)}")
-            plt.close()
             return None
     
     def _create_plotly_bar_chart(self, data: List[Dict], title: str) -> go.Figure:
         """Create interactive bar chart with Plotly"""
-        labels = []
-        values = []
-        colors = []
-        
-        for item in data:
-            # Extract label
-            label = (item.get('trend_name') or item.get('opportunity_name') or 
-                    item.get('strategy_title') or 'Unknown')[:25]
-            labels.append(label)
-            
-            # Extract value
-            impact = item.get('impact_level') or item.get('revenue_potential') or item.get('priority_level') or 'Medium'
-            if impact.lower() == 'high':
-                values.append(3)
-                colors.append('#FF6B6B')
-            elif impact.lower() == 'medium':
-                values.append(2)
-                colors.append('#FFA07A')
-            else:
-                values.append(1)
-                colors.append('#98D8C8')
+        items = _vectorize_items(data, ('impact_level', 'revenue_potential', 'priority_level'))
         
         fig = go.Figure(data=[
             go.Bar(
-                x=labels,
-                y=values,
-                marker_color=colors,
-                text=[f"{impact}" for impact in [item.get('impact_level', 'Medium') for item in data]],
+                x=items['label'].to_numpy(),
+                y=items['score'].to_numpy(),
+                marker_color=items['color'].to_numpy(),
+                text=items['level'].astype(str).to_numpy(),
                 textposition='auto',
                 hovertemplate='<b>%{x}</b><br>Impact: %{text}<br>Score: %{y}<extra></extra>'
             )
@@ -358,35 +467,15 @@ Maximum 5 suggestions, prioritize high-impact visualizations."""),
     
     def _create_plotly_scatter_chart(self, data: List[Dict], title: str) -> go.Figure:
         """Create interactive scatter chart with Plotly"""
-        x_values = []
-        y_values = []
-        text_labels = []
-        
-        for item in data:
-            # Use confidence as x-axis
-            confidence = item.get('confidence_score', 0.7)
-            x_values.append(confidence if isinstance(confidence, (int, float)) else 0.7)
-            
-            # Use impact as y-axis
-            impact = item.get('impact_level', 'Medium')
-            if impact.lower() == 'high':
-                y_values.append(3)
-            elif impact.lower() == 'medium':
-                y_values.append(2)
-            else:
-                y_values.append(1)
-            
-            # Label
-            label = (item.get('trend_name') or item.get('opportunity_name') or 
-                    item.get('strategy_title') or 'Unknown')[:20]
-            text_labels.append(label)
+        # Confidence on the x-axis, impact on the y-axis
+        items = _vectorize_items(data, label_len=20)
         
         fig = go.Figure(data=[
             go.Scatter(
-                x=x_values,
-                y=y_values,
+                x=items['confidence'].to_numpy(),
+                y=items['score'].to_numpy(),
                 mode='markers+text',
-                text=text_labels,
+                text=items['label'].to_numpy(),
                 textposition='top center',
                 marker=dict(size=12, color='#4ECDC4', opacity=0.7),
                 hovertemplate='<b>%{text}</b><br>Confidence: %{x:.1%}<br>Impact: %{y}<extra></extra>'
@@ -413,12 +502,11 @@ Maximum 5 suggestions, prioritize high-impact visualizations."""),
         
         # Create hierarchy: Category -> Items
         categories = {}
-        for item in data:
+        item_names = _vectorize_items(data, label_len=20)['label'].to_numpy()
+        for item, item_name in zip(data, item_names):
             category = (item.get('timeframe') or item.get('implementation_difficulty') or 
                        item.get('category') or 'General')
-            if category not in categories:
-                categories[category] = []
-            categories[category].append(item)
+            categories.setdefault(category, []).append(item_name)
         
         # Add root
         labels.append(title)
@@ -426,18 +514,15 @@ Maximum 5 suggestions, prioritize high-impact visualizations."""),
         values.append(len(data))
         
         # Add categories
-        for category, items in categories.items():
+        for category, names in categories.items():
             labels.append(category)
             parents.append(title)
-            values.append(len(items))
+            values.append(len(names))
             
             # Add items
-            for item in items:
-                item_name = (item.get('trend_name') or item.get('opportunity_name') or 
-                           item.get('strategy_title') or 'Unknown')[:20]
-                labels.append(item_name)
-                parents.append(category)
-                values.append(1)
+            labels.extend(names)
+            parents.extend([category] * len(names))
+            values.extend([1] * len(names))
         
         fig = go.Figure(go.Treemap(
             labels=labels,
@@ -457,16 +542,12 @@ Maximum 5 suggestions, prioritize high-impact visualizations."""),
     def _create_plotly_funnel_chart(self, data: List[Dict], title: str) -> go.Figure:
         """Create interactive funnel chart with Plotly"""
         # Sort by priority/impact for funnel effect
-        sorted_data = sorted(data, key=lambda x: self._get_priority_score(x), reverse=True)
+        items = _vectorize_items(data, ('priority_level', 'impact_level'), default_label=None)
+        order = np.argsort(-items['score'].to_numpy(), kind='stable')[:6]  # Limit to 6 items for clarity
         
-        labels = []
-        values = []
-        
-        for i, item in enumerate(sorted_data[:6]):  # Limit to 6 items for clarity
-            label = (item.get('trend_name') or item.get('opportunity_name') or 
-                    item.get('strategy_title') or f'Item {i+1}')[:25]
-            labels.append(label)
-            values.append(100 - i * 15)  # Decreasing values for funnel effect
+        labels = [label if isinstance(label, str) else f'Item {i+1}'
+                  for i, label in enumerate(items['label'].to_numpy()[order])]
+        values = 100 - np.arange(len(labels)) * 15  # Decreasing values for funnel effect
         
         fig = go.Figure(go.Funnel(
             y=labels,
@@ -483,37 +564,6 @@ Maximum 5 suggestions, prioritize high-impact visualizations."""),
         
         return fig
     
-    def _get_priority_score(self, item: Dict) -> int:
-        """Get numeric priority score for sorting"""
-        priority = item.get('priority_level') or item.get('impact_level') or 'Medium'
-        if priority.lower() == 'high':
-            return 3
-        elif priority.lower() == 'medium':
-            return 2
-        else:
-            return 1
-    
-    def _generate_interactive_charts(self, data: Dict[str, Any]) -> List[str]:
-        """Generate additional interactive charts"""
-        interactive_charts = []
-        
-        try:
-            # Generate comprehensive dashboard chart
-            dashboard_chart = self._create_comprehensive_dashboard(data)
-            if dashboard_chart:
-                interactive_charts.append(dashboard_chart)
-            
-            # Generate timeline chart if recommendations exist
-            if data.get("strategic_recommendations"):
-                timeline_chart = self._create_timeline_chart(data["strategic_recommendations"])
-                if timeline_chart:
-                    interactive_charts.append(timeline_chart)
-            
-        except Exception as e:
-            logger.error(f"Failed to generate interactive charts: {str(e)}")
-        
-        return interactive_charts
-    
     def _create_comprehensive_dashboard(self, data: Dict[str, Any]) -> Optional[str]:
         """Create comprehensive dashboard with multiple subplots"""
         try:
@@ -535,11 +585,10 @@ Maximum 5 suggestions, prioritize high-impact visualizations."""),
             
             # Trends chart
             if trends:
-                trend_labels = [t.get('trend_name', 'Unknown')[:15] for t in trends[:5]]
-                trend_values = [self._get_impact_score(t.get('impact_level', 'Medium')) for t in trends[:5]]
+                trend_items = _vectorize_items(trends[:5], label_len=15)
                 
                 fig.add_trace(
-                    go.Bar(x=trend_labels, y=trend_values, name="Trends", 
+                    go.Bar(x=trend_items['label'].to_numpy(), y=trend_items['score'].to_numpy(), name="Trends", 
                           marker_color='#FF6B6B'),
                     row=1, col=1
                 )
@@ -559,11 +608,10 @@ Maximum 5 suggestions, prioritize high-impact visualizations."""),
             
             # Recommendations chart
             if recommendations:
-                rec_labels = [r.get('strategy_title', 'Unknown')[:15] for r in recommendations[:5]]
-                rec_values = [self._get_priority_score(r) for r in recommendations[:5]]
+                rec_items = _vectorize_items(recommendations[:5], ('priority_level', 'impact_level'), label_len=15)
                 
                 fig.add_trace(
-                    go.Bar(x=rec_labels, y=rec_values, name="Recommendations", 
+                    go.Bar(x=rec_items['label'].to_numpy(), y=rec_items['score'].to_numpy(), name="Recommendations", 
                           marker_color='#4ECDC4'),
                     row=2, col=1
                 )
@@ -590,8 +638,7 @@ Maximum 5 suggestions, prioritize high-impact visualizations."""),
             )
             
             filename = "comprehensive_dashboard.html"
-            filepath = os.path.join(self.output_dir, filename)
-            fig.write_html(filepath)
+            filepath = self._save_html(fig, filename)
             
             logger.info(f"Generated comprehensive dashboard: {filepath}")
             return filename
@@ -647,8 +694,7 @@ Maximum 5 suggestions, prioritize high-impact visualizations."""),
             )
             
             filename = "implementation_timeline.html"
-            filepath = os.path.join(self.output_dir, filename)
-            fig.write_html(filepath)
+            filepath = self._save_html(fig, filename)
             
             logger.info(f"Generated timeline chart: {filepath}")
             return filename
@@ -657,15 +703,6 @@ Maximum 5 suggestions, prioritize high-impact visualizations."""),
             logger.error(f"Failed to create timeline chart: {str(e)}")
             return None
     
-    def _get_impact_score(self, impact: str) -> int:
-        """Convert impact level to numeric score"""
-        if impact.lower() == 'high':
-            return 3
-        elif impact.lower() == 'medium':
-            return 2
-        else:
-            return 1
-    
     def _create_fallback_charts(self, data: Dict[str, Any]) -> List[str]:
         """Create basic fallback charts when AI generation fails"""
         charts = []
@@ -691,32 +728,29 @@ Maximum 5 suggestions, prioritize high-impact visualizations."""),
     def _create_simple_trends_chart(self, trends: List[Dict], market_domain: str) -> Optional[str]:
         """Create simple trends chart as fallback"""
         try:
-            plt.figure(figsize=(12, 6))
+            fig = Figure(figsize=(12, 6))
+            ax = fig.add_subplot()
             
-            trend_names = [trend.get('trend_name', f'Trend {i+1}')[:20] for i, trend in enumerate(trends[:6])]
-            impact_values = [self._get_impact_score(trend.get('impact_level', 'Medium')) for trend in trends[:6]]
-            colors = ['#FF6B6B' if v == 3 else '#FFA07A' if v == 2 else '#98D8C8' for v in impact_values]
+            items = _vectorize_items(trends[:6], label_len=20)
             
-            plt.bar(trend_names, impact_values, color=colors)
-            plt.title(f'Market Trends Impact Analysis - {market_domain}', fontsize=16, fontweight='bold')
-            plt.xlabel('Trends', fontsize=12)
-            plt.ylabel('Impact Level', fontsize=12)
-            plt.xticks(rotation=45, ha='right')
-            plt.yticks([1, 2, 3], ['Low', 'Medium', 'High'])
-            plt.grid(True, alpha=0.3, axis='y')
-            plt.tight_layout()
+            ax.bar(items['label'].to_numpy(), items['score'].to_numpy(), color=items['color'].to_numpy())
+            ax.set_title(f'Market Trends Impact Analysis - {market_domain}', fontsize=16, fontweight='bold')
+            ax.set_xlabel('Trends', fontsize=12)
+            ax.set_ylabel('Impact Level', fontsize=12)
+            ax.tick_params(axis='x', labelrotation=45)
+            plt.setp(ax.get_xticklabels(), ha='right')
+            ax.set_yticks([1, 2, 3], ['Low', 'Medium', 'High'])
+            ax.grid(True, alpha=0.3, axis='y')
+            fig.tight_layout()
             
             filename = 'fallback_trends_analysis.png'
-            filepath = os.path.join(self.output_dir, filename)
-            plt.savefig(filepath, dpi=300, bbox_inches='tight', facecolor='white')
-            plt.close()
+            filepath = self._save_png(fig, filename)
             
             logger.info(f"Generated fallback trends chart: {filepath}")
             return filename
             
         except Exception as e:
             logger.error(f"Failed to create simple trends chart: {str(e)}")
-            plt.close()
             return None
     
     def _create_simple_opportunities_chart(self, opportunities: List[Dict], market_domain: str) -> Optional[str]:
@@ -731,63 +765,43 @@ Maximum 5 suggestions, prioritize high-impact visualizations."""),
             if not potential_counts:
                 return None
             
-            plt.figure(figsize=(10, 8))
+            fig = Figure(figsize=(10, 8))
+            ax = fig.add_subplot()
             
             labels = list(potential_counts.keys())
             sizes = list(potential_counts.values())
             colors = ['#FF6B6B', '#FFA07A', '#98D8C8'][:len(labels)]
             
-            plt.pie(sizes, labels=labels, autopct='%1.1f%%', colors=colors, startangle=90)
-            plt.title(f'Opportunities by Revenue Potential - {market_domain}', fontsize=16, fontweight='bold')
-            plt.axis('equal')
+            ax.pie(sizes, labels=labels, autopct='%1.1f%%', colors=colors, startangle=90)
+            ax.set_title(f'Opportunities by Revenue Potential - {market_domain}', fontsize=16, fontweight='bold')
+            ax.axis('equal')
             
             filename = 'fallback_opportunities_analysis.png'
-            filepath = os.path.join(self.output_dir, filename)
-            plt.savefig(filepath, dpi=300, bbox_inches='tight', facecolor='white')
-            plt.close()
+            filepath = self._save_png(fig, filename)
             
             logger.info(f"Generated fallback opportunities chart: {filepath}")
             return filename
             
         except Exception as e:
             logger.error(f"Failed to create simple opportunities chart: {str(e)}")
-            plt.close()
             return None
     
-    def _create_matplotlib_bar_chart(self, data: List[Dict], title: str):
+    def _create_matplotlib_bar_chart(self, fig: Figure, data: List[Dict], title: str):
         """Create matplotlib bar chart"""
-        labels = []
-        values = []
-        colors = []
-        
-        for item in data:
-            # Extract label
-            label = (item.get('trend_name') or item.get('opportunity_name') or 
-                    item.get('strategy_title') or 'Unknown')[:20]
-            labels.append(label)
-            
-            # Extract value
-            impact = item.get('impact_level') or item.get('revenue_potential') or item.get('priority_level') or 'Medium'
-            if impact.lower() == 'high':
-                values.append(3)
-                colors.append('#FF6B6B')
-            elif impact.lower() == 'medium':
-                values.append(2)
-                colors.append('#FFA07A')
-            else:
-                values.append(1)
-                colors.append('#98D8C8')
-        
-        plt.bar(labels, values, color=colors)
-        plt.title(title, fontsize=16, fontweight='bold')
-        plt.xlabel('Items', fontsize=12)
-        plt.ylabel('Impact Level', fontsize=12)
-        plt.xticks(rotation=45, ha='right')
-        plt.yticks([1, 2, 3], ['Low', 'Medium', 'High'])
-        plt.grid(True, alpha=0.3, axis='y')
-        plt.tight_layout()
+        items = _vectorize_items(data, ('impact_level', 'revenue_potential', 'priority_level'), label_len=20)
+        
+        ax = fig.add_subplot()
+        ax.bar(items['label'].to_numpy(), items['score'].to_numpy(), color=items['color'].to_numpy())
+        ax.set_title(title, fontsize=16, fontweight='bold')
+        ax.set_xlabel('Items', fontsize=12)
+        ax.set_ylabel('Impact Level', fontsize=12)
+        ax.tick_params(axis='x', labelrotation=45)
+        plt.setp(ax.get_xticklabels(), ha='right')
+        ax.set_yticks([1, 2, 3], ['Low', 'Medium', 'High'])
+        ax.grid(True, alpha=0.3, axis='y')
+        fig.tight_layout()
     
-    def _create_matplotlib_pie_chart(self, data: List[Dict], title: str):
+    def _create_matplotlib_pie_chart(self, fig: Figure, data: List[Dict], title: str):
         """Create matplotlib pie chart"""
         # Count categories
         categories = {}
@@ -801,20 +815,18 @@ Maximum 5 suggestions, prioritize high-impact visualizations."""),
             sizes = list(categories.values())
             colors = plt.cm.Set3(np.linspace(0, 1, len(labels)))
             
-            plt.pie(sizes, labels=labels, autopct='%1.1f%%', colors=colors, startangle=90)
-            plt.title(title, fontsize=16, fontweight='bold')
-            plt.axis('equal')
+            ax = fig.add_subplot()
+            ax.pie(sizes, labels=labels, autopct='%1.1f%%', colors=colors, startangle=90)
+            ax.set_title(title, fontsize=16, fontweight='bold')
+            ax.axis('equal')
     
-    def _create_matplotlib_heatmap(self, data: List[Dict], title: str):
+    def _create_matplotlib_heatmap(self, fig: Figure, data: List[Dict], title: str):
         """Create matplotlib heatmap"""
         # Create a simple heatmap based on available data
         matrix_data = []
-        labels = []
+        labels = list(_vectorize_items(data, label_len=15, default_label='Item')['label'])
         
         for item in data:
-            name = item.get('trend_name') or item.get('opportunity_name') or item.get('strategy_title') or 'Item'
-            labels.append(name[:15])
-            
             # Create row of values
             row = []
             for key, value in item.items():
@@ -831,11 +843,12 @@ Maximum 5 suggestions, prioritize high-impact visualizations."""),
             max_len = max(len(row) for row in matrix_data)
             matrix_data = [row + [0] * (max_len - len(row)) for row in matrix_data]
             
-            sns.heatmap(matrix_data, annot=True, cmap='YlOrRd', yticklabels=labels)
-            plt.title(title, fontsize=16, fontweight='bold')
-            plt.tight_layout()
+            ax = fig.add_subplot()
+            sns.heatmap(matrix_data, annot=True, cmap='YlOrRd', yticklabels=labels, ax=ax)
+            ax.set_title(title, fontsize=16, fontweight='bold')
+            fig.tight_layout()
     
-    def _create_matplotlib_radar_chart(self, data: List[Dict], title: str):
+    def _create_matplotlib_radar_chart(self, fig: Figure, data: List[Dict], title: str):
         """Create matplotlib radar chart"""
         # Extract numeric fields for radar chart
         numeric_fields = []
@@ -849,7 +862,7 @@ Maximum 5 suggestions, prioritize high-impact visualizations."""),
             angles = np.linspace(0, 2 * np.pi, len(numeric_fields), endpoint=False).tolist()
             angles += angles[:1]  # Complete the circle
             
-            ax = plt.subplot(111, projection='polar')
+            ax = fig.add_subplot(111, projection='polar')
             
             for i, item in enumerate(data[:3]):  # Limit to 3 items
                 values = []
@@ -865,8 +878,8 @@ Maximum 5 suggestions, prioritize high-impact visualizations."""),
             ax.set_xticks(angles[:-1])
             ax.set_xticklabels([field.replace('_', ' ').title() for field in numeric_fields])
             ax.set_ylim(0, 3)
-            plt.legend(loc='upper right', bbox_to_anchor=(0.1, 0.1))
-            plt.title(title, fontsize=16, fontweight='bold', pad=20)
+            ax.legend(loc='upper right', bbox_to_anchor=(0.1, 0.1))
+            ax.set_title(title, fontsize=16, fontweight='bold', pad=20)
     
     def _extract_numeric_value(self, value) -> float:
         """Extract numeric value from various formats"""
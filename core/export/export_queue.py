@@ -0,0 +1,74 @@
+import logging
+import multiprocessing
+import os
+import orjson
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Any
+from config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+_EXPORT_POOL = None
+
+def _get_export_pool() -> Executor:
+    """Return the shared worker pool that renders PDF and DOCX exports"""
+    global _EXPORT_POOL
+    if _EXPORT_POOL is None:
+        try:
+            # spawn rather than fork: forking the multithreaded app process can deadlock on inherited locks
+            _EXPORT_POOL = ProcessPoolExecutor(max_workers=Settings.EXPORT_WORKERS,
+                                               mp_context=multiprocessing.get_context("spawn"))
+        except ValueError:
+            # No usable start method, so fall back to threads
+            _EXPORT_POOL = ThreadPoolExecutor(max_workers=Settings.EXPORT_WORKERS)
+    return _EXPORT_POOL
+
+def _write_status(report_dir: str, status: str, **fields) -> None:
+    """Record an export job's state in the report directory"""
+    record = {"status": status, "updated_at": datetime.now().isoformat(), **fields}
+    status_path = os.path.join(report_dir, Settings.EXPORT_STATUS_FILE)
+    tmp_path = f"{status_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(orjson.dumps(record))
+    # Replace atomically so pollers never read a half-written status
+    os.replace(tmp_path, status_path)
+
+def _render_exports(report_dir: str, report_content: str, chart_files: List[str], title: str) -> Dict[str, str]:
+    """Render the PDF and DOCX exports for a report, updating its status as it goes"""
+    from core.export.report_exporter import ReportExporter
+    
+    _write_status(report_dir, "processing")
+    exporter = ReportExporter(report_dir)
+    
+    export_files, errors = {}, {}
+    for export_format, render in (("pdf", exporter.render_pdf), ("docx", exporter.render_docx)):
+        try:
+            export_files[export_format] = render(report_content, chart_files, title)
+        except Exception as e:
+            logger.warning(f"{export_format.upper()} export failed: {str(e)}")
+            errors[export_format] = str(e)
+    
+    _write_status(report_dir, "completed" if export_files else "failed", export_files=export_files, errors=errors)
+    return export_files
+
+def _log_job_failure(future: Future) -> None:
+    """Log an export job that died outside the per-format error handling (e.g. a crashed worker)"""
+    if future.exception() is not None:
+        logger.error(f"Export job failed: {str(future.exception())}")
+
+def submit_exports(report_dir: str, report_content: str, chart_files: List[str], title: str) -> Future:
+    """Queue PDF and DOCX rendering for a report and return immediately"""
+    _write_status(report_dir, "queued")
+    future = _get_export_pool().submit(_render_exports, report_dir, report_content, chart_files, title)
+    future.add_done_callback(_log_job_failure)
+    logger.info(f"Queued PDF/DOCX export for {report_dir}")
+    return future
+
+def get_export_status(report_dir: str) -> Dict[str, Any]:
+    """Return a report's export job state (queued, processing, completed, failed or unknown) with any rendered paths"""
+    try:
+        with open(os.path.join(report_dir, Settings.EXPORT_STATUS_FILE), "rb") as f:
+            return orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError):
+        return {"status": "unknown"}
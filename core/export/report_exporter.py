@@ -1,8 +1,10 @@
+import io
 import os
 import logging
 from typing import List, Dict, Any
 from datetime import datetime
 import asyncio
+import orjson
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, PageBreak
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -27,8 +29,37 @@ class ReportExporter:
         self.exports_dir = os.path.join(output_dir, "exports")
         os.makedirs(self.exports_dir, exist_ok=True)
     
+    def _load_packed_charts(self) -> Dict[str, bytes]:
+        """Read all PNG charts from the report's packed chart file in one pass"""
+        pack_path = os.path.join(self.output_dir, Settings.CHART_PACK_FILE)
+        index_path = os.path.join(self.output_dir, Settings.CHART_INDEX_FILE)
+        if not (os.path.exists(pack_path) and os.path.exists(index_path)):
+            return {}
+        
+        try:
+            with open(index_path, "rb") as f:
+                index = orjson.loads(f.read())
+            with open(pack_path, "rb") as f:
+                packed = f.read()
+            return {name: packed[offset:offset + length] for name, (offset, length) in index.items()}
+        except Exception as e:
+            logger.warning(f"Could not read packed charts, falling back to individual files: {str(e)}")
+            return {}
+    
+    def _chart_source(self, chart_file: str, packed_charts: Dict[str, bytes]):
+        """Return an in-memory stream for a packed chart, or its file path if it exists on disk"""
+        if chart_file in packed_charts:
+            return io.BytesIO(packed_charts[chart_file])
+        chart_path = os.path.join(self.output_dir, chart_file)
+        return chart_path if os.path.exists(chart_path) else None
+    
     async def export_to_pdf(self, content: str, chart_files: List[str], title: str) -> str:
         """Export report to PDF format"""
+        # Rendering is blocking, so it runs on a worker thread to let other exports proceed concurrently
+        return await asyncio.to_thread(self.render_pdf, content, chart_files, title)
+    
+    def render_pdf(self, content: str, chart_files: List[str], title: str) -> str:
+        """Render report to a PDF file"""
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M")
             filename = f"report_{timestamp}.pdf"
@@ -97,16 +128,17 @@ class ReportExporter:
                 story.append(Paragraph("Charts and Visualizations", heading_style))
                 story.append(Spacer(1, 20))
                 
+                packed_charts = self._load_packed_charts()
                 for chart_file in chart_files:
                     if chart_file.endswith('.png'):
-                        chart_path = os.path.join(self.output_dir, chart_file)
-                        if os.path.exists(chart_path):
+                        chart_source = self._chart_source(chart_file, packed_charts)
+                        if chart_source is not None:
                             try:
                                 # Add chart with caption
                                 story.append(Paragraph(f"Chart: {chart_file.replace('_', ' ').title()}", styles['Heading4']))
                                 story.append(Spacer(1, 8))
                                 
-                                img = Image(chart_path, width=6*inch, height=4*inch)
+                                img = Image(chart_source, width=6*inch, height=4*inch)
                                 story.append(img)
                                 story.append(Spacer(1, 20))
                             except Exception as e:
@@ -124,6 +156,11 @@ class ReportExporter:
     
     async def export_to_docx(self, content: str, chart_files: List[str], title: str) -> str:
         """Export report to DOCX format"""
+        # Rendering is blocking, so it runs on a worker thread to let other exports proceed concurrently
+        return await asyncio.to_thread(self.render_docx, content, chart_files, title)
+    
+    def render_docx(self, content: str, chart_files: List[str], title: str) -> str:
+        """Render report to a DOCX file"""
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M")
             filename = f"report_{timestamp}.docx"
@@ -194,16 +231,17 @@ class ReportExporter:
                 doc.add_page_break()
                 doc.add_heading('Charts and Visualizations', level=1)
                 
+                packed_charts = self._load_packed_charts()
                 for chart_file in chart_files:
                     if chart_file.endswith('.png'):
-                        chart_path = os.path.join(self.output_dir, chart_file)
-                        if os.path.exists(chart_path):
+                        chart_source = self._chart_source(chart_file, packed_charts)
+                        if chart_source is not None:
                             try:
                                 # Add chart caption
                                 doc.add_heading(f"Chart: {chart_file.replace('_', ' ').title()}", level=2)
                                 
                                 # Add image
-                                doc.add_picture(chart_path, width=Inches(6))
+                                doc.add_picture(chart_source, width=Inches(6))
                                 doc.add_paragraph()  # Add space after image
                             except Exception as e:
                                 logger.warning(f"Could not add chart {chart_file} to DOCX: {str(e)}")
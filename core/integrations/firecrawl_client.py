@@ -1,8 +1,11 @@
+import asyncio
+import aiohttp
 import requests
 import logging
 import time
 from typing import Dict, List, Any, Optional
 from config.settings import Settings
+from core.integrations.http_retry import request_json
 
 logger = logging.getLogger(__name__)
 
@@ -18,35 +21,41 @@ class FirecrawlClient:
             "Content-Type": "application/json"
         }
 
+    def _scrape_payload(self, url: str, options: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Build the request body for a single-page scrape"""
+        return {
+            "url": url,
+            "pageOptions": options or {
+                "onlyMainContent": True,
+                "includeHtml": False,
+                "screenshot": False
+            }
+        }
+
+    def _parse_scrape_result(self, url: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract the scraped page from a scrape response"""
+        page = data.get("data", {})
+        metadata = page.get("metadata", {})
+        return {
+            "success": True,
+            "url": url,
+            "title": page.get("title") or metadata.get("title", ""),  # Scrapes usually report the title in metadata
+            "content": page.get("markdown", ""),
+            "metadata": metadata
+        }
+
     def scrape_url(self, url: str, options: Dict[str, Any] = None) -> Dict[str, Any]:
         """Scrape a single URL"""
         try:
-            payload = {
-                "url": url,
-                "pageOptions": options or {
-                    "onlyMainContent": True,
-                    "includeHtml": False,
-                    "screenshot": False
-                }
-            }
-
             response = requests.post(
                 f"{self.base_url}/scrape",
                 headers=self.headers,
-                json=payload
+                json=self._scrape_payload(url, options)
             )
             response.raise_for_status()
 
-            data = response.json()
             logger.info(f"Successfully scraped URL: {url}")
-
-            return {
-                "success": True,
-                "url": url,
-                "title": data.get("data", {}).get("title", ""),
-                "content": data.get("data", {}).get("markdown", ""),
-                "metadata": data.get("data", {}).get("metadata", {})
-            }
+            return self._parse_scrape_result(url, response.json())
 
         except Exception as e:
             logger.error(f"Failed to scrape URL {url}: {str(e)}")
@@ -133,39 +142,41 @@ class FirecrawlClient:
             "error": "Crawl timeout or polling failed"
         }
 
+    def _search_payload(self, query: str, num_results: int) -> Dict[str, Any]:
+        """Build the request body for a search-and-scrape call"""
+        return {
+            "query": query[:100],
+            "pageOptions": {
+                "onlyMainContent": True,
+                "includeHtml": False
+            },
+            "searchOptions": {
+                "limit": min(num_results, 10)
+            }
+        }
+
+    def _parse_search_results(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Extract scraped pages from a search response"""
+        return [{
+            "url": item.get("url", ""),
+            "title": item.get("title", ""),
+            "content": item.get("markdown", ""),
+            "metadata": item.get("metadata", {})
+        } for item in data.get("data", [])]
+
     def search_and_scrape(self, query: str, num_results: int = 5) -> List[Dict[str, Any]]:
         """Search for URLs and scrape them with retry logic"""
         for attempt in range(3):  # Retry up to 3 times
             try:
-                payload = {
-                    "query": query[:100],
-                    "pageOptions": {
-                        "onlyMainContent": True,
-                        "includeHtml": False
-                    },
-                    "searchOptions": {
-                        "limit": min(num_results, 10)
-                    }
-                }
-
                 response = requests.post(
                     f"{self.base_url}/search",
                     headers=self.headers,
-                    json=payload,
+                    json=self._search_payload(query, num_results),
                     timeout=30
                 )
                 response.raise_for_status()
 
-                data = response.json()
-                results = []
-
-                for item in data.get("data", []):
-                    results.append({
-                        "url": item.get("url", ""),
-                        "title": item.get("title", ""),
-                        "content": item.get("markdown", ""),
-                        "metadata": item.get("metadata", {})
-                    })
+                results = self._parse_search_results(response.json())
 
                 logger.info(f"Successfully searched and scraped {len(results)} results for query: {query}")
                 return results
@@ -182,3 +193,37 @@ class FirecrawlClient:
 
         logger.error(f"All retry attempts failed for query: {query}")
         return []
+
+    async def _post_with_retry(self, session: aiohttp.ClientSession, endpoint: str, payload: Dict[str, Any],
+                               label: str, semaphore: Optional[asyncio.Semaphore] = None) -> Optional[Dict[str, Any]]:
+        """POST to a Firecrawl endpoint with retry logic, returning the decoded body or None"""
+        try:
+            return await request_json(session, "POST", f"{self.base_url}/{endpoint}", f"Firecrawl {label}",
+                                      semaphore, headers=self.headers, json=payload)
+        except Exception as e:
+            logger.error(f"Firecrawl {endpoint} failed for {label}: {str(e)}")
+            return None
+
+    async def search_async(self, session: aiohttp.ClientSession, query: str, num_results: int = 5,
+                           semaphore: Optional[asyncio.Semaphore] = None) -> List[str]:
+        """Search for URLs without scraping their content"""
+        payload = self._search_payload(query, num_results)
+        payload["pageOptions"]["fetchPageContent"] = False
+        data = await self._post_with_retry(session, "search", payload, f"query: {query}", semaphore)
+        if data is None:
+            return []
+
+        urls = [item["url"] for item in data.get("data", []) if item.get("url")]
+        logger.info(f"Found {len(urls)} URLs for query: {query}")
+        return urls
+
+    async def scrape_url_async(self, session: aiohttp.ClientSession, url: str, options: Dict[str, Any] = None,
+                               semaphore: Optional[asyncio.Semaphore] = None) -> Dict[str, Any]:
+        """Scrape a single URL without blocking the event loop"""
+        data = await self._post_with_retry(session, "scrape", self._scrape_payload(url, options),
+                                           f"URL: {url}", semaphore)
+        if data is None:
+            return {"success": False, "url": url, "error": "All retry attempts failed"}
+
+        logger.info(f"Successfully scraped URL: {url}")
+        return self._parse_scrape_result(url, data)
@@ -0,0 +1,51 @@
+import asyncio
+import contextlib
+import logging
+import random
+import aiohttp
+from typing import Any, Optional
+from config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+# Throttling and transient server errors worth retrying; other 4xx responses fail immediately
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def _retry_delay(attempt: int, base_delay: float, retry_after: Optional[str]) -> float:
+    """Honour a numeric Retry-After header, otherwise back off exponentially with jitter"""
+    if retry_after:
+        try:
+            return min(float(retry_after), Settings.HTTP_RETRY_MAX_DELAY)
+        except ValueError:
+            pass  # HTTP-date form; fall back to exponential backoff
+    return base_delay * 2 ** attempt + random.random() * 0.1
+
+
+async def request_json(session: aiohttp.ClientSession, method: str, url: str, label: str,
+                       semaphore: Optional[asyncio.Semaphore] = None, attempts: int = None,
+                       base_delay: float = None, **kwargs) -> Any:
+    """Send a request and decode its JSON body, retrying throttling, server errors and timeouts"""
+    attempts = attempts or Settings.HTTP_RETRY_ATTEMPTS
+    base_delay = base_delay or Settings.HTTP_RETRY_BASE_DELAY
+
+    for attempt in range(attempts):
+        retry_after = None
+        last_attempt = attempt == attempts - 1
+        try:
+            # The semaphore caps in-flight requests to one host; it is released before backing off
+            async with semaphore or contextlib.nullcontext():
+                async with session.request(method, url, **kwargs) as response:
+                    if response.status in RETRY_STATUSES and not last_attempt:
+                        retry_after = response.headers.get("Retry-After")
+                        logger.warning(f"HTTP {response.status} on attempt {attempt + 1} for {label}")
+                    else:
+                        response.raise_for_status()
+                        return await response.json(content_type=None)
+
+        except (asyncio.TimeoutError, aiohttp.ClientConnectionError) as e:
+            if last_attempt:
+                raise
+            logger.warning(f"Request error on attempt {attempt + 1} for {label}: {str(e) or type(e).__name__}")
+
+        await asyncio.sleep(_retry_delay(attempt, base_delay, retry_after))
@@ -1,8 +1,11 @@
+import asyncio
+import aiohttp
 import requests
 import logging
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 from config.settings import Settings
+from core.integrations.http_retry import request_json
 import time
 
 logger = logging.getLogger(__name__)
@@ -29,17 +32,8 @@ class NewsDataClient:
         
             # Handle different HTTP status codes
             if response.status_code == 200:
-                data = response.json()
-                # Check if the response has the expected structure
-                if data.get("status") == "success":
-                    logger.info(f"NewsData.io success: Retrieved {len(data.get('results', []))} articles")
-                    return data
-                else:
-                    logger.error(f"NewsData.io API error: {data}")
-                    return {"status": "error", "message": data.get("message", "Unknown API error")}
-            else:
-                logger.error(f"NewsData.io HTTP error {response.status_code}: {response.text}")
-                return {"status": "error", "code": response.status_code, "message": response.text}
+                return self._check_response(response.status_code, response.json(), "")
+            return self._check_response(response.status_code, None, response.text)
             
         except requests.exceptions.Timeout:
             logger.error("NewsData.io request timeout")
@@ -48,6 +42,40 @@ class NewsDataClient:
             logger.error(f"NewsData.io request failed: {str(e)}")
             return {"status": "error", "message": f"Request failed: {str(e)}"}
     
+    def _check_response(self, status_code: int, data: Optional[Dict[str, Any]], text: str) -> Dict[str, Any]:
+        """Validate a NewsData.io response body, returning it or an error dict"""
+        if status_code == 200:
+            # Check if the response has the expected structure
+            if data.get("status") == "success":
+                logger.info(f"NewsData.io success: Retrieved {len(data.get('results', []))} articles")
+                return data
+            else:
+                logger.error(f"NewsData.io API error: {data}")
+                return {"status": "error", "message": data.get("message", "Unknown API error")}
+        else:
+            logger.error(f"NewsData.io HTTP error {status_code}: {text}")
+            return {"status": "error", "code": status_code, "message": text}
+    
+    async def _make_request_async(self, session: aiohttp.ClientSession, endpoint: str, params: Dict[str, Any],
+                                  semaphore: Optional[asyncio.Semaphore] = None) -> Dict[str, Any]:
+        """Make a non-blocking request to NewsData.io API with retries and proper error handling"""
+        try:
+            params["apikey"] = self.api_key
+            logger.info(f"NewsData.io request: {endpoint} with params: {list(params.keys())}")
+            data = await request_json(session, "GET", f"{self.base_url}/{endpoint}", f"NewsData.io {endpoint}",
+                                      semaphore, params=params)
+            return self._check_response(200, data, "")
+            
+        except asyncio.TimeoutError:
+            logger.error("NewsData.io request timeout")
+            return {"status": "error", "message": "Request timeout"}
+        except aiohttp.ClientResponseError as e:
+            logger.error(f"NewsData.io HTTP error {e.status}: {e.message}")
+            return {"status": "error", "code": e.status, "message": e.message}
+        except aiohttp.ClientError as e:
+            logger.error(f"NewsData.io request failed: {str(e)}")
+            return {"status": "error", "message": f"Request failed: {str(e)}"}
+    
     def _sanitize_query(self, query: str) -> str:
         """Sanitize query according to NewsData.io requirements"""
         if not query:
@@ -65,78 +93,108 @@ class NewsDataClient:
     
         return clean_query
     
-    def get_latest_news(self, query: str = None, language: str = "en", country: str = None, 
-                       category: str = None, size: int = 10) -> List[Dict[str, Any]]:
-        """Get latest news articles using the /latest endpoint"""
-        try:
-            params = {
-                "language": language,
-                "size": min(size, 50)  # API limit is 50
-            }
+    def _latest_params(self, query: str, language: str, country: str, category: str, size: int) -> Dict[str, Any]:
+        """Build query parameters for the /latest endpoint"""
+        params = {
+            "language": language,
+            "size": min(size, 50)  # API limit is 50
+        }
         
-            # Add query if provided
-            if query:
-                sanitized_query = self._sanitize_query(query)
-                if sanitized_query:
-                    params["q"] = sanitized_query
-                    logger.info(f"NewsData.io query: {sanitized_query}")
+        # Add query if provided
+        if query:
+            sanitized_query = self._sanitize_query(query)
+            if sanitized_query:
+                params["q"] = sanitized_query
+                logger.info(f"NewsData.io query: {sanitized_query}")
         
-            # Add optional parameters
-            if country:
-                params["country"] = country
-            if category:
-                params["category"] = category
+        # Add optional parameters
+        if country:
+            params["country"] = country
+        if category:
+            params["category"] = category
         
-            # Make request
-            response_data = self._make_request("latest", params)
-        
-            # Check if request was successful
-            if response_data.get("status") != "success":
-                logger.error(f"NewsData.io API request failed: {response_data.get('message', 'Unknown error')}")
-                return []
+        return params
+    
+    def _process_latest(self, response_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Normalize articles returned by the /latest endpoint"""
+        # Check if request was successful
+        if response_data.get("status") != "success":
+            logger.error(f"NewsData.io API request failed: {response_data.get('message', 'Unknown error')}")
+            return []
         
-            # Process articles
-            articles = []
-            results = response_data.get("results", [])
+        # Process articles
+        articles = []
+        results = response_data.get("results", [])
         
-            for article in results:
-                if not article:  # Skip empty articles
-                    continue
-                
-                processed_article = {
-                    "article_id": article.get("article_id", ""),
-                    "title": article.get("title", ""),
-                    "description": article.get("description", ""),
-                    "content": article.get("content", article.get("description", "")),  # Fallback to description
-                    "url": article.get("link", ""),
-                    "source": article.get("source_id", ""),
-                    "source_name": article.get("source_name", ""),
-                    "published_date": article.get("pubDate", ""),
-                    "image_url": article.get("image_url", ""),
-                    "category": article.get("category", []),
-                    "keywords": article.get("keywords", []),
-                    "country": article.get("country", []),
-                    "language": article.get("language", ""),
-                    "sentiment": article.get("sentiment", ""),
-                    "ai_tag": article.get("ai_tag", []),
-                    "duplicate": article.get("duplicate", False)
-                }
+        for article in results:
+            if not article:  # Skip empty articles
+                continue
             
-                # Only add articles with meaningful content
-                if processed_article["title"] or processed_article["description"]:
-                    articles.append(processed_article)
-        
-            logger.info(f"NewsData.io: Successfully processed {len(articles)} articles from {len(results)} results")
+            processed_article = {
+                "article_id": article.get("article_id", ""),
+                "title": article.get("title", ""),
+                "description": article.get("description", ""),
+                "content": article.get("content", article.get("description", "")),  # Fallback to description
+                "url": article.get("link", ""),
+                "source": article.get("source_id", ""),
+                "source_name": article.get("source_name", ""),
+                "published_date": article.get("pubDate", ""),
+                "image_url": article.get("image_url", ""),
+                "category": article.get("category", []),
+                "keywords": article.get("keywords", []),
+                "country": article.get("country", []),
+                "language": article.get("language", ""),
+                "sentiment": article.get("sentiment", ""),
+                "ai_tag": article.get("ai_tag", []),
+                "duplicate": article.get("duplicate", False)
+            }
+            
+            # Only add articles with meaningful content
+            if processed_article["title"] or processed_article["description"]:
+                articles.append(processed_article)
         
+        logger.info(f"NewsData.io: Successfully processed {len(articles)} articles from {len(results)} results")
+        return articles
+    
+    def get_latest_news(self, query: str = None, language: str = "en", country: str = None, 
+                       category: str = None, size: int = 10) -> List[Dict[str, Any]]:
+        """Get latest news articles using the /latest endpoint"""
+        try:
+            params = self._latest_params(query, language, country, category, size)
+            response_data = self._make_request("latest", params)
+            articles = self._process_latest(response_data)
+            
             # Add delay to respect rate limits
-            time.sleep(self.rate_limit_delay)
-        
+            if response_data.get("status") == "success":
+                time.sleep(self.rate_limit_delay)
+            
             return articles
         
         except Exception as e:
             logger.error(f"NewsData.io get_latest_news failed: {str(e)}")
             return []
     
+    async def get_latest_news_multi(self, session: aiohttp.ClientSession, queries: Dict[str, int],
+                                    language: str = "en",
+                                    semaphore: Optional[asyncio.Semaphore] = None) -> List[Dict[str, Any]]:
+        """Fetch /latest for several query variants concurrently and return their union, deduplicated by article"""
+        responses = await asyncio.gather(*(
+            self._make_request_async(session, "latest", self._latest_params(query, language, None, None, size),
+                                     semaphore)
+            for query, size in queries.items()
+        ), return_exceptions=True)
+        
+        articles = {}
+        for response_data in responses:
+            if isinstance(response_data, Exception):
+                logger.error(f"NewsData.io get_latest_news failed: {str(response_data)}")
+                continue
+            for article in self._process_latest(response_data):
+                # Articles without an ID are keyed by URL so they are not collapsed together
+                articles.setdefault(article["article_id"] or article["url"], article)
+        
+        return list(articles.values())
+    
     def get_news_by_domain(self, domain: str, query: str = None, size: int = 10) -> List[Dict[str, Any]]:
         """Get news from specific domain using domainurl parameter"""
         try:
@@ -179,54 +237,75 @@ class NewsDataClient:
             logger.error(f"Failed to get news from domain {domain}: {str(e)}")
             return []
     
+    def _trending_params(self, language: str, country: str, size: int) -> Dict[str, Any]:
+        """Build query parameters for the trending topics lookup"""
+        params = {
+            "language": language,
+            "size": min(size, 50),
+            "timeframe": "24"  # Last 24 hours for trending topics
+        }
+        
+        if country:
+            params["country"] = country
+        
+        return params
+    
+    def _process_trending(self, response_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Rank the keywords and AI tags of recent articles by frequency"""
+        if response_data.get("status") != "success":
+            logger.error(f"API request failed: {response_data.get('message', 'Unknown error')}")
+            return []
+        
+        # Extract trending keywords from articles
+        keyword_counts = {}
+        for article in response_data.get("results", []):
+            # Count keywords
+            keywords = article.get("keywords", [])
+            for keyword in keywords:
+                if keyword and len(keyword) > 2:  # Filter out very short keywords
+                    keyword_counts[keyword] = keyword_counts.get(keyword, 0) + 1
+            
+            # Count AI tags if available
+            ai_tags = article.get("ai_tag", [])
+            for tag in ai_tags:
+                if tag and len(tag) > 2:
+                    keyword_counts[tag] = keyword_counts.get(tag, 0) + 1
+        
+        # Sort by frequency and return top trending topics
+        trending = [
+            {"topic": topic, "frequency": count}
+            for topic, count in sorted(keyword_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+        ]
+        
+        logger.info(f"Retrieved {len(trending)} trending topics")
+        return trending
+    
     def get_trending_topics(self, language: str = "en", country: str = None, size: int = 20) -> List[Dict[str, Any]]:
         """Get trending topics by analyzing recent news"""
         try:
-            params = {
-                "language": language,
-                "size": min(size, 50),
-                "timeframe": "24"  # Last 24 hours for trending topics
-            }
-            
-            if country:
-                params["country"] = country
-            
-            response_data = self._make_request("latest", params)
-            
-            if response_data.get("status") != "success":
-                logger.error(f"API request failed: {response_data.get('message', 'Unknown error')}")
-                return []
+            response_data = self._make_request("latest", self._trending_params(language, country, size))
+            trending = self._process_trending(response_data)
             
-            # Extract trending keywords from articles
-            keyword_counts = {}
-            for article in response_data.get("results", []):
-                # Count keywords
-                keywords = article.get("keywords", [])
-                for keyword in keywords:
-                    if keyword and len(keyword) > 2:  # Filter out very short keywords
-                        keyword_counts[keyword] = keyword_counts.get(keyword, 0) + 1
-                
-                # Count AI tags if available
-                ai_tags = article.get("ai_tag", [])
-                for tag in ai_tags:
-                    if tag and len(tag) > 2:
-                        keyword_counts[tag] = keyword_counts.get(tag, 0) + 1
-            
-            # Sort by frequency and return top trending topics
-            trending = [
-                {"topic": topic, "frequency": count}
-                for topic, count in sorted(keyword_counts.items(), key=lambda x: x[1], reverse=True)[:10]
-            ]
-            
-            logger.info(f"Retrieved {len(trending)} trending topics")
-            
-            time.sleep(self.rate_limit_delay)
+            if response_data.get("status") == "success":
+                time.sleep(self.rate_limit_delay)
             return trending
             
         except Exception as e:
             logger.error(f"Failed to get trending topics: {str(e)}")
             return []
     
+    async def get_trending_topics_async(self, session: aiohttp.ClientSession, language: str = "en",
+                                        country: str = None, size: int = 20,
+                                        semaphore: Optional[asyncio.Semaphore] = None) -> List[Dict[str, Any]]:
+        """Get trending topics by analyzing recent news, without blocking the event loop"""
+        try:
+            params = self._trending_params(language, country, size)
+            return self._process_trending(await self._make_request_async(session, "latest", params, semaphore))
+            
+        except Exception as e:
+            logger.error(f"Failed to get trending topics: {str(e)}")
+            return []
+    
     def get_crypto_news(self, coin: str = None, query: str = None, size: int = 10) -> List[Dict[str, Any]]:
         """Get cryptocurrency news using the /crypto endpoint"""
         try:
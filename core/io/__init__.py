@@ -0,0 +1 @@
+"""File I/O helpers for Market Intelligence Agent"""
@@ -0,0 +1,23 @@
+import logging
+import os
+from typing import Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+def write_files(payloads: Iterable[Tuple[str, bytes]]) -> List[str]:
+    """Write a batch of files with raw descriptor writes and return their paths"""
+    written = []
+    for path, data in payloads:
+        fd = os.open(path, _WRITE_FLAGS, 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        written.append(path)
+    
+    logger.debug(f"Wrote {len(written)} files")
+    return written
@@ -0,0 +1,46 @@
+import functools
+import orjson
+from typing import Any
+from config.settings import Settings
+
+
+@functools.lru_cache(maxsize=1)
+def _get_rate_limiter():
+    """Client-side request quota shared by every chat model in the process"""
+    from langchain_core.rate_limiters import InMemoryRateLimiter
+    return InMemoryRateLimiter(
+        requests_per_second=Settings.LLM_REQUESTS_PER_MINUTE / 60,
+        max_bucket_size=Settings.LLM_BATCH_CONCURRENCY  # Let a full batch start without queueing
+    )
+
+
+@functools.lru_cache(maxsize=4)
+def get_llm(model_name: str = Settings.LLM_MODEL):
+    """Build each chat model once per process so all agents reuse its client and connections"""
+    from langchain.chat_models import init_chat_model
+    return init_chat_model(model_name, model_provider="google_genai", rate_limiter=_get_rate_limiter())
+
+
+@functools.lru_cache(maxsize=1)
+def _get_json_parser():
+    """LangChain's tolerant JSON parser, used only for replies orjson rejects"""
+    from langchain_core.output_parsers import JsonOutputParser
+    return JsonOutputParser()
+
+
+def decode_json(message) -> Any:
+    """Decode a model's JSON reply with orjson, falling back to the tolerant LangChain parser"""
+    text = message.content.strip()
+    if text.startswith("```"):
+        text = text.strip("`").removeprefix("json")
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        return _get_json_parser().parse(message.content)
+
+
+@functools.lru_cache(maxsize=4)
+def get_json_chain(model_name: str = Settings.LLM_MODEL):
+    """Chain a shared chat model with the JSON reply decoder"""
+    from langchain_core.runnables import RunnableLambda
+    return get_llm(model_name) | RunnableLambda(decode_json)
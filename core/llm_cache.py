@@ -0,0 +1,98 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+import numpy as np
+from cachetools import TTLCache
+
+from config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+class SemanticResponseCache:
+    """Cache LLM responses by exact key hash, with an opt-in embedding-similarity tier"""
+
+    def __init__(self, maxsize: int = None, ttl: int = None, similarity_threshold: float = None,
+                 embeddings: Any = None):
+        self.maxsize = maxsize or Settings.LLM_CACHE_SIZE
+        self.ttl = ttl or Settings.LLM_CACHE_TTL
+        self.similarity_threshold = similarity_threshold or Settings.LLM_CACHE_SIMILARITY
+        self._exact = TTLCache(maxsize=self.maxsize, ttl=self.ttl)
+        self._vectors = TTLCache(maxsize=self.maxsize, ttl=self.ttl)
+        self._semantic: Dict[str, Deque[Tuple[float, np.ndarray, Any]]] = {}
+        self._embeddings = embeddings
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(namespace: str, prompt: str) -> str:
+        """Build the exact-match key for a prompt"""
+        return hashlib.sha256(f"{namespace}\x00{prompt}".encode("utf-8")).hexdigest()
+
+    def _embed(self, key: str, prompt: str) -> Optional[np.ndarray]:
+        """Embed a prompt as a unit vector, reusing the vector computed for the same key"""
+        with self._lock:
+            if key in self._vectors:
+                return self._vectors[key]
+
+        try:
+            if self._embeddings is None:
+                from langchain_community.embeddings import HuggingFaceEmbeddings
+                self._embeddings = HuggingFaceEmbeddings(model_name=Settings.EMBEDDING_MODEL)
+            vector = np.asarray(self._embeddings.embed_query(prompt), dtype=np.float32)
+            vector /= np.linalg.norm(vector) or 1.0
+        except Exception as e:
+            logger.warning(f"LLM cache: Embedding failed, semantic lookup disabled for this prompt: {str(e)}")
+            return None
+
+        with self._lock:
+            self._vectors[key] = vector
+        return vector
+
+    def get(self, namespace: str, prompt: str, semantic: bool = False) -> Optional[Any]:
+        """Return a cached response for the key text, or None on a miss; semantic=True also matches similar text"""
+        key = self._key(namespace, prompt)
+        with self._lock:
+            if key in self._exact:
+                logger.info(f"LLM cache: Exact hit for {namespace}")
+                return self._exact[key]
+            entries = self._semantic.get(namespace)
+            # The embedding model truncates input after a few hundred tokens, so callers opt in only for
+            # short, fully variable key text (e.g. a user query), never an assembled prompt
+            if not semantic or not entries:
+                return None
+
+        vector = self._embed(key, prompt)
+        if vector is None:
+            return None
+
+        now = time.monotonic()
+        with self._lock:
+            live = [(vec, value) for stored_at, vec, value in entries if now - stored_at < self.ttl]
+        if not live:
+            return None
+
+        scores = np.stack([vec for vec, _ in live]) @ vector
+        best = int(scores.argmax())
+        if scores[best] >= self.similarity_threshold:
+            logger.info(f"LLM cache: Semantic hit for {namespace} (similarity {scores[best]:.3f})")
+            return live[best][1]
+        return None
+
+    def set(self, namespace: str, prompt: str, value: Any, semantic: bool = False):
+        """Store a response under its exact key, and under the semantic tier when semantic=True"""
+        key = self._key(namespace, prompt)
+        with self._lock:
+            self._exact[key] = value
+        if not semantic:
+            return
+
+        vector = self._embed(key, prompt)
+        if vector is None:
+            return
+
+        with self._lock:
+            entries = self._semantic.setdefault(namespace, deque(maxlen=self.maxsize))
+            entries.append((time.monotonic(), vector, value))
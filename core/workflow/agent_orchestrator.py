@@ -131,7 +131,8 @@ class AgentOrchestrator:
                 "chart_files": formatter_results.get("chart_files", []),
                 "report_content": formatter_results.get("report_content", ""),
                 "dashboard_data": formatter_results.get("dashboard_data", {}),
-                "export_files": formatter_results.get("export_files", {})
+                "export_files": formatter_results.get("export_files", {}),
+                "export_status": formatter_results.get("export_status", "completed")
             }
             
             self.results = final_results
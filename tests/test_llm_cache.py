@@ -0,0 +1,75 @@
+"""Tests for the shared LLM response cache"""
+import time
+
+from core.llm_cache import SemanticResponseCache
+
+
+class StubEmbeddings:
+    """Return fixed vectors per text, defaulting to one shared direction"""
+
+    def __init__(self, vectors=None):
+        self.vectors = vectors or {}
+        self.calls = []
+
+    def embed_query(self, text):
+        self.calls.append(text)
+        return self.vectors.get(text, [1.0, 0.0, 0.0])
+
+
+def make_cache(vectors=None, ttl=60, threshold=0.9):
+    return SemanticResponseCache(maxsize=16, ttl=ttl, similarity_threshold=threshold,
+                                 embeddings=StubEmbeddings(vectors))
+
+
+def test_exact_hit():
+    cache = make_cache()
+    cache.set("trends:fintech", "query a", ["result a"])
+    assert cache.get("trends:fintech", "query a") == ["result a"]
+    assert cache.get("trends:fintech", "query b") is None
+
+
+def test_exact_tier_does_not_embed():
+    cache = make_cache()
+    cache.set("trends:fintech", "query a", ["result a"])
+    cache.get("trends:fintech", "query b")
+    assert cache._embeddings.calls == []
+
+
+def test_different_queries_in_one_domain_do_not_collide():
+    # Both keys embed to the same vector, as template-dominated prompts used to
+    cache = make_cache()
+    cache.set("trends:fintech", "template\x00payments in Brazil", ["brazil"])
+    assert cache.get("trends:fintech", "template\x00lending in Kenya") is None
+
+
+def test_semantic_hit_above_threshold():
+    cache = make_cache({"ev chargers": [1.0, 0.0, 0.0], "ev charging stations": [0.99, 0.1, 0.0]})
+    cache.set("reader_analysis:energy", "ev chargers", {"themes": ["charging"]}, semantic=True)
+    assert cache.get("reader_analysis:energy", "ev charging stations", semantic=True) == {"themes": ["charging"]}
+
+
+def test_semantic_miss_below_threshold():
+    cache = make_cache({"ev chargers": [1.0, 0.0, 0.0], "solar panels": [0.6, 0.8, 0.0]})
+    cache.set("reader_analysis:energy", "ev chargers", {"themes": ["charging"]}, semantic=True)
+    assert cache.get("reader_analysis:energy", "solar panels", semantic=True) is None
+
+
+def test_semantic_tier_is_opt_in_on_lookup():
+    cache = make_cache()
+    cache.set("reader_analysis:energy", "ev chargers", {"themes": ["charging"]}, semantic=True)
+    assert cache.get("reader_analysis:energy", "ev charging stations") is None
+
+
+def test_namespace_isolation():
+    cache = make_cache()
+    cache.set("reader_analysis:energy", "market outlook", ["energy"], semantic=True)
+    assert cache.get("reader_analysis:retail", "market outlook", semantic=True) is None
+    assert cache.get("reader_analysis:retail", "market outlook") is None
+
+
+def test_ttl_expiry():
+    cache = make_cache(ttl=0.05)
+    cache.set("reader_analysis:energy", "ev chargers", ["charging"], semantic=True)
+    time.sleep(0.1)
+    assert cache.get("reader_analysis:energy", "ev chargers") is None
+    assert cache.get("reader_analysis:energy", "ev chargers", semantic=True) is None
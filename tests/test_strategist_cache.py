@@ -0,0 +1,61 @@
+"""Tests that strategist prompts hit the response cache across runs of the same analysis"""
+import asyncio
+
+from core.agents import strategist_agent
+from core.llm_cache import SemanticResponseCache
+
+
+class CountingChain:
+    """Stand-in JSON chain that records every prompt it is asked to answer"""
+
+    def __init__(self):
+        self.prompts = []
+
+    async def ainvoke(self, prompt):
+        self.prompts.append(prompt)
+        if "Create a detailed action plan" in prompt:
+            return {"opportunity_name": "Embedded payments"}
+        if "strategic recommendations" in prompt:
+            return [{"strategy_title": "Partner with banks", "description": "Partner with AI-driven banks",
+                     "priority_level": "High", "implementation_timeline": "Short-term"}]
+        return {"summary": "ok"}
+
+
+def analysis(timestamp):
+    return {
+        "query": "embedded finance",
+        "market_domain": "Fintech",
+        "market_trends": [{"trend_name": "Embedded payments", "description": "AI-driven banks grow",
+                           "impact_level": "High", "analysis_timestamp": timestamp, "data_sources": 4}],
+        "opportunities": [{"opportunity_name": "SMB lending", "description": "Lending to small firms",
+                           "revenue_potential": "High", "analysis_timestamp": timestamp}],
+        "competitive_landscape": {"market_leaders": ["Stripe"]}
+    }
+
+
+def test_rerun_of_same_analysis_hits_cache(monkeypatch):
+    chain = CountingChain()
+    monkeypatch.setattr(strategist_agent, "get_json_chain", lambda *args: chain)
+    monkeypatch.setattr(strategist_agent, "_RESPONSE_CACHE", SemanticResponseCache(maxsize=32, ttl=60))
+
+    first = asyncio.run(strategist_agent.StrategistAgent().execute(analysis(timestamp=100.0)))
+    calls_after_first_run = len(chain.prompts)
+    second = asyncio.run(strategist_agent.StrategistAgent().execute(analysis(timestamp=250.0)))
+
+    assert calls_after_first_run > 0
+    assert len(chain.prompts) == calls_after_first_run
+    assert second["risk_assessment"] == first["risk_assessment"]
+    assert all("analysis_timestamp" not in prompt for prompt in chain.prompts)
+
+
+def test_different_market_misses_cache(monkeypatch):
+    chain = CountingChain()
+    monkeypatch.setattr(strategist_agent, "get_json_chain", lambda *args: chain)
+    monkeypatch.setattr(strategist_agent, "_RESPONSE_CACHE", SemanticResponseCache(maxsize=32, ttl=60))
+
+    asyncio.run(strategist_agent.StrategistAgent().execute(analysis(timestamp=100.0)))
+    calls_after_first_run = len(chain.prompts)
+    other_market = dict(analysis(timestamp=100.0), market_domain="Insurance")
+    asyncio.run(strategist_agent.StrategistAgent().execute(other_market))
+
+    assert len(chain.prompts) == 2 * calls_after_first_run